@@ -11,6 +11,7 @@ from server_resources.case import Case, CaseList
 from server_resources.commands import Command
 from server_resources.phyng import Phyng, PhyngList, PhyngValue
 from server_resources.postprocess import Postprocess
+from server_resources.stream import PhyngStream
 
 
 class Server:
@@ -26,7 +27,9 @@ class Server:
         PhyngList.current_cases = self.current_cases
         Phyng.current_cases = self.current_cases
         PhyngValue.current_cases = self.current_cases
+        PhyngStream.current_cases = self.current_cases
         self.api.add_resource(Command, '/case/<string:case_name>/<string:command>', endpoint='command')
+        self.api.add_resource(PhyngStream, '/case/<string:case_name>/stream', endpoint='stream')
         self.api.add_resource(CaseList, '/case', endpoint='cases')
         self.api.add_resource(Case, '/case/<string:case_name>', endpoint='case')
         self.api.add_resource(PhyngList, '/case/<string:case_name>/phyng/', endpoint='phyngs')
@@ -37,7 +40,8 @@ class Server:
         self.api.add_resource(Postprocess, '/postprocess', '/postprocess/<string:command>')
 
     def run(self):
-        self.app.run(self.host, self.port, self.debug)
+        # Threaded server, so that streaming clients do not block other requests
+        self.app.run(self.host, self.port, self.debug, threaded=True)
 
 
 def atexit_handler():
@@ -5,7 +5,8 @@ from wopsimulator.loader import load_case, create_case, get_cases_names, save_ca
 
 from wopsimulator.variables import CONFIG_TYPE_K, CONFIG_MESH_QUALITY_K, CONFIG_CLEAN_LIMIT_K, \
     CONFIG_PARALLEL_K, CONFIG_CORES_K, CONFIG_REALTIME_K, CONFIG_BACKGROUND_K, CONFIG_DEFAULTS, \
-    CONFIG_END_TIME_K, CONFIG_BLOCKING_K
+    CONFIG_END_TIME_K, CONFIG_BLOCKING_K, CONFIG_STORE_PROBES_K, CONFIG_RETENTION_K, CONFIG_WRITE_FORMAT_K, \
+    CONFIG_WRITE_COMPRESSION_K, CONFIG_KEEP_DECOMPOSED_K
 
 
 def auto_load_case(func):
@@ -40,6 +41,16 @@ class Case(Resource):
                                    help='Case solving is done close to realtime if possible')
         self.reqparse.add_argument(CONFIG_BACKGROUND_K, type=str, help='CHT case background region material')
         self.reqparse.add_argument(CONFIG_END_TIME_K, type=int, help='Case simulation end time')
+        self.reqparse.add_argument(CONFIG_STORE_PROBES_K, type=bool,
+                                   help='Persist probe samples into a binary store for post-run analysis')
+        self.reqparse.add_argument(CONFIG_RETENTION_K, type=dict, location='json',
+                                   help='Results retention policies: keep_last, keep_every, keep_window, purge_write, '
+                                        'archive')
+        self.reqparse.add_argument(CONFIG_WRITE_FORMAT_K, type=str, choices=('ascii', 'binary'),
+                                   help='Results format, binary reduces the I/O of large meshes')
+        self.reqparse.add_argument(CONFIG_WRITE_COMPRESSION_K, type=bool, help='Compress results with gzip')
+        self.reqparse.add_argument(CONFIG_KEEP_DECOMPOSED_K, type=bool,
+                                   help='Keep a parallel case decomposed, reconstruct only on post-processing')
         super(Case, self).__init__()
 
     @catch_error
@@ -4,7 +4,7 @@ from flask_restful import Resource, reqparse
 
 from .case import auto_load_case
 from .exceptions import catch_error
-from wopsimulator.loader import save_case
+from wopsimulator.loader import save_case, fork_case
 
 COMMAND_HELP = 'help'
 COMMAND_LIST = 'list'
@@ -19,6 +19,9 @@ COMMAND_STOP = 'stop'
 COMMAND_PROCESS = 'postprocess'
 COMMAND_SIMULATION_TIME = 'time'
 COMMAND_UPLOAD_STL = 'uploadSTL'
+COMMAND_FORK = 'fork'
+COMMAND_RESTORE = 'restore'
+COMMAND_RELEASE = 'release'
 
 COMMANDS = {
     COMMAND_HELP: 'Returns this JSON',
@@ -29,7 +32,10 @@ COMMANDS = {
     COMMAND_STOP: 'Stops case',
     COMMAND_PROCESS: 'Post-process case',
     COMMAND_SIMULATION_TIME: 'Current real, simulation time of a case and their difference',
-    COMMAND_UPLOAD_STL: 'Upload STL geometry of a Phyng'
+    COMMAND_UPLOAD_STL: 'Upload STL geometry of a Phyng',
+    COMMAND_FORK: 'Fork case at its current simulation time into a new case',
+    COMMAND_RESTORE: 'Restore an archived simulation time for post-processing',
+    COMMAND_RELEASE: 'Release a restored simulation time, so that it is archived again'
 }
 
 
@@ -43,6 +49,8 @@ class Command(Resource):
         self.reqparse.add_argument('file', type=werkzeug.datastructures.FileStorage, location='files',
                                    help="Custom STL geometry")
         self.reqparse.add_argument('stl_name', type=str, help='Custom STL geometry name')
+        self.reqparse.add_argument('fork_name', type=str, help='Name of the forked case')
+        self.reqparse.add_argument('time', type=str, help='Archived simulation time')
         super(Command, self).__init__()
 
     @catch_error
@@ -91,6 +99,23 @@ class Command(Resource):
                 os.makedirs(geometry_path, exist_ok=True)
                 file.save(f'{geometry_path}/{file.filename}')
                 return '', 200
+        elif command == COMMAND_FORK:
+            args = self.reqparse.parse_args()
+            if not args['fork_name']:
+                return 'Fork name is not specified', 400
+            self.current_cases[args['fork_name']] = fork_case(case_name, args['fork_name'],
+                                                              self.current_cases[case_name])
+            return '', 201
+        elif command in (COMMAND_RESTORE, COMMAND_RELEASE):
+            args = self.reqparse.parse_args()
+            if not args['time']:
+                return 'Time is not specified', 400
+            if command == COMMAND_RESTORE:
+                try:
+                    return self.current_cases[case_name].restore_time(args['time'])
+                except KeyError:
+                    return f'Time {args["time"]} is not archived', 404
+            self.current_cases[case_name].release_time(args['time'])
         else:
             return 'Command not found', 404
         return '', 200
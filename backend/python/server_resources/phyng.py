@@ -11,6 +11,8 @@ from wopsimulator.exceptions import PhyngNotFound
 from wopsimulator.variables import CONFIG_PHYNG_NAME_K, CONFIG_PHYNG_TYPE_K, CONFIG_PHYNG_DIMS_K, CONFIG_PHYNG_LOC_K, \
     CONFIG_PHYNG_ROT_K, CONFIG_PHYNG_STL_K, CONFIG_PHYNG_MAT_K, CONFIG_PHYNG_FIELD_K
 
+PHYNG_VALUE_HISTORY = 'history'
+
 
 class PhyngList(Resource):
     current_cases = None
@@ -96,12 +98,21 @@ class PhyngValue(Resource):
     def __init__(self):
         self.reqparse = reqparse.RequestParser()
         self.reqparse.add_argument('value', type=str, help='Phyng value')
+        self.history_reqparse = reqparse.RequestParser()
+        self.history_reqparse.add_argument('since', type=float, location='args',
+                                           help='Return only values after this simulation time')
+        self.history_reqparse.add_argument('last', type=int, location='args',
+                                           help='Return only this amount of the newest values')
+        self.history_reqparse.add_argument('step', type=float, location='args',
+                                           help='Downsample values to one value per this simulation time interval')
         super(PhyngValue, self).__init__()
 
     @catch_error
     @auto_load_case
     def get(self, case_name, phyng_name, phyng_value):
         obj = self.current_cases[case_name].get_phyng(phyng_name)
+        if phyng_value == PHYNG_VALUE_HISTORY and hasattr(obj, 'get_history'):
+            return obj.get_history(**self.history_reqparse.parse_args())
         if phyng_value in obj:
             return obj[phyng_value]
         # TODO: move this error
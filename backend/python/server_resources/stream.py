@@ -0,0 +1,68 @@
+import json
+
+from flask import Response
+from flask_restful import Resource, reqparse
+
+from .case import auto_load_case
+from .exceptions import catch_error
+from wopsimulator.exceptions import PhyngNotFound
+
+# Period, after which an SSE comment is sent to keep idle connections alive
+STREAM_KEEP_ALIVE_PERIOD = 15
+STREAM_EVENT = 'value'
+
+
+def format_sse(data: str, event: str = None) -> str:
+    """
+    Formats a server-sent event message
+    :param data: event data
+    :param event: event name
+    :return: SSE message string
+    """
+    message = f'data: {data}\n\n'
+    if event:
+        message = f'event: {event}\n{message}'
+    return message
+
+
+class PhyngStream(Resource):
+    """
+    Server-sent events (SSE) stream of case Phyng values
+    Sensor values are pushed after each probe parse, actuator values are pushed on change
+    """
+    current_cases = None
+
+    def __init__(self):
+        self.reqparse = reqparse.RequestParser()
+        self.reqparse.add_argument('phyngs', type=str, location='args',
+                                   help='Comma separated names of Phyngs to stream, all if not specified')
+        self.reqparse.add_argument('threshold', type=float, default=0, location='args',
+                                   help='Minimum absolute change of a value to be streamed')
+        self.reqparse.add_argument('max_rate', type=float, location='args',
+                                   help='Maximum number of messages per second')
+        super(PhyngStream, self).__init__()
+
+    @catch_error
+    @auto_load_case
+    def get(self, case_name):
+        args = self.reqparse.parse_args()
+        case = self.current_cases[case_name]
+        phyngs = [name.strip() for name in args['phyngs'].split(',') if name.strip()] if args['phyngs'] else None
+        for phyng_name in phyngs or []:
+            if phyng_name not in case.phyngs and phyng_name not in case.sensors:
+                raise PhyngNotFound(f'Phyng {phyng_name} does not exist in case {case_name}')
+        subscription = case.value_stream.subscribe(phyngs, args['threshold'], args['max_rate'])
+
+        def generate():
+            try:
+                while not subscription.closed:
+                    events = subscription.get(timeout=STREAM_KEEP_ALIVE_PERIOD)
+                    if not events:
+                        yield ': keep-alive\n\n'
+                        continue
+                    yield ''.join([format_sse(json.dumps(event), STREAM_EVENT) for event in events])
+            finally:
+                subscription.close()
+
+        return Response(generate(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the simulator package from the backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
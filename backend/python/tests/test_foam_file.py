@@ -0,0 +1,183 @@
+import gzip
+import os
+
+import numpy as np
+import pytest
+
+from wopsimulator.openfoam.common.foam_file import FoamFile, FoamList, read_label_list
+
+HEADER = '''FoamFile
+{
+    version     2.0;
+    format      %s;
+    class       volScalarField;
+    arch        "LSB;label=32;scalar=64";
+    object      T;
+}
+'''
+
+FIELD = HEADER % 'ascii' + '''// comment is kept
+dimensions      [0 0 0 1 0 0 0];
+
+internalField   nonuniform List<scalar> 3(293.15 294 295.5);
+
+boundaryField
+{
+    walls
+    {
+        type            fixedValue;
+        value           uniform 293.15; // trailing comment
+    }
+    inlet
+    {
+        type            fixedValue;
+        value           nonuniform List<vector> 2((1 0 0) (0.5 0 1e-05));
+    }
+    outlet
+    {
+        type            zeroGradient;
+        value           nonuniform List<vector> 0();
+    }
+    empty
+    {
+        type            fixedValue;
+        value           nonuniform List<scalar> 0();
+    }
+    compact
+    {
+        type            fixedValue;
+        value           nonuniform List<vector> 3{(1 2 3)};
+    }
+}
+'''
+
+
+def get_list(foam_file, *keys) -> FoamList:
+    value = foam_file
+    for key in keys:
+        value = value[key]
+    return value[-1]
+
+
+def test_unmodified_round_trip():
+    assert FoamFile(text=FIELD).dumps() == FIELD
+
+
+def test_modified_round_trip():
+    foam_file = FoamFile(text=FIELD)
+    foam_file['boundaryField']['walls']['type'] = ['zeroGradient']
+    text = foam_file.dumps()
+    assert text == FIELD.replace('fixedValue;\n        value           uniform 293.15',
+                                 'zeroGradient;\n        value           uniform 293.15')
+    assert FoamFile(text=text).dumps() == text
+
+
+def test_typed_lists():
+    foam_file = FoamFile(text=FIELD)
+    assert get_list(foam_file, 'internalField').values == [293.15, 294, 295.5]
+    assert get_list(foam_file, 'boundaryField', 'inlet', 'value').values == [[1, 0, 0], [0.5, 0, 1e-05]]
+    assert get_list(foam_file, 'boundaryField', 'inlet', 'value').last == [0.5, 0, 1e-05]
+
+
+def test_empty_lists():
+    foam_file = FoamFile(text=FIELD)
+    vectors = get_list(foam_file, 'boundaryField', 'outlet', 'value')
+    scalars = get_list(foam_file, 'boundaryField', 'empty', 'value')
+    assert vectors.array.shape == (0, 3)
+    assert scalars.array.shape == (0,)
+    assert vectors.last is None
+    vectors.fill([1, 2, 3])
+    assert 'List<vector> \n0\n(\n)' in foam_file.dumps()
+
+
+def test_compact_list():
+    foam_file = FoamFile(text=FIELD)
+    compact = get_list(foam_file, 'boundaryField', 'compact', 'value')
+    assert compact.last == [1, 2, 3]
+    assert compact.array.tolist() == [[1, 2, 3]] * 3
+    compact.array[1] = [4, 5, 6]
+    compact.array = compact.array
+    parsed = get_list(FoamFile(text=foam_file.dumps()), 'boundaryField', 'compact', 'value')
+    assert not parsed.compact
+    assert parsed.array.tolist() == [[1, 2, 3], [4, 5, 6], [1, 2, 3]]
+    assert 'List<vector> \n3\n(\n(1 2 3)\n(4 5 6)\n(1 2 3)\n)' in foam_file.dumps()
+
+
+def test_modified_list():
+    foam_file = FoamFile(text=FIELD)
+    get_list(foam_file, 'internalField').values = [0.1, 300]
+    get_list(foam_file, 'boundaryField', 'inlet', 'value').fill([0, 0, 1])
+    parsed = FoamFile(text=foam_file.dumps())
+    assert get_list(parsed, 'internalField').values == [0.1, 300]
+    assert get_list(parsed, 'boundaryField', 'inlet', 'value').values == [[0, 0, 1], [0, 0, 1]]
+
+
+def test_modified_list_precision():
+    foam_file = FoamFile(text=FIELD)
+    get_list(foam_file, 'internalField').array = [0.1, 1 / 3, 300]
+    parsed = get_list(FoamFile(text=foam_file.dumps()), 'internalField')
+    assert parsed.array.tolist() == [0.1, 1 / 3, 300]
+
+
+def test_label_list():
+    foam_file = FoamFile(text=HEADER % 'ascii' + 'faces List<label> 3(1 2 3);\n')
+    labels = foam_file['faces'][-1]
+    assert labels.array.tolist() == [1, 2, 3]
+    labels.array = [4, 5, 6]
+    assert foam_file.dumps().endswith('faces List<label> \n3\n(\n4\n5\n6\n);\n')
+
+
+def test_list_size_mismatch():
+    foam_file = FoamFile(text=HEADER % 'ascii' + 'values List<scalar> 3(1 2);\n')
+    with pytest.raises(ValueError):
+        _ = foam_file['values'][-1].array
+
+
+def test_binary_round_trip():
+    scalars = np.array([1.5, 2.5, -3], dtype='<f8').tobytes().decode('latin-1')
+    labels = np.array([7, 8], dtype='<i4').tobytes().decode('latin-1')
+    text = HEADER % 'binary' + f'values List<scalar> 3({scalars});\nlabels List<label> 2({labels});\n'
+    foam_file = FoamFile(text=text)
+    assert foam_file.binary
+    assert foam_file.dumps() == text
+    assert foam_file['values'][-1].array.tolist() == [1.5, 2.5, -3]
+    assert foam_file['labels'][-1].array.tolist() == [7, 8]
+    foam_file['values'][-1].array = [4, 5, 6]
+    foam_file['labels'] = [foam_file.create_list([9, 10], kind='label')]
+    modified = FoamFile(text=foam_file.dumps())
+    assert modified['values'][-1].array.tolist() == [4, 5, 6]
+    assert modified['labels'][-1].array.tolist() == [9, 10]
+
+
+def test_compressed_file(tmp_path):
+    path = tmp_path / 'T.gz'
+    path.write_bytes(gzip.compress(FIELD.encode()))
+    foam_file = FoamFile(str(path))
+    assert get_list(foam_file, 'internalField').values == [293.15, 294, 295.5]
+    get_list(foam_file, 'internalField').array = [300, 301, 302]
+    foam_file.save()
+    assert get_list(FoamFile(str(path)), 'internalField').values == [300, 301, 302]
+
+
+def test_read_label_list(tmp_path):
+    text = HEADER % 'ascii' + '\n4\n(\n0\n3\n1\n2\n)\n'
+    path = tmp_path / 'cellProcAddressing'
+    path.write_text(text)
+    assert read_label_list(str(path)).tolist() == [0, 3, 1, 2]
+    compressed_path = tmp_path / 'cellProcAddressing.gz'
+    compressed_path.write_bytes(gzip.compress(text.encode()))
+    assert read_label_list(str(compressed_path)).tolist() == [0, 3, 1, 2]
+
+
+def test_read_label_list_cached(tmp_path):
+    path = tmp_path / 'cellProcAddressing'
+    path.write_text(HEADER % 'ascii' + '2(1 0)\n')
+    # Recently modified files are not cached, as they might change without changing their modification time
+    os.utime(path, ns=(0, 0))
+    labels = read_label_list(str(path))
+    assert read_label_list(str(path)) is labels
+    assert not labels.flags.writeable
+    path.write_text(HEADER % 'ascii' + '2(0 1)\n')
+    os.utime(path, ns=(10 ** 9, 10 ** 9))
+    assert read_label_list(str(path)).tolist() == [0, 1]
+
@@ -0,0 +1,88 @@
+import pytest
+
+from wopsimulator.openfoam.common.pipeline import Pipeline
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+@pytest.fixture
+def case_dir(tmp_path):
+    write(tmp_path / 'system/blockMeshDict', 'blocks')
+    write(tmp_path / 'system/snappyHexMeshDict', 'snappy')
+    write(tmp_path / '0/T', 'T')
+    return tmp_path
+
+
+def create_pipeline(case_dir, runs):
+    def stage(name, output):
+        def run():
+            runs.append(name)
+            write(case_dir / output, name)
+        return run
+
+    pipeline = Pipeline(str(case_dir), ignored=['0/U'])
+    pipeline.add_stage('blockMesh', stage('blockMesh', 'constant/polyMesh/points'),
+                       inputs=['system/blockMeshDict'], outputs=['constant/polyMesh/*'])
+    pipeline.add_stage('snappyHexMesh', stage('snappyHexMesh', 'constant/polyMesh/points'),
+                       inputs=['system/snappyHexMeshDict'], outputs=['constant/polyMesh/*'], depends=['blockMesh'])
+    pipeline.add_stage('setup', stage('setup', 'constant/setup'),
+                       inputs=['0/*'], outputs=['constant/setup'], depends=['snappyHexMesh'], parameters={'cores': 1})
+    return pipeline
+
+
+def test_first_run(case_dir):
+    runs = []
+    pipeline = create_pipeline(case_dir, runs)
+    assert pipeline.get_stale_stages() == ['blockMesh', 'snappyHexMesh', 'setup']
+    assert pipeline.run() == runs == ['blockMesh', 'snappyHexMesh', 'setup']
+    assert create_pipeline(case_dir, runs).get_stale_stages() == []
+    assert create_pipeline(case_dir, runs).get_stale_stages(force=True) == ['blockMesh', 'snappyHexMesh', 'setup']
+
+
+def test_changed_inputs(case_dir):
+    create_pipeline(case_dir, []).run()
+    write(case_dir / '0/T', 'T changed')
+    assert create_pipeline(case_dir, []).get_stale_stages() == ['setup']
+    # Ignored files are not hashed
+    write(case_dir / '0/U', 'U')
+    write(case_dir / '0/T', 'T')
+    assert create_pipeline(case_dir, []).get_stale_stages() == []
+    # Dependent stages and stages sharing outputs rerun too
+    write(case_dir / 'system/snappyHexMeshDict', 'snappy changed')
+    assert create_pipeline(case_dir, []).get_stale_stages() == ['blockMesh', 'snappyHexMesh', 'setup']
+
+
+def test_same_contents(case_dir):
+    create_pipeline(case_dir, []).run()
+    write(case_dir / 'system/blockMeshDict', 'blocks')
+    assert create_pipeline(case_dir, []).get_stale_stages() == []
+
+
+def test_changed_parameters(case_dir):
+    create_pipeline(case_dir, []).run()
+    pipeline = create_pipeline(case_dir, [])
+    pipeline.stages['setup'].parameters = {'cores': 2}
+    assert pipeline.get_stale_stages() == ['setup']
+
+
+def test_changed_outputs(case_dir):
+    create_pipeline(case_dir, []).run()
+    (case_dir / 'constant/setup').unlink()
+    assert create_pipeline(case_dir, []).get_stale_stages() == ['setup']
+    write(case_dir / 'constant/polyMesh/points', 'modified')
+    assert create_pipeline(case_dir, []).get_stale_stages() == ['blockMesh', 'snappyHexMesh', 'setup']
+
+
+def test_invalid_graph(case_dir):
+    pipeline = Pipeline(str(case_dir))
+    pipeline.add_stage('a', lambda: None, depends=['b'])
+    with pytest.raises(ValueError):
+        pipeline.get_stale_stages()
+    pipeline.add_stage('b', lambda: None, depends=['a'])
+    with pytest.raises(ValueError):
+        pipeline.get_stale_stages()
+    with pytest.raises(ValueError):
+        pipeline.add_stage('a', lambda: None)
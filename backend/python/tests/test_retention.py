@@ -0,0 +1,73 @@
+import pytest
+
+from wopsimulator.openfoam.common.archive import TimeArchive
+from wopsimulator.openfoam.common.retention import KeepLastN, KeepEveryKth, KeepWindow, RetentionEngine, \
+    create_policies
+
+TIMES = ['0', '0.5', '1', '1.5', '2', '2.5', '3']
+
+
+def test_keep_last():
+    assert KeepLastN(2).select(TIMES) == {'2.5', '3'}
+    assert KeepLastN(10).select(TIMES) == set(TIMES)
+    assert KeepLastN(0).select(TIMES) == set()
+
+
+def test_keep_every():
+    assert KeepEveryKth(3, write_interval=0.5).select(TIMES) == {'0', '1.5', '3'}
+    assert KeepEveryKth(0).select(TIMES) == set()
+
+
+def test_keep_every_passes():
+    # Each pass evicts the directories, which are not kept, before the next time is written
+    engine = RetentionEngine('case', [KeepEveryKth(2, write_interval=0.1)])
+    times = []
+    for step in range(12):
+        times.append(f'{step * 0.1:g}')
+        times = [name for name in times if name in engine.select(times)]
+    assert times == ['0', '0.2', '0.4', '0.6', '0.8', '1', '1.1']
+
+
+def test_keep_window():
+    assert KeepWindow(1).select(TIMES) == {'2', '2.5', '3'}
+    assert KeepWindow(1).select([]) == set()
+
+
+def test_create_policies():
+    assert create_policies(None) == []
+    assert create_policies({'keep_last': 0}) == []
+    policies = create_policies({'keep_last': 2, 'keep_every': 4, 'keep_window': 0.5})
+    assert [type(policy) for policy in policies] == [KeepLastN, KeepEveryKth, KeepWindow]
+
+
+def test_engine_select():
+    engine = RetentionEngine('case', create_policies({'keep_last': 2, 'keep_every': 4}, write_interval=0.5))
+    assert engine.select(TIMES) == {'0', '2', '2.5', '3'}
+    # Initial and latest times are always kept
+    assert RetentionEngine('case').select(TIMES) == {'0', '3'}
+    assert RetentionEngine('case').select([]) == set()
+
+
+def test_engine_directories(tmp_path):
+    for name in ('processor10', 'processor2', 'processors', 'constant'):
+        (tmp_path / name).mkdir()
+    case_dir = str(tmp_path)
+    assert RetentionEngine(case_dir).get_directories() == \
+        [case_dir, f'{case_dir}/processor2', f'{case_dir}/processor10']
+    assert RetentionEngine(f'{case_dir}/missing').get_directories() == []
+
+
+def test_archive_restore(tmp_path):
+    (tmp_path / '1').mkdir()
+    (tmp_path / '1/T').write_text('T')
+    archive = TimeArchive(str(tmp_path))
+    assert archive.pack(str(tmp_path), ['1']) == ['1']
+    (tmp_path / '1/T').unlink()
+    assert archive.restore('1') == [f'{tmp_path}/1']
+    assert (tmp_path / '1/T').read_text() == 'T'
+    assert archive.pinned == {'1'}
+    # Times, which were never archived, are not pinned
+    with pytest.raises(KeyError):
+        archive.restore('2')
+    assert archive.pinned == {'1'}
+
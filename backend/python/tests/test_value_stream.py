@@ -0,0 +1,29 @@
+import math
+
+from wopsimulator.value_stream import _value_change
+
+
+def test_numbers():
+    assert _value_change(1, 3.5) == 2.5
+    assert _value_change(3.5, 1) == 2.5
+    assert _value_change(2, 2) == 0
+
+
+def test_bools():
+    assert _value_change(True, True) == 0
+    assert _value_change(False, False) == 0
+    assert math.isinf(_value_change(False, True))
+    assert math.isinf(_value_change(True, False))
+
+
+def test_vectors():
+    assert _value_change([1, 2, 3], [1, 2.5, 1]) == 2
+    assert _value_change((0, 0, 0), [0, 0, 0]) == 0
+    assert _value_change([], []) == 0
+    assert math.isinf(_value_change([1, 2], [1, 2, 3]))
+
+
+def test_non_numeric():
+    assert _value_change('on', 'on') == 0
+    assert math.isinf(_value_change('on', 'off'))
+    assert math.isinf(_value_change(None, 1))
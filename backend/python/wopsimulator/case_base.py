@@ -10,10 +10,12 @@ from .phyngs.base import Phyng
 from .phyngs.sensor import SensorPhyng
 from .openfoam.common.filehandling import get_latest_time, get_latest_time_parallel
 from .runtime_monitor import RunTimeMonitor
+from .value_stream import ValueStream
 from .variables import CONFIG_TYPE_K, CONFIG_PATH_K, CONFIG_BLOCKING_K, CONFIG_PARALLEL_K, \
     CONFIG_CORES_K, CONFIG_INITIALIZED_K, CONFIG_MESH_QUALITY_K, CONFIG_CLEAN_LIMIT_K, CONFIG_PHYNG_DIMS_K, \
     CONFIG_PHYNG_ROT_K, CONFIG_PHYNG_LOC_K, CONFIG_PHYNG_STL_K, CONFIG_PHYNG_FIELD_K, CONFIG_PHYNG_NAME_K, \
-    CONFIG_STARTED_TIMESTAMP_K, CONFIG_REALTIME_K, CONFIG_END_TIME_K, CONFIG_PHYNG_TYPE_K
+    CONFIG_STARTED_TIMESTAMP_K, CONFIG_REALTIME_K, CONFIG_END_TIME_K, CONFIG_PHYNG_TYPE_K, CONFIG_STORE_PROBES_K, \
+    CONFIG_RETENTION_K, CONFIG_WRITE_FORMAT_K, CONFIG_WRITE_COMPRESSION_K, CONFIG_KEEP_DECOMPOSED_K
 from .openfoam.interface import OpenFoamInterface
 from .openfoam.system.snappyhexmesh import SnappyRegion, SnappyPartitionedMesh, SnappyCellZoneMesh
 
@@ -42,8 +44,10 @@ class OpenFoamCase(OpenFoamInterface, ABC):
             if CONFIG_STARTED_TIMESTAMP_K in kwargs and kwargs[CONFIG_STARTED_TIMESTAMP_K] else 0
         runtime_enabled = kwargs[CONFIG_REALTIME_K] \
             if CONFIG_REALTIME_K in kwargs and kwargs[CONFIG_REALTIME_K] else False
-        self._runtime_monitor = RunTimeMonitor(runtime_enabled, 5, self.run, self.stop, self.get_time_difference,
+        self._runtime_monitor = RunTimeMonitor(runtime_enabled, 5, self.run, self.pause, self.get_time_difference,
                                                lambda: self.solved)
+        self.value_stream = ValueStream()
+        self._probe_parser.add_listener(self._on_probes_parsed)
         if loaded:
             if initialized:
                 self._setup_initialized_case(kwargs)
@@ -58,7 +62,8 @@ class OpenFoamCase(OpenFoamInterface, ABC):
         """
         logger.info('Setting up initialized case')
         try:
-            if self.parallel:
+            # Processor directories of a case kept decomposed are authoritative and are not reconstructed
+            if self.parallel and not self.keep_decomposed:
                 self.run_reconstruct(all_regions=True, latest_time=True)
         except Exception:
             pass
@@ -74,7 +79,8 @@ class OpenFoamCase(OpenFoamInterface, ABC):
         """
         logger.info('Setting up uninitialized case')
         self.clean_case()
-        self.remove_geometry()
+        # Meshes are kept, they are rebuilt by the setup only if their inputs have changed
+        self.remove_tri_surface_dir()
 
     def _get_mesh_dimensions(self) -> list:
         """
@@ -142,7 +148,12 @@ class OpenFoamCase(OpenFoamInterface, ABC):
             CONFIG_CLEAN_LIMIT_K: self.clean_limit,
             CONFIG_STARTED_TIMESTAMP_K: self.start_time,
             CONFIG_REALTIME_K: self._runtime_monitor.enabled,
-            CONFIG_END_TIME_K: self.end_time
+            CONFIG_END_TIME_K: self.end_time,
+            CONFIG_STORE_PROBES_K: self.store_probes,
+            CONFIG_RETENTION_K: self.retention,
+            CONFIG_WRITE_FORMAT_K: self.write_format,
+            CONFIG_WRITE_COMPRESSION_K: self.write_compression,
+            CONFIG_KEEP_DECOMPOSED_K: self.keep_decomposed
         }
         return config
 
@@ -176,6 +187,16 @@ class OpenFoamCase(OpenFoamInterface, ABC):
         """
         pass
 
+    def _on_probes_parsed(self, probes: list):
+        """
+        Probe parser listener, which publishes the updated sensor values to the value stream
+        :param probes: list of updated probes
+        """
+        updated = set(probes)
+        for name, sensor in list(self.sensors.items()):
+            if sensor.probe in updated:
+                self.value_stream.publish(name, 'value', sensor.value, sensor.probe.time)
+
     def get_phyng(self, phyng_name) -> Union[Phyng, SensorPhyng]:
         """
         Gets phyng/sensor by its name
@@ -286,9 +307,10 @@ class OpenFoamCase(OpenFoamInterface, ABC):
         phyng = self.get_phyng(phyng_name)
         type_name = phyng.type_name
         phyng.remove()
+        self.value_stream.forget(phyng_name)
         if type_name == 'sensor':
             del self.sensors[phyng_name]
-            self._probe_parser_thread.remove_unused()
+            self._probe_parser.remove_unused()
         else:
             del self.phyngs[phyng_name]
         self.initialized = False
@@ -357,8 +379,9 @@ class OpenFoamCase(OpenFoamInterface, ABC):
 
     def bind_boundary_conditions(self):
         """Binds boundary conditions to phyngs"""
-        for phyng in self.phyngs.values():
-            phyng.bind_region_boundaries(self.boundaries)
+        with self.boundary_transaction():
+            for phyng in self.phyngs.values():
+                phyng.bind_region_boundaries(self.boundaries)
 
     def get_simulation_time_ms(self):
         """
@@ -421,8 +444,9 @@ class OpenFoamCase(OpenFoamInterface, ABC):
             self._runtime_monitor.start()
 
     def disable_realtime(self):
-        """Disables runtime monitor"""
+        """Disables runtime monitor, a case paused by it is resumed"""
         self._runtime_monitor.enabled = False
+        self.resume()
 
     @property
     def realtime(self):
@@ -453,8 +477,11 @@ class OpenFoamCase(OpenFoamInterface, ABC):
     def run(self):
         """
         Runs solver and monitor threads
-        Case must be setup before running
+        Case must be setup before running, a paused case is resumed
         """
+        if self.paused:
+            self.resume()
+            return
         if self._running:
             return
         if not self.initialized:
@@ -468,9 +495,8 @@ class OpenFoamCase(OpenFoamInterface, ABC):
         super(OpenFoamCase, self).run()
         self._runtime_monitor.start()
 
-    def stop(self, runtime_checker=False, **kwargs):
-        if not runtime_checker:
-            self._runtime_monitor.stop()
+    def stop(self, **kwargs):
+        self._runtime_monitor.stop()
         super(OpenFoamCase, self).stop(**kwargs)
 
     def __getitem__(self, item):
@@ -479,14 +505,19 @@ class OpenFoamCase(OpenFoamInterface, ABC):
 
     def __setitem__(self, key, value):
         """Allow to set attributes of a class as in dictionary"""
-        if key not in (CONFIG_CLEAN_LIMIT_K, CONFIG_REALTIME_K, CONFIG_END_TIME_K):
+        if key not in (CONFIG_CLEAN_LIMIT_K, CONFIG_REALTIME_K, CONFIG_END_TIME_K, CONFIG_STORE_PROBES_K,
+                       CONFIG_RETENTION_K, CONFIG_WRITE_FORMAT_K, CONFIG_WRITE_COMPRESSION_K,
+                       CONFIG_KEEP_DECOMPOSED_K):
             self.initialized = False
             self.stop()
+        elif key == CONFIG_KEEP_DECOMPOSED_K and value != self.keep_decomposed:
+            # Running solver writes and reads processor directories, which are reconstructed or detached
+            self.stop()
         if key == CONFIG_MESH_QUALITY_K:
             self.blockmesh_dict.mesh_quality = value
         else:
             setattr(self, key, value)
-        if key == CONFIG_END_TIME_K:
+        if key in (CONFIG_END_TIME_K, CONFIG_WRITE_FORMAT_K, CONFIG_WRITE_COMPRESSION_K):
             self.control_dict.save()
         logger.info(f'Set "{key}" to {value}')
 
@@ -505,4 +536,5 @@ class OpenFoamCase(OpenFoamInterface, ABC):
         self.phyngs = None
         self._runtime_monitor.stop()
         self._runtime_monitor = None
+        self.value_stream.close()
         super(OpenFoamCase, self).remove()
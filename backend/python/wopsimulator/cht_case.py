@@ -4,7 +4,9 @@ from typing import List
 
 from .exceptions import WrongPhyngType
 from .openfoam.common.filehandling import get_latest_time
+from .openfoam.common.pipeline import Pipeline
 from .openfoam.constant.material_properties import FLUID_MATERIALS
+from .openfoam.probes.probes import Probe
 from .case_base import OpenFoamCase
 from .phyngs.door import DoorPhyng
 from .phyngs.walls import WallsPhyng
@@ -161,25 +163,57 @@ class ChtCase(OpenFoamCase):
                 params = {**door, CONFIG_PHYNG_NAME_K: name, CONFIG_PHYNG_TYPE_K: DoorPhyng.type_name}
                 self.add_phyng(**params)
         if CONFIG_SENSORS_K in case_param and case_param[CONFIG_SENSORS_K]:
-            for name, sensor in case_param[CONFIG_SENSORS_K].items():
-                params = {**sensor, CONFIG_PHYNG_NAME_K: name, CONFIG_PHYNG_TYPE_K: SensorPhyng.type_name}
-                self.add_phyng(**params)
+            # Register all sensor probes with a single probes dictionary write
+            with Probe.batch(self.path):
+                for name, sensor in case_param[CONFIG_SENSORS_K].items():
+                    params = {**sensor, CONFIG_PHYNG_NAME_K: name, CONFIG_PHYNG_TYPE_K: SensorPhyng.type_name}
+                    self.add_phyng(**params)
         if CONFIG_ACS_K in case_param and case_param[CONFIG_ACS_K]:
             for name, ac in case_param[CONFIG_ACS_K].items():
                 params = {**ac, CONFIG_PHYNG_NAME_K: name, CONFIG_PHYNG_TYPE_K: AcPhyng.type_name}
                 self.add_phyng(**params)
 
-    def setup(self):
-        """Setups CHT case"""
+    def get_setup_pipeline(self) -> Pipeline:
+        """
+        Gets the CHT case setup pipeline, i.e., meshing and setting up the regions.
+        Patch types of the meshes and initial boundary conditions of the regions are set by phyngs after setup,
+        so they are not hashed, i.e., neither their edits make a setup stale nor they are removed on rerun
+        :return: setup pipeline
+        """
+        regions = list(self.material_props.materials)
+        pipeline = Pipeline(self.path, ignored=['*polyMesh/boundary', '0/*/*'])
+        pipeline.add_stage('blockMesh', self.run_block_mesh, inputs=['system/blockMeshDict'],
+                           outputs=['constant/polyMesh/*'])
+        pipeline.add_stage('snappyHexMesh', self.run_snappy_hex_mesh,
+                           inputs=['system/snappyHexMeshDict', 'constant/triSurface/*'],
+                           outputs=['constant/polyMesh/*'], depends=['blockMesh'])
+        pipeline.add_stage('splitMeshRegions', lambda: self.run_split_mesh_regions(cell_zones_only=True),
+                           outputs=['constant/*/polyMesh/*'], depends=['snappyHexMesh'],
+                           parameters={'cell_zones_only': True})
+        pipeline.add_stage('foamSetupCHT', self.run_setup_cht,
+                           inputs=['constant/materialProperties', 'templates/**'],
+                           outputs=[f'{directory}/{region}/*' for region in regions
+                                    for directory in ('0', 'constant', 'system')],
+                           depends=['splitMeshRegions'])
+        return pipeline
+
+    def setup(self, force: bool = False):
+        """
+        Setups CHT case, only the setup stages with changed inputs are rerun
+        :param force: rerun all setup stages, e.g., remesh
+        """
         logger.debug(f'Setting up CHT case')
+        # Geometry is recreated from scratch, old files might be shared with the case forks
+        self.remove_tri_surface_dir()
         self.prepare_geometry()
         self.partition_mesh(self.background_name)
         self.prepare_partitioned_mesh()
         self.clean_case()
-        self.run_block_mesh(waiting=True)
-        self.run_snappy_hex_mesh(waiting=True)
-        self.run_split_mesh_regions(cell_zones_only=True, waiting=True)
-        self.run_setup_cht(waiting=True)
+        # Dictionaries are hashed as the inputs of the setup stages
+        self.blockmesh_dict.save()
+        self.snappy_dict.save()
+        self.material_props.save()
+        self.get_setup_pipeline().run(force)
         self.extract_boundary_conditions()
         self._add_time_probe('T', 'fluid')
         self.bind_boundary_conditions()
@@ -3,19 +3,51 @@ Case loader
 """
 import os
 import json
+import shutil
+from glob import glob
 from pathlib import Path
 from typing import Union, Type
 
 from .case_base import OpenFoamCase
 from .cht_case import ChtCase
 from .exceptions import CaseTypeError, CaseNotFound, CaseAlreadyExists
-from .openfoam.common.filehandling import force_remove_dir, copy_tree
+from .openfoam.common.filehandling import force_remove_dir, clone_tree, get_processor_dirs
+from .openfoam.common.time_index import TimeIndex
 from .variables import CASES_STORAGE, CONFIG_PATH_K, CONFIG_TYPE_K, CUR_FILE_DIR, CONFIG_DEFAULTS, WOP_CONFIG_FILE
 
 CASE_TYPES = {
     ChtCase.case_type: ChtCase,
 }
 
+# Case template files, which are never modified in place, i.e., either only read or replaced atomically
+# They are hardlinked to the new cases instead of copying, which makes them copied on first write
+CASE_TEMPLATE_LINKED_FILES = [
+    'Allclean',
+    'Allrun*',
+    'constant/materialProperties',
+    'system/blockMeshDict',
+    'system/controlDict',
+    'system/decomposeParDict',
+    'system/probes',
+    'system/snappyHexMeshDict',
+    'templates/*',
+]
+
+# Mesh files of a case, which are hardlinked to its forks as they are never modified after meshing
+CASE_FORK_LINKED_FILES = [
+    'constant/*polyMesh/*',
+    'constant/triSurface/*',
+    'processor*/constant/*polyMesh/*',
+]
+# Case files, which are not copied to its forks
+CASE_FORK_IGNORED_FILES = [
+    'archive',
+    'postProcessing',
+    'log.*',
+    'PyFoamState.*',
+    '*.logfile',
+]
+
 CASE_CLS_TYPES = Union[
     Type[ChtCase],
     # Add your custom case types here
@@ -84,7 +116,7 @@ def create_case(case_name: str, case_param: dict, case_dir_path: str = CASES_STO
             force_remove_dir(case_path)
         else:
             raise CaseAlreadyExists(f'Project with name "{case_name}" already exists!')
-    copy_tree(f'{CUR_FILE_DIR}/openfoam/cases/{case_param[CONFIG_TYPE_K]}', case_path)
+    clone_tree(f'{CUR_FILE_DIR}/openfoam/cases/{case_param[CONFIG_TYPE_K]}', case_path, CASE_TEMPLATE_LINKED_FILES)
 
     # TODO: JSON schema validation
 
@@ -101,6 +133,73 @@ def create_case(case_name: str, case_param: dict, case_dir_path: str = CASES_STO
     return case
 
 
+def _get_fork_time(case_path: str, running: bool = False) -> str:
+    """
+    Gets the latest simulation time, which is present in all time directories of a case
+    :param case_path: case path
+    :param running: case is being solved, i.e., its latest time directory might be written at the moment
+    :return: time directory name
+    """
+    processors = [f'{case_path}/{name}' for name in get_processor_dirs(case_path)]
+    times = None
+    for directory in processors or [case_path]:
+        times = set(TimeIndex(directory).times) if times is None else times & set(TimeIndex(directory).times)
+    times = sorted(times, key=float)
+    if running and len(times) > 1:
+        times = times[:-1]
+    return times[-1] if times else '0'
+
+
+def fork_case(case_name: str, fork_name: str, case: OpenFoamCase = None, case_dir_path: str = CASES_STORAGE,
+              config_path: str = f'{CASES_STORAGE}/{WOP_CONFIG_FILE}') -> CASE_INST_TYPE:
+    """
+    Forks a case at its current simulation time. The fork does not need to be meshed or set up again:
+    mesh and triangulated surfaces are hardlinked, only the initial and the current time directories are copied,
+    case configuration (including Phyngs) is duplicated in wop.config.json.
+    :param case_name: name of the case to fork
+    :param fork_name: name of the new case
+    :param case: instance of the case to fork, its current parameters are taken instead of the saved ones
+    :param case_dir_path: OpenFOAM case creation folder path. A __main__ script directory is taken by default
+    :param config_path: path to a wop.config.json. A __main__ script directory is taken by default
+    :return: WoP Simulator class instance of the fork
+    """
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+    case_name = case_name if '.case' in case_name else f'{case_name}.case'
+    fork_name = fork_name if '.case' in fork_name else f'{fork_name}.case'
+    if case_name not in config.keys():
+        raise CaseNotFound(f'Case "{case_name}" is not defined in the config "{config_path}"')
+    case_config = case.dump_case() if case else config[case_name].copy()
+    if (case_type_name := case_config.get(CONFIG_TYPE_K)) not in CASE_TYPES.keys():
+        raise CaseTypeError(f'Case type is wrong or not specified! Expected one of: {", ".join(CASE_TYPES)}')
+    case_cls: CASE_CLS_TYPES = CASE_TYPES[case_type_name]
+    case_path = case_config[CONFIG_PATH_K]
+    fork_path = f'{case_dir_path}{"/" if case_dir_path[-1] != "/" else ""}{fork_name}'
+    if fork_name in config.keys() or os.path.exists(fork_path):
+        raise CaseAlreadyExists(f'Project with name "{fork_name}" already exists!')
+
+    # Only the initial and the current time directories are copied
+    fork_time = _get_fork_time(case_path, running=bool(case and case.running))
+    ignored = CASE_FORK_IGNORED_FILES + ['*polyMesh/boundary']
+    for directory in [case_path] + [f'{case_path}/{name}' for name in get_processor_dirs(case_path)]:
+        prefix = os.path.relpath(directory, case_path)
+        prefix = '' if prefix == '.' else f'{prefix}/'
+        ignored += [f'{prefix}{name}' for name in TimeIndex(directory).times if name not in ('0', fork_time)]
+    clone_tree(case_path, fork_path, CASE_TEMPLATE_LINKED_FILES + CASE_FORK_LINKED_FILES, ignored)
+    # Patch types are changed in boundary files, so they are copied instead of linking
+    for boundary_path in glob(f'{case_path}/**/polyMesh/boundary', recursive=True):
+        fork_boundary_path = f'{fork_path}/{os.path.relpath(boundary_path, case_path)}'
+        if os.path.isdir(os.path.dirname(fork_boundary_path)):
+            shutil.copy2(boundary_path, fork_boundary_path)
+
+    case_config[CONFIG_PATH_K] = fork_path
+    config[fork_name] = case_config
+    with open(config_path, 'w') as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+
+    return case_cls(**case_config, loaded=True)
+
+
 def save_case(case_name: str, case: OpenFoamCase, config_path: str = f'{CASES_STORAGE}/{WOP_CONFIG_FILE}'):
     """
     Saves WoP Simulator case parameters into wop.config.json.
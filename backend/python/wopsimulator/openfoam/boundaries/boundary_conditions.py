@@ -1,15 +1,18 @@
 """Boundary conditions script with corresponding field classes"""
-import re
 import os
 import logging
+import threading
 from dataclasses import dataclass
-from typing import Union, List, Callable
+from typing import Union, List, Callable, Optional
 
-from ..common.parsing import INTERNAL_FIELD_PATTERN, BOUNDARY_FIELD_PATTERN, LIST_OR_VALUE_PATTERN, \
-    SPECIFIC_FIELD_PATTERN, SPECIFIC_FIELD_VALUES_PATTERN, SPECIAL_CHARACTERS
-from ..common.parsing import NUMBER_PATTERN, VECTOR_PATTERN, FIELD_NAME_PATTERN
+import numpy as np
+
+from ..common.foam_file import FoamFile, FoamList, get_foam_path, load_foam_file, parse_foam_text, to_python, \
+    format_value, read_label_list
 from .boundary_types import Boundary, BoundaryBase
 
+CELL_PROC_ADDRESSING_FILE = 'polyMesh/cellProcAddressing'
+
 BOUNDARY_CONDITION_FILE_TEMPLATE = \
     r"""/*--------------------------------*- C++ -*----------------------------------*\
   =========                 |
@@ -39,6 +42,83 @@ boundaryField
 
 logger = logging.getLogger('openfoam')
 
+_local = threading.local()
+
+
+class BoundaryTransaction:
+    """
+    Boundary conditions transaction, which batches edits of boundary condition files across fields and regions.
+    Edited files are kept parsed in memory and each touched file is written once (atomically) on commit.
+    Transactions are bound to a thread, a nested transaction joins the outer one
+    """
+
+    def __init__(self):
+        self._files = {}
+        self._conditions = []
+        self._depth = 0
+
+    @staticmethod
+    def current() -> Optional['BoundaryTransaction']:
+        """Gets the active transaction of the current thread"""
+        return getattr(_local, 'transaction', None)
+
+    def get_file(self, path: str, condition: 'BoundaryConditionBase' = None) -> FoamFile:
+        """
+        Gets a parsed file of the transaction, the file is read once
+        :param path: file path
+        :param condition: boundary condition, which edits the file
+        :return: parsed file
+        """
+        if path not in self._files:
+            self._files[path] = load_foam_file(path)
+        if condition is not None and condition not in self._conditions:
+            self._conditions.append(condition)
+        return self._files[path]
+
+    def commit(self) -> int:
+        """
+        Writes all modified files
+        :return: number of written files
+        """
+        written = 0
+        for foam_file in self._files.values():
+            if foam_file.modified:
+                foam_file.save()
+                written += 1
+        logger.debug(f'Boundary transaction wrote {written} of {len(self._files)} files')
+        self._files.clear()
+        self._conditions.clear()
+        return written
+
+    def rollback(self):
+        """Discards all edits and reloads the boundary conditions from their files"""
+        self._files.clear()
+        conditions, self._conditions = self._conditions, []
+        for condition in conditions:
+            condition.reload()
+        logger.debug('Boundary transaction was rolled back')
+
+    def __enter__(self):
+        active = self.current()
+        if active is not None and active is not self:
+            active._depth += 1
+            return active
+        self._depth += 1
+        _local.transaction = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        active = self.current()
+        active._depth -= 1
+        if active._depth:
+            return False
+        _local.transaction = None
+        if exc_type is None:
+            active.commit()
+        else:
+            active.rollback()
+        return False
+
 
 @dataclass
 class InternalField(BoundaryBase):
@@ -56,8 +136,7 @@ class InternalField(BoundaryBase):
 
     def __str__(self):
         """Internal field string representation"""
-        value = self.value if not isinstance(self.value, list) else f'({" ".join(self.value)})'
-        return f'internalField {"uniform " if self.value_uniform else ""}{value};\n'
+        return f'internalField {"uniform " if self.value_uniform else ""}{format_value(self.value)};\n'
 
 
 class BoundaryConditionBase:
@@ -84,8 +163,9 @@ class BoundaryConditionBase:
         self._field = field
         self._region = region
         self._time = '0'
+        self._processors = []
         # Parse file if exists or create a new one
-        if os.path.exists(self._filepath % '0'):
+        if os.path.exists(self._get_filepath()):
             logger.debug(f'Found {field} boundary{" in " + region + " region" if region else ""}')
             self._file_parse()
         else:
@@ -94,99 +174,127 @@ class BoundaryConditionBase:
         logger.debug(f'{field} boundary{" in " + region + " region" if region else ""} was initialized')
 
     @staticmethod
-    def _get_internal_field(lines_str: str):
+    def _get_value(items: list):
+        """
+        Gets a value of a parsed entry
+        Note that only the LAST VALUE of a nonuniform list is taken and NOT the WHOLE LIST!
+        :param items: parsed entry value items
+        :return: value and uniform flag, value is None if the entry is not a single value (e.g., a table)
         """
-        Function to get internal field and it's parameters from a file converted to one string
-        :param lines_str: file lines as one string
+        uniform = bool(items) and items[0] == 'uniform'
+        if items and items[0] in ('uniform', 'nonuniform'):
+            items = items[1:]
+        if len(items) != 1:
+            return None, uniform
+        item = items[0]
+        if isinstance(item, FoamList):
+            return item.last, uniform
+        value = to_python(item)
+        if not isinstance(value, (str, float, list)):
+            return None, uniform
+        return value, uniform
+
+    @classmethod
+    def _get_internal_field(cls, foam_file: FoamFile):
+        """
+        Function to get internal field and it's parameters from a parsed file
+        :param foam_file: parsed boundary conditions file
         :return: internalField dictionary
         """
-        # Find an internal field pattern
-        internal_field_match = re.search(INTERNAL_FIELD_PATTERN, lines_str, flags=re.MULTILINE)
-        if not internal_field_match:
+        if not (entry := foam_file.get_entry('internalField')) or entry.is_dict:
             return {}
-        # Check if parsed internal field is a list or a value
-        # Note that only the LAST VALUE from the list is taken and NOT the WHOLE LIST!
-        if lst_type := internal_field_match.group(7):
-            lst_str = internal_field_match.group(9)
-            lst_size = int(internal_field_match.group(8))
-            if lst_type == 'vector':
-                values = re.findall(VECTOR_PATTERN, lst_str, flags=re.MULTILINE)
-                value = [float(val) for val in values[-1]]
-            else:
-                value = float(re.findall(f'\\s({NUMBER_PATTERN})\\n', lst_str, flags=re.MULTILINE)[-1])
-            value = {
-                'value': value
-            }
-        else:
-            if internal_field_match.group(4):
-                value = [float(internal_field_match.group(i)) for i in range(4, 7)]
-            else:
-                if (val := internal_field_match.group(3)).isnumeric():
-                    value = float(val)
-                else:
-                    value = val
-            value = {
-                'value': value,
-                'value_uniform': True if internal_field_match.group(2) else False
-            }
-        return {'internalField': value}
+        value, uniform = cls._get_value(entry.value)
+        if value is None:
+            return {}
+        return {'internalField': {'value': value, 'value_uniform': uniform}}
 
-    @staticmethod
-    def _get_boundary_fields(lines_str: str):
+    @classmethod
+    def _get_boundary_fields(cls, foam_file: FoamFile):
         """
-        Function to get boundary fields and their parameters from a file converted to one string
-        :param lines_str: file lines as one string
+        Function to get boundary fields and their parameters from a parsed file
+        :param foam_file: parsed boundary conditions file
         :return: dictionary of boundary type dictionaries
         """
-        # Find boundary fields and separate them into separate strings
-        fields = re.search(BOUNDARY_FIELD_PATTERN, lines_str, flags=re.MULTILINE).group(1)
-        fields = re.findall(f'{FIELD_NAME_PATTERN}{{\\s*([^}}]*)}}\\s*', fields, flags=re.MULTILINE)
         boundary_fields = {}
-        for name, val_str in fields:
-            f_contents = re.findall(f'^(?!\\/\\/)\\s*{FIELD_NAME_PATTERN}{LIST_OR_VALUE_PATTERN}', val_str,
-                                    flags=re.MULTILINE)
-            boundary_fields.update({name: {}})
-            for f_content in f_contents:
-                val_name = f_content[0]
-                # Check if parsed field is a list or a value
-                # Note that only the LAST VALUE from the list is taken and NOT the WHOLE LIST!
-                if lst_type := f_content[7]:
-                    if lst_type == 'vector':
-                        vectors = re.findall(VECTOR_PATTERN, f_content[9], flags=re.MULTILINE)
-                        val = [float(val) for val in vectors[-1]]
-                    else:
-                        temp = re.findall(f'\\s({NUMBER_PATTERN})\\n', f_content[9], flags=re.MULTILINE)
-                        if temp and temp[-1]:
-                            val = float(temp[-1])
-                else:
-                    if f_content[4]:
-                        val = [float(f_content[i]) for i in range(4, 7)]
-                    else:
-                        if f_content[3].isnumeric():
-                            val = float(f_content[3])
-                        else:
-                            val = f_content[3]
-                if f_content[2]:
-                    boundary_fields[name].update({f'{val_name}_uniform': True})
-                boundary_fields[name].update({val_name: val})
-
+        if not (entry := foam_file.get_entry('boundaryField')) or not entry.is_dict:
+            return boundary_fields
+        for field in entry.value.entries():
+            if not field.is_dict:
+                continue
+            boundary_fields.update({field.key: {}})
+            for value_entry in field.value.entries():
+                if value_entry.is_dict:
+                    continue
+                val, uniform = cls._get_value(value_entry.value)
+                if val is None:
+                    continue
+                if uniform:
+                    boundary_fields[field.key].update({f'{value_entry.key}_uniform': True})
+                boundary_fields[field.key].update({value_entry.key: val})
         return boundary_fields
 
+    def _load_file(self, filepath: str) -> FoamFile:
+        """
+        Loads a parsed file from the process-wide cache, the one of an active transaction is used to batch edits
+        :param filepath: file path
+        :return: parsed file
+        """
+        if transaction := BoundaryTransaction.current():
+            return transaction.get_file(filepath, self)
+        return load_foam_file(filepath)
+
+    def _get_filepaths(self) -> List[str]:
+        """
+        Gets the existing file paths of the current time, i.e., the one of a case
+        and the ones of its processor directories if they are set
+        """
+        paths = [get_foam_path(self._filepath % self._time)] + \
+                [get_foam_path(self._filepath % f'{processor}/{self._time}') for processor in self._processors]
+        return [path for path in paths if os.path.exists(path)]
+
+    def _get_filepath(self) -> str:
+        """
+        Gets the file path of the current time, which is compressed if written so by OpenFOAM.
+        The first processor file is used if the time exists only in processor directories
+        """
+        paths = self._get_filepaths()
+        return paths[0] if paths else get_foam_path(self._filepath % self._time)
+
+    def _get_processor_values(self, values: np.ndarray, filepath: str) -> np.ndarray:
+        """
+        Gets the values of the cells of a processor mesh, which is determined by a file path
+        :param values: values of all cells of a case
+        :param filepath: file path of a case or of its processor directory
+        :return: values of the processor cells, all values for a file of a case
+        """
+        filepath = os.path.abspath(filepath)
+        for processor in self._processors:
+            if filepath.startswith(os.path.abspath(f'{self._case_dir}/{processor}') + os.sep):
+                region = f'{self._region}/' if self._region else ''
+                return values[read_label_list(
+                    get_foam_path(f'{self._case_dir}/{processor}/constant/{region}{CELL_PROC_ADDRESSING_FILE}'))]
+        return values
+
+    def set_processors(self, processors: List[str]):
+        """
+        Sets processor directories of a decomposed case, which are then edited together with the case files
+        :param processors: processor directory names (e.g., processor0), empty to edit only the case files
+        """
+        self._processors = list(processors)
+
     def _file_parse(self):
         """Parses boundary condition file"""
-        filepath = self._filepath % self._time
+        filepath = self._get_filepath()
         if not os.path.exists(filepath):
             raise FileNotFoundError(f'File {filepath} does not exist')
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
-        lines_str = ''.join(lines)
+        foam_file = self._load_file(filepath)
         # Parse and initialize internal field if it exists
-        internal_field_dict = self._get_internal_field(lines_str)
+        internal_field_dict = self._get_internal_field(foam_file)
         if internal_field_dict:
             self.__dict__.update({'internalField': InternalField(**internal_field_dict['internalField'])})
             self['internalField'].attach_callback(self._file_update_internal_field)
         # Parse boundary fields and initialize them
-        boundary_fields_dict = self._get_boundary_fields(lines_str)
+        boundary_fields_dict = self._get_boundary_fields(foam_file)
         boundary_fields = {}
         for name, fields in boundary_fields_dict.items():
             if 'type' in fields:
@@ -209,127 +317,146 @@ class BoundaryConditionBase:
         """
 
         def wrapper(self, *args, **kwargs):
-            filepath = self._filepath % self._time
-            if os.path.exists(filepath):
-                with open(filepath, 'r') as f:
-                    lines = f.readlines()
-                lines_str = ''.join(lines)
-                lines_str = func(self, *args, **kwargs, lines_str=lines_str)
-                with open(filepath, 'w') as f:
-                    f.writelines(lines_str)
+            for filepath in self._get_filepaths():
+                foam_file = self._load_file(filepath)
+                func(self, *args, **kwargs, foam_file=foam_file)
+                # Files of a transaction are written on its commit
+                if not BoundaryTransaction.current():
+                    foam_file.save()
 
         return wrapper
 
+    @staticmethod
+    def _update_entry(entry, value, uniform: Optional[bool] = None):
+        """
+        Updates a parsed entry value if it differs, all elements of a nonuniform list are set to the value
+        :param entry: parsed entry
+        :param value: new value
+        :param uniform: uniform flag, the one of the entry is kept if None
+        """
+        typed_list = next((item for item in entry.value if isinstance(item, FoamList)), None)
+        if typed_list:
+            # All elements are compared, a list might end with the value while its other elements differ
+            array = typed_list.array
+            if array.shape[1:] != np.shape(value) or not np.all(array == np.asarray(value, dtype=np.float64)):
+                typed_list.fill(value)
+            return
+        old_value, old_uniform = BoundaryConditionBase._get_value(entry.value)
+        uniform = old_uniform if uniform is None else uniform
+        if old_value != value or old_uniform != uniform:
+            entry.set_value((['uniform'] if uniform else []) + [format_value(value)])
+
     @_file_write_decorator
-    def _file_add_internal_field(self, lines_str=None):
+    def _file_add_internal_field(self, foam_file=None):
         """
         Adds internalField to file
         Should only be used if internal field is not present in file
-        :param lines_str: file lines as one string
-        :return: modified file lines as one string
+        :param foam_file: parsed file
         """
         if 'internalField' not in self.__dict__:
             raise Exception(f'Internal field is not defined')
-        return re.sub(r'boundaryField', f'{self["internalField"]}\nboundaryField', lines_str)
+        internal_field = self['internalField']
+        value = (['uniform'] if internal_field.value_uniform else []) + [format_value(internal_field.value)]
+        index = foam_file.nodes.index(foam_file.get_entry('boundaryField')) if 'boundaryField' in foam_file else None
+        foam_file.add('internalField', value, index)
 
     @_file_write_decorator
-    def _file_update_internal_field(self, lines_str=None):
+    def _file_update_internal_field(self, foam_file=None):
         """
         Update internalField in file
         Should only be used if internal field is present in file
-        :param lines_str: file lines as one string
-        :return: modified file lines as one string
-        """
-        internal_field_match = re.search(INTERNAL_FIELD_PATTERN, lines_str, flags=re.MULTILINE)
-        string_orig = internal_field_match.group()
-        string_new = string_orig[:]
-        if lst_type := internal_field_match.group(7):
-            lst_str = internal_field_match.group(9)
-            value = self['internalField'].value
-            if lst_type == 'vector':
-                lst_str_new = re.sub(VECTOR_PATTERN, f'({value[0]} {value[1]} {value[2]})\n', lst_str)
-            else:
-                lst_str_new = re.sub(f'\\s*{NUMBER_PATTERN}\\n', f'\n{value}', lst_str) + '\n'
-            string_new = string_new.replace(lst_str, lst_str_new)
-        else:
-            value = self['internalField'].value
-            if not internal_field_match.group(2) and self['internalField'].value_uniform:
-                string_new = string_new.replace('internalField', 'internalField uniform')
-            elif internal_field_match.group(2) and not self['internalField'].value_uniform:
-                string_new = string_new.replace('internalField uniform', 'internalField')
-            if internal_field_match.group(4):
-                string = f'({value[0]} {value[1]} {value[2]})'
-            else:
-                string = f'{value}'
-            string_new = string_new.replace(internal_field_match.group(3), string)
-        return lines_str.replace(string_orig, string_new)
+        :param foam_file: parsed file
+        """
+        internal_field = self['internalField']
+        self._update_entry(foam_file.get_entry('internalField'), internal_field.value, internal_field.value_uniform)
+
+    @_file_write_decorator
+    def _file_set_internal_field_array(self, values: np.ndarray, foam_file=None):
+        """
+        Sets internalField in file to a nonuniform list, which is added if not present
+        :param values: values, one per cell of a case
+        :param foam_file: parsed file
+        """
+        values = self._get_processor_values(values, foam_file.path)
+        entry = foam_file.get_entry('internalField')
+        typed_list = next((item for item in entry.value if isinstance(item, FoamList)), None) \
+            if entry and not entry.is_dict else None
+        if typed_list and typed_list.width == (values.shape[1] if values.ndim > 1 else 1):
+            typed_list.array = values
+            return
+        value = ['nonuniform', foam_file.create_list(values)]
+        if entry:
+            entry.set_value(value)
+            return
+        index = foam_file.nodes.index(foam_file.get_entry('boundaryField')) if 'boundaryField' in foam_file else None
+        foam_file.add('internalField', value, index)
 
     @_file_write_decorator
-    def _file_add_boundary(self, name, lines_str=None):
+    def _file_add_boundary(self, name, foam_file=None):
         """
         Adds boundary with a specified name to file
         :param name: boundary name to add
-        :param lines_str: file lines as one string
-        :return: modified file lines as one string
+        :param foam_file: parsed file
         """
         if name not in self.__dict__:
             raise Exception(f'Boundary {name} is not in use')
-        string = str(self[name]).replace('\n', f'\n{" " * 4}')
-        return re.sub(r'boundaryField\s*{', f'boundaryField\n{{\n{" " * 4}{name}{string}\n', lines_str)
+        boundary = parse_foam_text(f'{name}{self[name]}').get_entry(name)
+        foam_file['boundaryField'].add(boundary, index=0)
 
     @_file_write_decorator
-    def _file_remove_boundary(self, name, lines_str=None):
+    def _file_remove_boundary(self, name, foam_file=None):
         """
         Removes boundary with a specified name from file
         :param name: boundary name to remove
-        :param lines_str: file lines as one string
-        :return: modified file lines as one string
+        :param foam_file: parsed file
         """
-        find_name = ''.join([f'\\{c}' if c in SPECIAL_CHARACTERS else c for c in name])
-        field_pattern = f'{SPECIFIC_FIELD_PATTERN % find_name}\n*'
-        return re.sub(field_pattern, '', lines_str)
+        foam_file['boundaryField'].remove(name)
 
     @_file_write_decorator
-    def _file_update_boundary(self, name, lines_str=None):
+    def _file_update_boundary(self, name, foam_file=None):
         """
         Updates boundary with a specified name in file
         :param name: boundary name to update
-        :param lines_str: file lines as one string
-        :return: modified file lines as one string
-        """
-        field_pattern = SPECIFIC_FIELD_VALUES_PATTERN % name
-        boundary_field_str = re.search(field_pattern, lines_str, flags=re.MULTILINE).group()
-        values = re.findall(f'{FIELD_NAME_PATTERN}{LIST_OR_VALUE_PATTERN}', boundary_field_str, flags=re.MULTILINE)
-        new_boundary_field_str = boundary_field_str[:]
-        for value in values:
-            val_name = value[0]
-            if lst_type := value[7]:
-                new_value = self[name][val_name]
-                if lst_type == 'vector':
-                    lst_str_new = re.sub(VECTOR_PATTERN, f'({new_value[0]} {new_value[1]} {new_value[2]})\n', value[9])
-                else:
-                    lst_str_new = re.sub(f'\\s*{NUMBER_PATTERN}\\n', f'\n{new_value}', value[9]) + '\n'
-                lines_str = lines_str.replace(value[9], lst_str_new)
-            else:
-                new_value = self[name][val_name]
-                append_uniform = False
-                old_value_line = re.search(f'.*{val_name}.*', boundary_field_str, flags=re.MULTILINE).group()
-                if value[2] and f'{val_name}_uniform' in self[name] and not self[name][f'{val_name}_uniform']:
-                    old_value_line = old_value_line.replace('uniform ', '')
-                elif not value[2] and f'{val_name}_uniform' in self[name] and self[name][f'{val_name}_uniform']:
-                    append_uniform = True
-                string = f'{"uniform " if append_uniform else ""}'
-                if value[4]:
-                    string += f'({new_value[0]} {new_value[1]} {new_value[2]})'
-                    new_value_line = re.sub(VECTOR_PATTERN, string, old_value_line)
-                else:
-                    string += f'{new_value}'
-                    if value[3].isnumeric():
-                        new_value_line = re.sub(f'{NUMBER_PATTERN};', f'{string};', old_value_line)
-                    else:
-                        new_value_line = old_value_line.replace(value[3], string)
-                new_boundary_field_str = new_boundary_field_str.replace(old_value_line, new_value_line)
-        return lines_str.replace(boundary_field_str, new_boundary_field_str)
+        :param foam_file: parsed file
+        """
+        for entry in foam_file['boundaryField'][name].entries():
+            if entry.is_dict or entry.key not in self[name].__dict__ or (value := self[name][entry.key]) is None:
+                continue
+            self._update_entry(entry, value, self[name].__dict__.get(f'{entry.key}_uniform'))
+
+    def get_field_array(self, name: str = 'internalField', key: str = 'value') -> Optional[np.ndarray]:
+        """
+        Gets a whole field of the current time as an array, i.e., all the values of a nonuniform list
+        :param name: internalField or a boundary name
+        :param key: boundary entry keyword, e.g., value or inletValue
+        :return: array of shape (cells,) or (cells, components) for nonuniform fields,
+        a single value array for uniform ones, None if a field has no numeric value
+        """
+        foam_file = self._load_file(self._get_filepath())
+        if name == 'internalField':
+            entry = foam_file.get_entry('internalField')
+        else:
+            boundary = foam_file['boundaryField'].get_entry(name) if 'boundaryField' in foam_file else None
+            entry = boundary.value.get_entry(key) if boundary and boundary.is_dict else None
+        if not entry or entry.is_dict:
+            return None
+        typed_list = next((item for item in entry.value if isinstance(item, FoamList)), None)
+        if typed_list:
+            return typed_list.array
+        value, _ = self._get_value(entry.value)
+        return None if value is None or isinstance(value, str) else np.asarray(value, dtype=np.float64)
+
+    def set_internal_field(self, values):
+        """
+        Sets a spatially varying internal field of the current time, e.g., a temperature stratification
+        The internal field value is the last one of the list as for the parsed nonuniform fields
+        :param values: array-like values, one per cell, of shape (cells,) for scalar fields
+        or (cells, components) for vector fields
+        """
+        values = np.asarray(values, dtype=np.float64)
+        self._file_set_internal_field_array(values)
+        self.__dict__['internalField'] = InternalField(values[-1].tolist() if len(values) else 0, value_uniform=False)
+        self['internalField'].attach_callback(self._file_update_internal_field)
 
     def save_boundary(self, name=None, inst=None):
         """
@@ -353,6 +480,12 @@ class BoundaryConditionBase:
             self._time = current_time
             self._file_parse()
 
+    def reload(self):
+        """Reloads boundaries and internal field from the file of the current time"""
+        for name in list(self):
+            del self.__dict__[name]
+        self._file_parse()
+
     def save(self):
         """Saves all modified boundaries of a boundary condition"""
         for b_condition_name in self:
@@ -386,7 +519,8 @@ class BoundaryConditionBase:
                     # If type is the same - simply update values with new once
                     for value_name in self[key]:
                         if value[value_name] is not None:
-                            self[key][value_name] = value[value_name]
+                            setattr(self[key], value_name, value[value_name])
+                    self[key].save()
                     return
                 self._file_remove_boundary(key)
             else:
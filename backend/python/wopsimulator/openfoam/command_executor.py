@@ -0,0 +1,146 @@
+"""Process-wide executor of OpenFOAM utilities (e.g., blockMesh or decomposePar), which runs them in the background"""
+import asyncio
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from threading import Lock
+from typing import Callable, List, Optional
+
+from .pyfoam_runner import PyFoamCmd
+
+# Maximum number of utilities running at the same time, None - ThreadPoolExecutor default
+COMMAND_EXECUTOR_MAX_WORKERS = None
+
+logger = logging.getLogger('openfoam')
+
+
+class CommandCancelled(Exception):
+    pass
+
+
+class CommandFuture(Future):
+    """
+    Future of an OpenFOAM utility run, its result is the value returned by the completion callback.
+    Futures can be waited for with a timeout, cancelled (a running utility is interrupted) and awaited
+    in coroutines, e.g., await asyncio.gather(*futures)
+    """
+
+    def __init__(self, argv: List[str]):
+        """
+        Command future initialization function
+        :param argv: utility arguments
+        """
+        super(CommandFuture, self).__init__()
+        self.argv = argv
+        self.command = None
+        self._cancel_requested = False
+        self._command_lock = Lock()
+
+    @property
+    def name(self) -> str:
+        return self.argv[0]
+
+    def cancel(self) -> bool:
+        """
+        Cancels a pending utility or interrupts a running one, which then fails with CommandCancelled
+        :return: False if a utility has already finished
+        """
+        if super(CommandFuture, self).cancel():
+            return True
+        with self._command_lock:
+            if self.done():
+                return False
+            self._cancel_requested = True
+            if self.command:
+                try:
+                    self.command.kill()
+                except (AttributeError, ProcessLookupError):
+                    pass
+        logger.debug(f'{self.name} was cancelled')
+        return True
+
+    def wait(self, timeout: Optional[float] = None):
+        """
+        Waits for a utility to finish, a utility is interrupted if it does not finish in time
+        :param timeout: maximum time to wait in seconds, no limit if None
+        :return: result of a utility run
+        """
+        try:
+            return self.result(timeout)
+        except TimeoutError:
+            self.cancel()
+            raise TimeoutError(f'{self.name} did not finish within {timeout} s')
+
+    def __await__(self):
+        return asyncio.wrap_future(self).__await__()
+
+
+class CommandExecutor:
+    """
+    Executor of OpenFOAM utilities, which runs independent utilities concurrently on a thread pool.
+    Dependent utilities are run one after another by waiting for the future of a previous one
+    """
+
+    def __init__(self, max_workers: int = COMMAND_EXECUTOR_MAX_WORKERS):
+        """
+        Command executor initialization function
+        :param max_workers: maximum number of utilities running at the same time
+        """
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='openfoam-command')
+
+    @staticmethod
+    def _execute(future: CommandFuture, callback: Optional[Callable], kwargs: dict):
+        """
+        Runs a utility of a future and sets its result
+        :param future: command future
+        :param callback: function called after a successful run, its return value is the result of a future
+        :param kwargs: PyFoamCmd keyword arguments
+        """
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            with future._command_lock:
+                if future._cancel_requested:
+                    raise CommandCancelled(f'{future.name} was cancelled')
+                future.command = PyFoamCmd(future.argv, **kwargs)
+            future.command.start()
+            future.set_result(callback() if callback else None)
+        except BaseException as e:
+            if future._cancel_requested:
+                e = CommandCancelled(f'{future.name} was cancelled')
+            future.set_exception(e)
+
+    def submit(self, argv: List[str], callback: Callable = None, **kwargs) -> CommandFuture:
+        """
+        Submits a utility to run in the background
+        :param argv: utility arguments, e.g., ['blockMesh', '-case', path]
+        :param callback: function called after a successful run before the future completes, e.g., to update state
+        :param kwargs: PyFoamCmd keyword arguments, e.g., is_parallel and cores
+        :return: future of a utility run
+        """
+        future = CommandFuture(argv)
+        self._pool.submit(self._execute, future, callback, kwargs)
+        logger.debug(f'{future.name} was submitted')
+        return future
+
+    def shutdown(self, wait: bool = True):
+        """
+        Shuts the executor down
+        :param wait: wait for submitted utilities to finish
+        """
+        self._pool.shutdown(wait=wait)
+
+
+_executor = None
+_executor_lock = Lock()
+
+
+def get_command_executor() -> CommandExecutor:
+    """
+    Gets the process-wide command executor, creates it on first use
+    :return: command executor
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = CommandExecutor()
+        return _executor
@@ -0,0 +1,137 @@
+"""Compressed archive of evicted OpenFOAM time directories"""
+import os
+import json
+import tarfile
+import logging
+from threading import Lock
+from typing import List, Dict, Set
+
+from .filehandling import atomic_write, force_remove_dir
+
+ARCHIVE_DIR = 'archive'
+ARCHIVE_INDEX_FILE = 'index.json'
+# Time directories are mostly numeric text, which is compressed well with the fastest level already
+ARCHIVE_COMPRESS_LEVEL = 1
+
+logger = logging.getLogger('openfoam')
+
+
+class TimeArchive:
+    """
+    Archive of case time directories, which packs evicted time directories of a case or processor directory
+    into compressed tar segments. An index maps each archived time to its segment,
+    so that a time can be restored on demand, e.g., for post-processing
+    """
+
+    def __init__(self, case_dir: str):
+        """
+        Time archive initialization function
+        :param case_dir: case directory
+        """
+        self.case_dir = case_dir
+        self.path = f'{case_dir}/{ARCHIVE_DIR}'
+        self.index_path = f'{self.path}/{ARCHIVE_INDEX_FILE}'
+        self.restored = set()
+        self._index = None
+        self._next_segments = {}
+        self._lock = Lock()
+
+    def _load_index(self) -> Dict[str, Dict[str, str]]:
+        """Loads the index of the archive ({directory: {time: segment}}), must be called with a lock"""
+        if self._index is None:
+            try:
+                with open(self.index_path, 'r') as f:
+                    self._index = json.load(f)
+            except (FileNotFoundError, json.decoder.JSONDecodeError):
+                self._index = {}
+        return self._index
+
+    def _get_rel_dir(self, directory: str) -> str:
+        rel_dir = os.path.relpath(directory, self.case_dir)
+        return '' if rel_dir == '.' else rel_dir
+
+    def pack(self, directory: str, names: List[str]) -> List[str]:
+        """
+        Packs time directories into a new segment, the directories are not removed
+        :param directory: case or processor directory
+        :param names: time directory names
+        :return: names of the packed time directories, the ones archived in the past are skipped
+        """
+        rel_dir = self._get_rel_dir(directory)
+        with self._lock:
+            index = self._load_index()
+            archived = index.setdefault(rel_dir, {})
+            names = [name for name in names if name not in archived]
+            if not names:
+                return []
+            segment_number = self._next_segments.get(rel_dir, len(set(archived.values())))
+            self._next_segments[rel_dir] = segment_number + 1
+        names = sorted(names, key=float)
+        segment = f'{rel_dir}/{segment_number:06d}.tar.gz' if rel_dir else f'{segment_number:06d}.tar.gz'
+        segment_path = f'{self.path}/{segment}'
+        os.makedirs(os.path.dirname(segment_path), exist_ok=True)
+        with tarfile.open(segment_path, 'w:gz', compresslevel=ARCHIVE_COMPRESS_LEVEL) as tar:
+            for name in names:
+                tar.add(f'{directory}/{name}', arcname=name)
+        with self._lock:
+            archived = self._load_index().setdefault(rel_dir, {})
+            archived.update({name: segment for name in names})
+            atomic_write(self.index_path, json.dumps(self._index))
+        logger.debug(f'Archived {len(names)} time directories of {directory} into {segment}')
+        return names
+
+    def times(self, directory: str = None) -> List[str]:
+        """
+        Gets archived times
+        :param directory: case or processor directory, case directory by default
+        :return: time directory names sorted by time
+        """
+        rel_dir = self._get_rel_dir(directory or self.case_dir)
+        with self._lock:
+            return sorted(self._load_index().get(rel_dir, {}), key=float)
+
+    def restore(self, time: str) -> List[str]:
+        """
+        Restores an archived time in the case and processor directories
+        Restored times are kept by the retention until released
+        :param time: time directory name
+        :return: paths of the restored time directories
+        """
+        with self._lock:
+            segments = {rel_dir: archived[time]
+                        for rel_dir, archived in self._load_index().items() if time in archived}
+            if not segments:
+                raise KeyError(f'Time {time} is not archived in {self.case_dir}')
+            self.restored.add(time)
+        restored = []
+        for rel_dir, segment in segments.items():
+            directory = f'{self.case_dir}/{rel_dir}' if rel_dir else self.case_dir
+            with tarfile.open(f'{self.path}/{segment}', 'r:gz') as tar:
+                members = [member for member in tar.getmembers()
+                           if member.name == time or member.name.startswith(f'{time}/')]
+                tar.extractall(directory, members=members)
+            restored.append(f'{directory}/{time}')
+        logger.debug(f'Restored time {time} of {self.case_dir} from the archive')
+        return restored
+
+    def release(self, time: str):
+        """
+        Releases a restored time, so that the retention removes it again
+        :param time: time directory name
+        """
+        with self._lock:
+            self.restored.discard(time)
+
+    @property
+    def pinned(self) -> Set[str]:
+        """Restored times, which must not be evicted"""
+        with self._lock:
+            return set(self.restored)
+
+    def clear(self):
+        """Removes the archive"""
+        with self._lock:
+            force_remove_dir(self.path)
+            self._index = None
+            self._next_segments.clear()
+            self.restored.clear()
@@ -1,8 +1,27 @@
 import os
+import io
+import gzip
 import shutil
 import re
+import fcntl
+import fnmatch
+import tempfile
+from typing import Union, Iterable, List
 
 from .parsing import NUMBER_PATTERN
+from .time_index import TimeIndex
+
+# Process umask, used to set permissions of atomically written files
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Compression level of gzip compressed files, OpenFOAM output is compressed well with the fastest level already
+GZIP_COMPRESS_LEVEL = 1
+
+# Linux ioctl request to share the data blocks of a file with another one (reflink)
+FICLONE = 0x40049409
+# Devices, on which reflinks are not supported
+_reflink_unsupported_devices = set()
 
 
 def force_remove_dir(src_dir):
@@ -33,6 +52,101 @@ def is_flat_dir(s_dir):
     return True
 
 
+def atomic_write(path: str, data: Union[str, Iterable[str]], encoding: str = None, compress: bool = False):
+    """
+    Writes a file atomically, i.e., readers (e.g., a running solver)
+    either see the old file or the new one, but never a partially written one
+    The data is written to a temporary file in the same directory, which then replaces the target
+    :param path: path to file
+    :param data: file contents as a string or lines
+    :param encoding: text encoding, the default one if not specified
+    :param compress: compress the file with gzip
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{name}.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as raw:
+            stream = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=GZIP_COMPRESS_LEVEL) if compress else raw
+            with io.TextIOWrapper(stream, encoding=encoding) as f:
+                if isinstance(data, str):
+                    f.write(data)
+                else:
+                    f.writelines(data)
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        else:
+            os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def reflink_file(src: str, dst: str) -> bool:
+    """
+    Clones a file with a reflink, i.e., the clone shares the data blocks with the source
+    until one of them is modified (copy-on-write). Supported by Btrfs, XFS and others
+    :param src: source file
+    :param dst: destination file
+    :return: True if file was cloned, False if reflinks are not supported
+    """
+    device = os.stat(os.path.dirname(os.path.abspath(dst))).st_dev
+    if device in _reflink_unsupported_devices:
+        return False
+    try:
+        with open(src, 'rb') as s, open(dst, 'wb') as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    except OSError:
+        _reflink_unsupported_devices.add(device)
+        if os.path.exists(dst):
+            os.remove(dst)
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def clone_tree(src: str, dst: str, linked_patterns: List[str] = None, ignored_patterns: List[str] = None):
+    """
+    Clones a directory tree fast and with almost no additional disk space
+    Files matching linked patterns are hardlinked, so they must never be modified in place,
+    but replaced instead (see atomic_write), which makes them copied on first write.
+    Other files are cloned with reflinks if supported, otherwise copied
+    :param src: source directory
+    :param dst: destination directory
+    :param linked_patterns: glob patterns of files (relative to source) to hardlink, e.g., ['system/controlDict']
+    :param ignored_patterns: glob patterns of files and directories (relative to source) not to clone
+    """
+    linked_patterns = linked_patterns or []
+    ignored_patterns = ignored_patterns or []
+
+    def matches(path, patterns):
+        return any(fnmatch.fnmatch(path, pattern) for pattern in patterns)
+
+    for root, dirs, files in os.walk(src):
+        rel_root = os.path.relpath(root, src)
+        dst_root = os.path.normpath(os.path.join(dst, rel_root))
+        os.makedirs(dst_root, exist_ok=True)
+        dirs[:] = [name for name in dirs
+                   if not matches(os.path.normpath(os.path.join(rel_root, name)), ignored_patterns)]
+        for name in files:
+            s_file = os.path.join(root, name)
+            d_file = os.path.join(dst_root, name)
+            rel_path = os.path.normpath(os.path.join(rel_root, name))
+            if matches(rel_path, ignored_patterns):
+                continue
+            if os.path.lexists(d_file):
+                os.remove(d_file)
+            if matches(rel_path, linked_patterns):
+                try:
+                    os.link(s_file, d_file)
+                    continue
+                except OSError:
+                    pass
+            if not reflink_file(s_file, d_file):
+                shutil.copy2(s_file, d_file)
+
+
 def copy_tree(src, dst):
     for item in os.listdir(src):
         s = os.path.join(src, item)
@@ -109,13 +223,24 @@ def get_latest_time(case_dir: str) -> str:
     """
     Returns latest time of the simulation that
     correspond to latest time result folder name
+    Uses a cached time index of a case directory shared by all callers
     :param case_dir: case directory
     :return: latest simulation time
     """
+    return TimeIndex(case_dir).latest
+
+
+def get_processor_dirs(case_dir: str) -> List[str]:
+    """
+    Returns processor directory names of a decomposed case
+    :param case_dir: case directory
+    :return: processor directory names sorted by processor number, e.g., ['processor0', 'processor1']
+    """
     try:
-        return sorted(get_numerated_dirs(case_dir, exception='0'), key=lambda x: float(x))[-1]
-    except (IndexError, FileNotFoundError):
-        return '0'
+        names = os.listdir(case_dir)
+    except FileNotFoundError:
+        return []
+    return sorted((name for name in names if re.match(r'^processor\d+$', name)), key=lambda name: int(name[9:]))
 
 
 def get_latest_time_parallel(case_dir: str) -> str:
@@ -123,10 +248,8 @@ def get_latest_time_parallel(case_dir: str) -> str:
     Returns latest time of the simulation that
     correspond to latest time result folder name
     in parallel run
+    Uses a cached time index of a first processor directory shared by all callers
     :param case_dir: case directory
     :return: latest simulation time
     """
-    try:
-        return sorted(get_numerated_dirs(f'{case_dir}/processor0', exception='0'), key=lambda x: float(x))[-1]
-    except (IndexError, FileNotFoundError):
-        return '0'
+    return TimeIndex(f'{case_dir}/processor0').latest
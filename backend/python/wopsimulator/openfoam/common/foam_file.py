@@ -0,0 +1,1023 @@
+"""Lossless OpenFOAM dictionary (FoamFile) parser and writer"""
+import os
+import re
+import copy
+import gzip
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, List, Union, Iterator, Optional
+
+import numpy as np
+
+from .filehandling import atomic_write
+from .parsing import NUMBER_PATTERN
+from .time_index import MTIME_GRANULARITY_NS
+
+# Whitespaces and comments between the tokens
+_TRIVIA_PATTERN = re.compile(r'(?:\s+|//[^\n]*|/\*.*?\*/)*', re.DOTALL)
+# Code streams, strings, punctuation and words (numbers, keywords, variables, directives)
+_TOKEN_PATTERN = re.compile(r'#\{.*?#\}|"(?:[^"\\]|\\.)*"|[{}()\[\];]|(?:[^\s{}()\[\];"/]|/(?![/*]))+', re.DOTALL)
+_TYPED_LIST_PATTERN = re.compile(r'^List<(\w+)>$')
+_LIST_END_PATTERN = re.compile(r'\)\s*\)')
+_NUMBER_PATTERN = re.compile(f'^{NUMBER_PATTERN}$')
+_INTEGER_PATTERN = re.compile(r'^\d+$')
+_PARENTHESES_TABLE = str.maketrans('()', '  ')
+
+_ARCH_SIZE_PATTERN = re.compile(r'(label|scalar)=(\d+)')
+
+# Numeric typed lists, which are located without tokenizing, scalar elements are not enclosed in parentheses
+SCALAR_LIST_TYPES = ('scalar', 'label')
+NUMERIC_LIST_TYPES = SCALAR_LIST_TYPES + ('vector', 'sphericalTensor', 'symmTensor', 'tensor')
+# Number of components of the typed list elements, used to locate the lists of binary files
+LIST_TYPE_COMPONENTS = {'scalar': 1, 'label': 1, 'vector': 3, 'sphericalTensor': 1, 'symmTensor': 6, 'tensor': 9}
+
+# Files are decoded byte to character, so that the raw blocks of binary files are kept as they are
+FOAM_FILE_ENCODING = 'latin-1'
+# Suffix of the files compressed by OpenFOAM (controlDict writeCompression)
+COMPRESSED_FILE_SUFFIX = '.gz'
+
+# Number of elements of a modified typed list, which are formatted at once while writing
+FOAM_LIST_CHUNK_SIZE = 65536
+# Formats of the ASCII list elements, scalars are written losslessly
+SCALAR_FORMAT = '%.17g'
+LABEL_FORMAT = '%d'
+# Memory budget of the process-wide cache of parsed files, approximated by the file sizes
+FOAM_FILE_CACHE_BUDGET = 256 * 1024 * 1024
+
+FoamItem = Union[str, 'FoamValueList', 'FoamList', 'FoamEntry']
+
+
+def is_number(token) -> bool:
+    """
+    Checks if a token is a number
+    :param token: token
+    :return: True if a token is a number
+    """
+    return isinstance(token, str) and bool(_NUMBER_PATTERN.match(token))
+
+
+def format_value(value) -> str:
+    """
+    Formats a Python value in OpenFOAM notation, e.g., [0, 1, 0] -> (0 1 0)
+    :param value: value (number, string, list or a parsed item)
+    :return: value string
+    """
+    if isinstance(value, (FoamValueList, FoamList, FoamEntry)):
+        return value.dumps()
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (list, tuple)):
+        return f'({" ".join([format_value(val) for val in value])})'
+    return str(value)
+
+
+def to_python(item: FoamItem):
+    """
+    Converts a parsed value item to a Python value, i.e., numbers to floats, numeric lists to lists of floats
+    :param item: parsed value item
+    :return: Python value, an original item if it cannot be converted
+    """
+    if is_number(item):
+        return float(item)
+    if isinstance(item, FoamValueList) and item.brackets == '()' and all(is_number(i) for i in item.items):
+        return [float(i) for i in item.items]
+    return item
+
+
+def get_foam_path(path: str) -> str:
+    """
+    Gets the path of an existing file, which might be compressed by OpenFOAM (e.g., 10/fluid/T.gz)
+    :param path: file path without the compression suffix
+    :return: path of the uncompressed file if it exists, the compressed one otherwise
+    """
+    if os.path.exists(path) or not os.path.exists(compressed_path := path + COMPRESSED_FILE_SUFFIX):
+        return path
+    return compressed_path
+
+
+def decode_foam_bytes(data: bytes, path: str = '') -> str:
+    """
+    Decodes file contents, which are decompressed if a file is compressed
+    :param data: file contents
+    :param path: file path
+    :return: file text
+    """
+    if path.endswith(COMPRESSED_FILE_SUFFIX):
+        data = gzip.decompress(data)
+    return data.decode(FOAM_FILE_ENCODING)
+
+
+class FoamValueList:
+    """Untyped list of values, e.g., a vector (0 1 0), dimensions [0 0 0 1 0 0 0] or a list of dictionaries"""
+
+    def __init__(self, items: List[FoamItem], brackets: str = '()', gaps: List[str] = None):
+        """
+        Value list initialization function
+        :param items: list items
+        :param brackets: list brackets, () or []
+        :param gaps: text before each item and before the closing bracket, one more than items
+        """
+        self.items = items
+        self.brackets = brackets
+        self.gaps = gaps or ([''] + [' '] * (len(items) - 1) + [''] if items else [''])
+        self._modified = False
+
+    @property
+    def modified(self) -> bool:
+        return self._modified or any(not isinstance(item, str) and item.modified for item in self.items)
+
+    def mark_saved(self):
+        self._modified = False
+        for item in self.items:
+            if not isinstance(item, str):
+                item.mark_saved()
+
+    def dumps(self) -> str:
+        """Gets the list text"""
+        output = [self.brackets[0]]
+        for gap, item in zip(self.gaps, self.items):
+            output += [gap, format_value(item)]
+        output += [self.gaps[-1], self.brackets[1]]
+        return ''.join(output)
+
+
+class FoamList:
+    """
+    Typed list block, e.g., List<scalar> 3(1 2 3). Its body is only located while parsing,
+    values are parsed in bulk into a NumPy array on first access, so that large fields of time directories
+    are parsed in linear time. Modified lists are written in chunks, i.e., without building the whole text
+    """
+
+    def __init__(self, kind: str, size: int, body: str = None, text: str = None, compact: bool = False,
+                 dtype: str = None):
+        """
+        Typed list initialization function
+        :param kind: list type, e.g., scalar or vector
+        :param size: number of list elements
+        :param body: list body text (between the brackets)
+        :param text: original text of a list
+        :param compact: list is written in compact notation, i.e., all elements are the same: 3{0}
+        :param dtype: NumPy type of the list components if the list is binary (e.g., <f8), ASCII if None
+        """
+        self.kind = kind
+        self.size = size
+        self.text = text
+        self.compact = compact
+        self.dtype = dtype
+        self._body = body
+        self._array = None
+        self._modified = False
+
+    @classmethod
+    def from_array(cls, values, kind: str = None, dtype: str = None) -> 'FoamList':
+        """
+        Creates a typed list from values
+        :param values: array-like values, one scalar or one vector (list of components) per element
+        :param kind: list type, scalar for 1D values and vector for 2D ones by default
+        :param dtype: NumPy type of the list components if the list is binary, ASCII if None
+        :return: typed list
+        """
+        array = np.asarray(values, dtype=np.float64)
+        foam_list = cls(kind or ('scalar' if array.ndim == 1 else 'vector'), len(array), dtype=dtype)
+        foam_list.array = array
+        return foam_list
+
+    @property
+    def modified(self) -> bool:
+        return self._modified
+
+    def mark_saved(self):
+        self._modified = False
+
+    def __deepcopy__(self, memo):
+        """Copies a list sharing its (immutable) text, values of an unmodified list are parsed again on access"""
+        duplicate = FoamList(self.kind, self.size, self._body, self.text, self.compact, self.dtype)
+        duplicate._modified = self._modified
+        if self.text is None and self._array is not None:
+            duplicate._array = self._array.copy()
+        return duplicate
+
+    def _parse_element(self, element: str):
+        if self.dtype:
+            values = np.frombuffer(element.encode(FOAM_FILE_ENCODING), dtype=self.dtype).tolist()
+            return float(values[0]) if self.kind in SCALAR_LIST_TYPES else [float(val) for val in values]
+        if self.kind in SCALAR_LIST_TYPES:
+            return float(element)
+        return [float(val) for val in element.strip('() \n\t').split()]
+
+    @property
+    def width(self) -> int:
+        """Number of components of an element, 1 for scalars"""
+        if self.kind in SCALAR_LIST_TYPES:
+            return 1
+        if self._array is not None:
+            return self._array.shape[1] if self._array.ndim > 1 else 1
+        return len(self.last) if self.size else 0
+
+    @property
+    def array(self) -> np.ndarray:
+        """List values as an array of shape (size,) for scalars and (size, components) for other types"""
+        if self._array is None:
+            if not self.size:
+                values = np.empty(0 if self.kind in SCALAR_LIST_TYPES else (0, LIST_TYPE_COMPONENTS.get(self.kind, 1)))
+            elif self.dtype:
+                values = np.frombuffer(self._body.encode(FOAM_FILE_ENCODING), dtype=self.dtype).astype(np.float64)
+            elif self.kind in SCALAR_LIST_TYPES:
+                values = np.fromstring(self._body, dtype=np.float64, sep=' ')
+            else:
+                values = np.fromstring(self._body.translate(_PARENTHESES_TABLE), dtype=np.float64, sep=' ')
+            # Empty lists already have their final shape
+            if self.size and self.compact:
+                values = np.tile(values, (self.size, 1)) if self.kind not in SCALAR_LIST_TYPES \
+                    else np.full(self.size, values[0])
+            elif self.size and self.kind not in SCALAR_LIST_TYPES:
+                values = values.reshape(self.size, -1)
+            if len(values) != self.size:
+                raise ValueError(f'List<{self.kind}> has {len(values)} elements instead of {self.size}')
+            self._array = values
+        return self._array
+
+    @array.setter
+    def array(self, values):
+        self._array = np.asarray(values, dtype=np.float64)
+        self.size = len(self._array)
+        self.compact = False
+        self.text = None
+        self._body = None
+        self._modified = True
+
+    @property
+    def values(self) -> list:
+        """List values, scalars as floats, other types (e.g., vector) as lists of floats"""
+        return self.array.tolist()
+
+    @values.setter
+    def values(self, values: list):
+        self.array = values
+
+    @property
+    def last(self):
+        """Last list value, which is found without parsing the whole list"""
+        if not self.size:
+            return None
+        if self._array is not None:
+            return self._array[-1].tolist()
+        if self.compact:
+            return self._parse_element(self._body)
+        if self.dtype:
+            return self._parse_element(self._body[-(len(self._body) // self.size):])
+        if self.kind in SCALAR_LIST_TYPES:
+            return self._parse_element(self._body.rsplit(None, 1)[-1])
+        return self._parse_element(self._body[self._body.rindex('('):])
+
+    def fill(self, value):
+        """
+        Sets all list elements to a value keeping the list size
+        :param value: value of the list element type (float or list of floats)
+        """
+        self.array = np.full((self.size, *np.shape(value)), value, dtype=np.float64)
+
+    def iter_dumps(self) -> Iterator[str]:
+        """Gets the list text in chunks, the original text if the list was not modified"""
+        if self.text is not None:
+            yield self.text
+            return
+        if self.dtype:
+            yield f'List<{self.kind}> \n{self.size}\n('
+            for start in range(0, self.size, FOAM_LIST_CHUNK_SIZE):
+                chunk = self._array[start:start + FOAM_LIST_CHUNK_SIZE].astype(self.dtype)
+                yield chunk.tobytes().decode(FOAM_FILE_ENCODING)
+            yield ')'
+            return
+        yield f'List<{self.kind}> \n{self.size}\n(\n'
+        # Labels are written as integers, scalars with the precision of a double
+        element_format = LABEL_FORMAT if self.kind == 'label' else SCALAR_FORMAT
+        if self._array.ndim > 1:
+            element_format = f'({" ".join([element_format] * self._array.shape[1])})'
+        for start in range(0, self.size, FOAM_LIST_CHUNK_SIZE):
+            chunk = self._array[start:start + FOAM_LIST_CHUNK_SIZE]
+            if self.kind == 'label':
+                chunk = chunk.astype(np.int64)
+            # Whole chunk is formatted by a single formatting operation
+            yield (f'{element_format}\n' * len(chunk)) % tuple(chunk.ravel().tolist())
+        yield ')'
+
+    def dumps(self) -> str:
+        """Gets the list text, the original one if the list was not modified"""
+        return ''.join(self.iter_dumps())
+
+
+class FoamDirective:
+    """Directive (e.g., #include "file"), macro expansion ($var) or an empty statement, kept verbatim"""
+    modified = False
+
+    def __init__(self, text: str):
+        self.text = text
+
+    @property
+    def name(self) -> str:
+        return self.text.split()[0] if self.text.split() else ''
+
+    def mark_saved(self):
+        pass
+
+    def iter_dumps(self) -> Iterator[str]:
+        yield self.text
+
+    def dumps(self) -> str:
+        return self.text
+
+
+class FoamEntry:
+    """Dictionary entry, i.e., a keyword with either a sub-dictionary or a list of values"""
+
+    def __init__(self, key: str, value: Union['FoamDict', List[FoamItem]], separator: str = ' ',
+                 gaps: List[str] = None, terminated: bool = True):
+        """
+        Dictionary entry initialization function
+        :param key: entry keyword
+        :param value: sub-dictionary or list of values
+        :param separator: text between the keyword and the value
+        :param gaps: text after each value item (the last one is before the semicolon)
+        :param terminated: value entry is terminated with a semicolon
+        """
+        self.key = key
+        self.value = value
+        self.separator = separator
+        self.gaps = gaps if gaps is not None else self._default_gaps(value)
+        self.terminated = terminated
+        self._modified = False
+
+    @staticmethod
+    def _default_gaps(value) -> List[str]:
+        return [' '] * (len(value) - 1) + [''] if isinstance(value, list) and value else []
+
+    @property
+    def is_dict(self) -> bool:
+        return isinstance(self.value, FoamDict)
+
+    @property
+    def modified(self) -> bool:
+        if self._modified:
+            return True
+        if self.is_dict:
+            return self.value.modified
+        return any(not isinstance(item, str) and item.modified for item in self.value)
+
+    def mark_saved(self):
+        self._modified = False
+        if self.is_dict:
+            self.value.mark_saved()
+        else:
+            for item in self.value:
+                if not isinstance(item, str):
+                    item.mark_saved()
+
+    def set_value(self, value):
+        """
+        Replaces an entry value
+        :param value: list of value items, sub-dictionary or a Python value (e.g., 'uniform 300' or [0, 1, 0])
+        """
+        if isinstance(value, FoamDict):
+            self.value = value
+        elif isinstance(value, list) and all(isinstance(item, (str, FoamValueList, FoamList)) for item in value):
+            self.value = value
+        else:
+            self.value = [format_value(value)]
+        if self.is_dict and self.separator == ' ':
+            self.separator = '\n'
+        self.gaps = self._default_gaps(self.value)
+        self._modified = True
+
+    def iter_dumps(self) -> Iterator[str]:
+        """Gets the entry text in chunks"""
+        yield self.key
+        yield self.separator
+        if self.is_dict:
+            yield from self.value.iter_dumps()
+            return
+        for item, gap in zip(self.value, self.gaps):
+            if isinstance(item, FoamList):
+                yield from item.iter_dumps()
+            else:
+                yield format_value(item)
+            yield gap
+        if self.terminated:
+            yield ';'
+
+    def dumps(self) -> str:
+        """Gets the entry text"""
+        return ''.join(self.iter_dumps())
+
+
+class FoamDict:
+    """
+    Dictionary, which keeps its entries and directives in order together with the text between them
+    (whitespaces and comments), so that an unmodified dictionary is written exactly as it was read
+    """
+
+    def __init__(self, nodes: list = None, gaps: List[str] = None, braces: bool = True):
+        """
+        Dictionary initialization function
+        :param nodes: entries and directives
+        :param gaps: text before each node and before the end of a dictionary, one more than nodes
+        :param braces: dictionary is enclosed in braces (i.e., is not a file)
+        """
+        self.nodes = nodes or []
+        self.gaps = gaps or ['\n'] * (len(self.nodes) + 1)
+        self.braces = braces
+        self._modified = False
+
+    @property
+    def modified(self) -> bool:
+        return self._modified or any(node.modified for node in self.nodes)
+
+    def mark_saved(self):
+        self._modified = False
+        for node in self.nodes:
+            node.mark_saved()
+
+    @property
+    def indent(self) -> str:
+        """Indentation of the dictionary entries"""
+        for gap in self.gaps[:-1]:
+            if '\n' in gap:
+                return gap[gap.rindex('\n') + 1:]
+        return ' ' * 4 if self.braces else ''
+
+    def reindent(self, indent: str):
+        """
+        Indents a dictionary (e.g., a parsed snippet) to be nested in another one
+        :param indent: additional indentation
+        """
+        self.gaps = [gap.replace('\n', f'\n{indent}') for gap in self.gaps]
+        for entry in self.entries():
+            entry.separator = entry.separator.replace('\n', f'\n{indent}')
+            if entry.is_dict:
+                entry.value.reindent(indent)
+        self._modified = True
+
+    def entries(self) -> Iterator[FoamEntry]:
+        """Iterates over the dictionary entries"""
+        for node in self.nodes:
+            if isinstance(node, FoamEntry):
+                yield node
+
+    def keys(self) -> List[str]:
+        return [entry.key for entry in self.entries()]
+
+    def get_entry(self, key: str) -> Optional[FoamEntry]:
+        """
+        Gets an entry by its keyword, the last one is taken if there are duplicates (as OpenFOAM does)
+        :param key: entry keyword
+        :return: entry or None if it does not exist
+        """
+        for node in reversed(self.nodes):
+            if isinstance(node, FoamEntry) and node.key == key:
+                return node
+        return None
+
+    def set(self, key: str, value):
+        """
+        Sets an entry value, adds the entry to the end of a dictionary if it does not exist
+        :param key: entry keyword
+        :param value: entry value (see FoamEntry.set_value)
+        """
+        if entry := self.get_entry(key):
+            entry.set_value(value)
+        else:
+            self.add(key, value)
+
+    def add(self, key: Union[str, FoamEntry, FoamDirective], value=None, index: int = None):
+        """
+        Adds an entry to a dictionary
+        :param key: entry keyword, or an entry or a directive to add
+        :param value: entry value (see FoamEntry.set_value)
+        :param index: position of an entry, the end by default
+        :return: added entry
+        """
+        if isinstance(key, (FoamEntry, FoamDirective)):
+            node = key
+        else:
+            node = FoamEntry(key, [])
+            node.set_value(value)
+        if isinstance(node, FoamEntry) and node.is_dict and self.braces:
+            node.separator = node.separator.replace('\n', f'\n{self.indent}')
+            node.value.reindent(self.indent)
+        index = len(self.nodes) if index is None else index
+        self.nodes.insert(index, node)
+        self.gaps.insert(index, f'\n{self.indent}' if self.braces or self.nodes[1:] else '')
+        self._modified = True
+        return node
+
+    def remove(self, key: str):
+        """
+        Removes all entries with a keyword
+        :param key: entry keyword
+        """
+        for idx in reversed(range(len(self.nodes))):
+            if isinstance(self.nodes[idx], FoamEntry) and self.nodes[idx].key == key:
+                del self.nodes[idx]
+                del self.gaps[idx]
+                self._modified = True
+
+    def iter_dumps(self) -> Iterator[str]:
+        """Gets the dictionary text in chunks"""
+        if self.braces:
+            yield '{'
+        for gap, node in zip(self.gaps, self.nodes):
+            yield gap
+            yield from node.iter_dumps()
+        yield self.gaps[-1]
+        if self.braces:
+            yield '}'
+
+    def dumps(self) -> str:
+        """Gets the dictionary text"""
+        return ''.join(self.iter_dumps())
+
+    def __contains__(self, key: str) -> bool:
+        return self.get_entry(key) is not None
+
+    def __getitem__(self, key: str):
+        """Gets a sub-dictionary or a list of value items by keyword"""
+        if (entry := self.get_entry(key)) is None:
+            raise KeyError(key)
+        return entry.value
+
+    def __setitem__(self, key: str, value):
+        self.set(key, value)
+
+    def __delitem__(self, key: str):
+        self.remove(key)
+
+
+class FoamFileParser:
+    """
+    Single pass recursive descent parser of FoamFile syntax
+    Typed list blocks (List<scalar>, List<vector>, etc.) are located without tokenizing their elements
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.dtypes = None
+
+    def _read_header(self, header: 'FoamDict'):
+        """
+        Reads the data format of a file from its header, the typed lists of binary files are raw blocks
+        :param header: FoamFile header dictionary
+        """
+        entry = header.get_entry('format')
+        if not entry or entry.is_dict or entry.value[:1] != ['binary']:
+            return
+        sizes, byte_order = {'label': 32, 'scalar': 64}, '<'
+        if (entry := header.get_entry('arch')) and not entry.is_dict and entry.value:
+            arch = entry.value[0].strip('"')
+            sizes.update({name: int(size) for name, size in _ARCH_SIZE_PATTERN.findall(arch)})
+            byte_order = '>' if 'MSB' in arch else '<'
+        self.dtypes = {'label': f'{byte_order}i{sizes["label"] // 8}',
+                       'scalar': f'{byte_order}f{sizes["scalar"] // 8}'}
+
+    def _error(self, message: str):
+        line = self.text.count('\n', 0, self.pos) + 1
+        return ValueError(f'{message} at line {line}')
+
+    def _skip(self) -> str:
+        """Skips whitespaces and comments, returns skipped text"""
+        match = _TRIVIA_PATTERN.match(self.text, self.pos)
+        self.pos = match.end()
+        return match.group()
+
+    def _peek(self) -> str:
+        return self.text[self.pos] if self.pos < len(self.text) else ''
+
+    def _next_token(self) -> str:
+        match = _TOKEN_PATTERN.match(self.text, self.pos)
+        if not match:
+            raise self._error('Unexpected end of file' if self.pos >= len(self.text) else 'Unexpected character')
+        self.pos = match.end()
+        return match.group()
+
+    def parse(self) -> 'FoamDict':
+        """
+        Parses the whole text
+        :return: top level dictionary
+        """
+        nodes, gaps = self._parse_dict_body(closed=False)
+        return FoamDict(nodes, gaps, braces=False)
+
+    def parse_label_list(self) -> np.ndarray:
+        """
+        Parses a text consisting of a header and a list of labels
+        :return: array of labels
+        """
+        while True:
+            self._skip()
+            start = self.pos
+            if _INTEGER_PATTERN.match(self._next_token()):
+                self.pos = start
+                break
+            self.pos = start
+            self._parse_statement()
+        label_list = self._parse_typed_list(start, 'label')
+        if label_list is None:
+            raise self._error('List of labels is expected')
+        return label_list.array.astype(np.int64)
+
+    def _parse_dict_body(self, closed: bool = True):
+        nodes, gaps = [], []
+        while True:
+            gaps.append(self._skip())
+            if self.pos >= len(self.text):
+                if closed:
+                    raise self._error('Dictionary is not closed')
+                return nodes, gaps
+            if closed and self._peek() == '}':
+                self.pos += 1
+                return nodes, gaps
+            nodes.append(self._parse_statement())
+
+    def _parse_statement(self):
+        start = self.pos
+        token = self._next_token()
+        if token == ';':
+            return FoamDirective(token)
+        if token in '{}()[]':
+            raise self._error(f'Unexpected "{token}"')
+        if token[0] in '#$':
+            # Directives have a single argument, macro expansions might be terminated with a semicolon
+            position = self.pos
+            self._skip()
+            if token[0] == '#' and token != '#{' and self._peek() not in ('', '}', ';'):
+                self._parse_item()
+            elif token[0] == '$' and self._peek() == ';':
+                self.pos += 1
+            else:
+                self.pos = position
+            return FoamDirective(self.text[start:self.pos])
+        end = self.pos
+        separator = self._skip()
+        if self._peek() == '{':
+            self.pos += 1
+            nodes, gaps = self._parse_dict_body()
+            entry = FoamEntry(token, FoamDict(nodes, gaps), separator)
+            if token == 'FoamFile':
+                self._read_header(entry.value)
+            return entry
+        items, item_gaps = [], []
+        while True:
+            char = self._peek()
+            if char == ';':
+                self.pos += 1
+                return FoamEntry(token, items, separator, item_gaps)
+            if not char or char == '}':
+                # Unterminated statement, e.g., a list of polyMesh/boundary, trailing text belongs to the dictionary
+                self.pos = end
+                if item_gaps:
+                    item_gaps[-1] = ''
+                return FoamEntry(token, items, separator if items else '', item_gaps, terminated=False)
+            items.append(self._parse_item())
+            end = self.pos
+            item_gaps.append(self._skip())
+
+    def _parse_item(self) -> FoamItem:
+        start = self.pos
+        token = self._next_token()
+        if token == '(':
+            return self._parse_value_list('()')
+        if token == '[':
+            return self._parse_value_list('[]')
+        if token in ')]}':
+            raise self._error(f'Unexpected "{token}"')
+        if (match := _TYPED_LIST_PATTERN.match(token)) and match.group(1) in NUMERIC_LIST_TYPES:
+            typed_list = self._parse_typed_list(start, match.group(1))
+            if typed_list:
+                return typed_list
+        return token
+
+    def _parse_value_list(self, brackets: str) -> FoamValueList:
+        items, gaps = [], []
+        while True:
+            gaps.append(self._skip())
+            char = self._peek()
+            if not char:
+                raise self._error('List is not closed')
+            if char == brackets[1]:
+                self.pos += 1
+                return FoamValueList(items, brackets, gaps)
+            if char == ';':
+                self.pos += 1
+                items.append(';')
+                continue
+            item = self._parse_item()
+            if isinstance(item, str) and item[0] != '#':
+                # List of dictionaries, e.g., patches of polyMesh/boundary
+                position = self.pos
+                separator = self._skip()
+                if self._peek() == '{':
+                    self.pos += 1
+                    nodes, dict_gaps = self._parse_dict_body()
+                    item = FoamEntry(item, FoamDict(nodes, dict_gaps), separator)
+                else:
+                    self.pos = position
+            items.append(item)
+
+    def _parse_typed_list(self, start: int, kind: str) -> Optional[FoamList]:
+        position = self.pos
+        self._skip()
+        match = _TOKEN_PATTERN.match(self.text, self.pos)
+        if not match or not _INTEGER_PATTERN.match(match.group()):
+            self.pos = position
+            return None
+        self.pos = match.end()
+        size = int(match.group())
+        self._skip()
+        char = self._peek()
+        if self.dtypes and char and char in '({':
+            return self._parse_binary_list(start, kind, size)
+        try:
+            if char == '{':
+                end = self.text.index('}', self.pos)
+                compact = True
+            elif char == '(':
+                if kind in SCALAR_LIST_TYPES or not size:
+                    end = self.text.index(')', self.pos)
+                else:
+                    end = _LIST_END_PATTERN.search(self.text, self.pos).end() - 1
+                compact = False
+            else:
+                self.pos = position
+                return None
+        except (ValueError, AttributeError):
+            raise self._error(f'List<{kind}> is not closed')
+        body = self.text[self.pos + 1:end]
+        self.pos = end + 1
+        return FoamList(kind, size, body, self.text[start:self.pos], compact)
+
+    def _parse_binary_list(self, start: int, kind: str, size: int) -> FoamList:
+        """Parses a raw block of a binary file, which is located by its size"""
+        dtype = self.dtypes['label' if kind == 'label' else 'scalar']
+        compact = self._peek() == '{'
+        length = (1 if compact else size) * LIST_TYPE_COMPONENTS[kind] * np.dtype(dtype).itemsize
+        end = self.pos + 1 + length
+        if self.text[end:end + 1] != ('}' if compact else ')'):
+            raise self._error(f'Binary List<{kind}> is not closed')
+        body = self.text[self.pos + 1:end]
+        self.pos = end + 1
+        return FoamList(kind, size, body, self.text[start:self.pos], compact, dtype)
+
+
+class FoamFile(FoamDict):
+    """OpenFOAM dictionary file (e.g., a boundary conditions file 0/T), which is written back losslessly"""
+
+    def __init__(self, path: str = None, text: str = None):
+        """
+        FoamFile initialization function
+        :param path: file path, the file is read if text is not provided
+        :param text: file text
+        """
+        if text is None:
+            with open(path, 'rb') as f:
+                text = decode_foam_bytes(f.read(), path)
+        parser = FoamFileParser(text)
+        root = parser.parse()
+        super(FoamFile, self).__init__(root.nodes, root.gaps, braces=False)
+        self.path = path
+        self.list_dtypes = parser.dtypes
+
+    @property
+    def binary(self) -> bool:
+        """File is written in binary format, i.e., its typed lists are raw blocks"""
+        return self.list_dtypes is not None
+
+    def create_list(self, values, kind: str = None) -> FoamList:
+        """
+        Creates a typed list in the format of the file
+        :param values: array-like values, one scalar or one vector (list of components) per element
+        :param kind: list type, scalar for 1D values and vector for 2D ones by default
+        :return: typed list
+        """
+        array = np.asarray(values, dtype=np.float64)
+        kind = kind or ('scalar' if array.ndim == 1 else 'vector')
+        dtype = self.list_dtypes['label' if kind == 'label' else 'scalar'] if self.binary else None
+        return FoamList.from_array(array, kind, dtype)
+
+    def save(self, path: str = None):
+        """
+        Writes a file atomically if it was modified or is written to another path
+        :param path: file path, the file is overwritten by default
+        """
+        path = path or self.path
+        if self.modified or path != self.path:
+            atomic_write(path, self.iter_dumps(), encoding=FOAM_FILE_ENCODING,
+                         compress=path.endswith(COMPRESSED_FILE_SUFFIX))
+            self.mark_saved()
+            self.path = path
+            get_foam_file_cache().store(self)
+
+    def copy(self) -> 'FoamFile':
+        """Copies a file, the text of typed lists is shared"""
+        return copy.deepcopy(self)
+
+
+class FoamFileCache:
+    """
+    Cache of parsed files shared by all users of a process, e.g., all boundary conditions of all cases.
+    Files are keyed by their path, modification time and size, so that a file is only read and parsed again
+    once it was changed (e.g., rewritten by a solver). Least recently used files are evicted
+    when the total size of the cached files exceeds the memory budget.
+    Parsed files are mutable, thus every user gets its own copy, label lists are read-only and shared
+    """
+
+    def __init__(self, budget: int = FOAM_FILE_CACHE_BUDGET):
+        """
+        File cache initialization function
+        :param budget: memory budget in bytes, approximated by the sizes of the cached files
+        """
+        self.budget = budget
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def _put(self, path: str, key: tuple, foam_file: FoamFile):
+        """Puts a file into the cache evicting the least recently used ones, must be called with a lock"""
+        self._pop(path)
+        if key[1] > self.budget:
+            return
+        self._entries[path] = (key, foam_file)
+        self.size += key[1]
+        while self.size > self.budget:
+            _, ((_, size), _) = self._entries.popitem(last=False)
+            self.size -= size
+
+    def _pop(self, path: str):
+        """Removes a file from the cache, must be called with a lock"""
+        if (entry := self._entries.pop(path, None)) is not None:
+            self.size -= entry[0][1]
+
+    def _load(self, path: str, parse: Callable[[str, str], Any], value_type: type):
+        """
+        Loads a value parsed from a file, which is only read and parsed if it is not cached or was changed
+        :param path: file path
+        :param parse: function parsing a file text, called with a file path and its text
+        :param value_type: type of the parsed value, values of other types cached for the path are ignored
+        :return: cached parsed value shared by all callers
+        """
+        path = os.path.abspath(path)
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            key = (stat.st_mtime_ns, stat.st_size)
+            with self._lock:
+                entry = self._entries.get(path)
+                if entry is not None and entry[0] == key and isinstance(entry[1], value_type):
+                    self._entries.move_to_end(path)
+                    self.hits += 1
+                    return entry[1]
+                self.misses += 1
+            text = decode_foam_bytes(f.read(), path)
+        value = parse(path, text)
+        # Recently modified file might change again without changing its modification time
+        if time.time_ns() - key[0] > MTIME_GRANULARITY_NS:
+            with self._lock:
+                self._put(path, key, value)
+        return value
+
+    def load(self, path: str) -> FoamFile:
+        """
+        Loads a parsed file, which is only read and parsed if it is not cached or was changed
+        :param path: file path
+        :return: private copy of a parsed file
+        """
+        return self._load(path, FoamFile, FoamFile).copy()
+
+    def load_label_list(self, path: str) -> np.ndarray:
+        """
+        Loads a file consisting of a header and a list of labels, e.g., cellProcAddressing of a processor mesh,
+        which is only read and parsed if it is not cached or was changed
+        :param path: file path
+        :return: read-only array of labels shared by all callers
+        """
+        def parse(_, text):
+            labels = FoamFileParser(text).parse_label_list()
+            labels.flags.writeable = False
+            return labels
+
+        return self._load(path, parse, np.ndarray)
+
+    def store(self, foam_file: FoamFile):
+        """
+        Stores a file, which was just written, so that it is not read again
+        :param foam_file: saved file
+        """
+        path = os.path.abspath(foam_file.path)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return
+        duplicate = foam_file.copy()
+        with self._lock:
+            self._put(path, (stat.st_mtime_ns, stat.st_size), duplicate)
+
+    def invalidate(self, path: str = None):
+        """
+        Removes a file or all files from the cache
+        :param path: file path, all files are removed if not specified
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self.size = 0
+            else:
+                self._pop(os.path.abspath(path))
+
+
+_cache = None
+_cache_lock = Lock()
+
+
+def get_foam_file_cache() -> FoamFileCache:
+    """Gets the process-wide cache of parsed files"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = FoamFileCache()
+        return _cache
+
+
+def load_foam_file(path: str) -> FoamFile:
+    """
+    Loads a parsed file using the process-wide cache
+    :param path: file path
+    :return: parsed file, which can be modified and saved
+    """
+    return get_foam_file_cache().load(path)
+
+
+def read_label_list(path: str) -> np.ndarray:
+    """
+    Reads a file consisting of a header and a list of labels, e.g., cellProcAddressing of a processor mesh,
+    using the process-wide cache
+    :param path: file path
+    :return: read-only array of labels
+    """
+    return get_foam_file_cache().load_label_list(path)
+
+
+def parse_foam_text(text: str) -> FoamDict:
+    """
+    Parses a FoamFile text, e.g., a dictionary snippet
+    :param text: text to parse
+    :return: top level dictionary
+    """
+    return FoamFileParser(text).parse()
+
+
+def benchmark_parsing(case_dir: str, cell_counts=(10_000, 100_000, 1_000_000)):
+    """
+    Benchmarks the parser on the boundary condition templates and on generated time directory fields
+    :param case_dir: case template directory
+    :param cell_counts: number of cells of generated fields
+    """
+    fields_dir = f'{case_dir}/templates/0/fluid'
+    for field in sorted(os.listdir(fields_dir)):
+        with open(f'{fields_dir}/{field}', 'r') as f:
+            text = f.read()
+        start = time.perf_counter()
+        foam_file = FoamFile(text=text)
+        elapsed = time.perf_counter() - start
+        print(f'{field}: {elapsed * 1e6:.0f} us, lossless: {foam_file.dumps() == text}')
+    for cells in cell_counts:
+        scalars = '\n'.join([str(293 + (i % 100) / 100) for i in range(cells)])
+        vectors = '\n'.join([f'({i % 7 / 10} 0 {i % 3 / 10})' for i in range(cells)])
+        binary_scalars = (293 + (np.arange(cells) % 100) / 100).astype('<f8').tobytes().decode(FOAM_FILE_ENCODING)
+        binary_header = 'FoamFile\n{\n    format binary;\n    arch "LSB;label=32;scalar=64";\n}\n'
+        for kind, header, body in (('scalar', '', f'\n{scalars}\n'), ('vector', '', f'\n{vectors}\n'),
+                                   ('binary scalar', binary_header, binary_scalars)):
+            text = f'{header}dimensions [0 0 0 1 0 0 0];\n' \
+                   f'internalField nonuniform List<{kind.split()[-1]}> \n{cells}\n({body})\n;\n' \
+                   f'boundaryField\n{{\n    wall\n    {{\n        type zeroGradient;\n    }}\n}}\n'
+            start = time.perf_counter()
+            foam_file = FoamFile(text=text)
+            foam_list = foam_file['internalField'][1]
+            last = foam_list.last
+            parsed = time.perf_counter()
+            array = foam_list.array
+            converted = time.perf_counter()
+            foam_list.array = array * 1.01
+            written = sum(len(chunk) for chunk in foam_file.iter_dumps())
+            elapsed = time.perf_counter()
+            print(f'{cells} {kind} cells ({len(text) / 1e6:.1f} MB): parse {(parsed - start) * 1e3:.1f} ms, '
+                  f'last value {last}, array {(converted - parsed) * 1e3:.1f} ms {array.shape}, '
+                  f'write {(elapsed - converted) * 1e3:.1f} ms ({written / 1e6:.1f} MB)')
+
+
+def main():
+    benchmark_parsing(f'{os.path.dirname(os.path.abspath(__file__))}/../cases/cht')
+
+
+if __name__ == '__main__':
+    main()
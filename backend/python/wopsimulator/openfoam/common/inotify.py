@@ -0,0 +1,116 @@
+"""Minimal Linux inotify interface used for watching OpenFOAM result files"""
+import os
+import sys
+import errno
+import ctypes
+import ctypes.util
+import struct
+from typing import List, Tuple
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+_libc = None
+if sys.platform.startswith('linux'):
+    try:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        _libc.inotify_init1.argtypes = [ctypes.c_int]
+        _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        _libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    except (OSError, AttributeError):
+        _libc = None
+
+INOTIFY_AVAILABLE = _libc is not None
+
+
+class InotifyWatcher:
+    """
+    Inotify watcher, which allows to watch directories for changes
+    The watcher file descriptor can be used in select/poll calls
+    """
+
+    def __init__(self):
+        """Inotify watcher initialization function"""
+        if not INOTIFY_AVAILABLE:
+            raise OSError(errno.ENOSYS, 'inotify is not available on this platform')
+        self._fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._paths = {}
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """
+        Adds (or updates) a watch of a path
+        :param path: path to watch
+        :param mask: events mask, e.g., IN_CREATE | IN_MODIFY
+        :return: watch descriptor
+        """
+        wd = _libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        self._paths[wd] = path
+        return wd
+
+    def remove_watch(self, wd: int):
+        """
+        Removes a watch
+        :param wd: watch descriptor
+        """
+        if self._paths.pop(wd, None) is not None:
+            _libc.inotify_rm_watch(self._fd, wd)
+
+    def get_path(self, wd: int) -> str:
+        """
+        Gets a watched path by its watch descriptor
+        :param wd: watch descriptor
+        :return: watched path or empty string
+        """
+        return self._paths.get(wd, '')
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """
+        Reads all pending events without blocking
+        :return: list of events (watch descriptor, mask, name)
+        """
+        events = []
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0').decode()
+                offset += length
+                if mask & IN_IGNORED:
+                    self._paths.pop(wd, None)
+                events.append((wd, mask, name))
+        return events
+
+    def close(self):
+        """Closes the watcher with all its watches"""
+        if self._fd >= 0:
+            os.close(self._fd)
+        self._fd = -1
+        self._paths = {}
@@ -0,0 +1,221 @@
+"""Content-hashed pipeline of case setup stages, which reruns only the stages with changed inputs or outputs"""
+import os
+import glob
+import json
+import time
+import fnmatch
+import hashlib
+import logging
+from typing import Callable, Dict, Iterable, List, Set
+
+from .filehandling import atomic_write
+from .time_index import MTIME_GRANULARITY_NS
+
+PIPELINE_STATE_FILE = '.pipeline.json'
+# Size of the blocks, in which files are read while hashing
+PIPELINE_HASH_BLOCK_SIZE = 1 << 20
+
+logger = logging.getLogger('openfoam')
+
+
+class Stage:
+    """
+    Stage of a pipeline, e.g., an OpenFOAM utility run. Inputs and outputs are glob patterns
+    of files relative to a case directory, e.g., 'system/blockMeshDict' or 'constant/triSurface/*'
+    """
+
+    def __init__(self, name: str, run: Callable, inputs: Iterable[str] = (), outputs: Iterable[str] = (),
+                 depends: Iterable[str] = (), parameters: dict = None):
+        """
+        Stage initialization function
+        :param name: stage name
+        :param run: stage function
+        :param inputs: input file patterns
+        :param outputs: output file patterns, outputs are removed before a stage is rerun
+        :param depends: names of the stages, which must run before this one
+        :param parameters: JSON serializable parameters, which are hashed as an input
+        """
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.depends = list(depends)
+        self.parameters = parameters or {}
+
+
+class Pipeline:
+    """
+    Pipeline of stages forming a directed acyclic graph. Each stage records the content hash of its inputs
+    and outputs in the state file of a case, so that a stage reruns only if its inputs or parameters
+    have changed, its outputs were modified or removed, or a stage it depends on reruns.
+    Stages sharing outputs (e.g., a mesh overwritten by a next utility) rerun together
+    """
+
+    def __init__(self, case_dir: str, ignored: Iterable[str] = ()):
+        """
+        Pipeline initialization function
+        :param case_dir: case directory
+        :param ignored: patterns of files, which are not hashed, e.g., the ones edited after setup
+        """
+        self.case_dir = case_dir
+        self.state_path = f'{case_dir}/{PIPELINE_STATE_FILE}'
+        self.ignored = list(ignored)
+        self.stages: Dict[str, Stage] = {}
+        self._state = None
+
+    def add_stage(self, name: str, run: Callable, inputs: Iterable[str] = (), outputs: Iterable[str] = (),
+                  depends: Iterable[str] = (), parameters: dict = None) -> Stage:
+        """
+        Adds a stage to the pipeline, see Stage for the parameters
+        :return: added stage
+        """
+        if name in self.stages:
+            raise ValueError(f'Stage {name} already exists')
+        self.stages[name] = Stage(name, run, inputs, outputs, depends, parameters)
+        return self.stages[name]
+
+    def _load_state(self) -> dict:
+        """Loads the state of the pipeline ({"stages": {name: hashes}, "files": {path: [size, mtime, hash]}})"""
+        if self._state is None:
+            try:
+                with open(self.state_path, 'r') as f:
+                    self._state = json.load(f)
+            except (FileNotFoundError, json.decoder.JSONDecodeError):
+                self._state = {}
+            self._state.setdefault('stages', {})
+            self._state.setdefault('files', {})
+        return self._state
+
+    def _save_state(self):
+        atomic_write(self.state_path, json.dumps(self._load_state()))
+
+    def _get_order(self) -> List[Stage]:
+        """Gets the stages in a topological order, stages added earlier run first if independent"""
+        order, visiting, visited = [], set(), set()
+
+        def visit(name, path):
+            if name not in self.stages:
+                raise ValueError(f'Stage {path[-1]} depends on an unknown stage {name}')
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f'Stages form a cycle: {" -> ".join(path + [name])}')
+            visiting.add(name)
+            for dependency in self.stages[name].depends:
+                visit(dependency, path + [name])
+            visiting.remove(name)
+            visited.add(name)
+            order.append(self.stages[name])
+
+        for stage_name in self.stages:
+            visit(stage_name, [])
+        return order
+
+    def _get_files(self, patterns: List[str]) -> List[str]:
+        """Gets the paths (relative to a case) of the existing files matching the patterns"""
+        files = set()
+        for pattern in patterns:
+            for path in glob.glob(f'{self.case_dir}/{pattern}', recursive=True):
+                rel_path = os.path.relpath(path, self.case_dir)
+                if os.path.isfile(path) and not any(fnmatch.fnmatch(rel_path, ignored) for ignored in self.ignored):
+                    files.add(rel_path)
+        return sorted(files)
+
+    def _hash_file(self, rel_path: str) -> str:
+        """Hashes the contents of a file, hashes of unchanged files (same size and mtime) are reused"""
+        path = f'{self.case_dir}/{rel_path}'
+        stat = os.stat(path)
+        cached = self._load_state()['files'].get(rel_path)
+        if cached and cached[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return cached[2]
+        digest = hashlib.blake2b()
+        with open(path, 'rb') as f:
+            while block := f.read(PIPELINE_HASH_BLOCK_SIZE):
+                digest.update(block)
+        digest = digest.hexdigest()
+        # Files modified within the mtime granularity might be modified again without changing their mtime
+        if time.time_ns() - stat.st_mtime_ns > MTIME_GRANULARITY_NS:
+            self._state['files'][rel_path] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def _hash(self, patterns: List[str], parameters: dict = None) -> str:
+        """Hashes the files matching the patterns (their paths and contents) and parameters"""
+        digest = hashlib.blake2b(json.dumps(parameters or {}, sort_keys=True).encode())
+        for rel_path in self._get_files(patterns):
+            digest.update(f'{rel_path}\0{self._hash_file(rel_path)}\0'.encode())
+        return digest.hexdigest()
+
+    def _is_stale(self, stage: Stage, stale: Set[str]) -> bool:
+        """
+        Checks whether a stage has to be rerun
+        :param stage: stage to check
+        :param stale: names of the stages, which are already known to rerun
+        """
+        if any(dependency in stale for dependency in stage.depends):
+            return True
+        recorded = self._load_state()['stages'].get(stage.name)
+        return not recorded or recorded['inputs'] != self._hash(stage.inputs, stage.parameters) \
+            or recorded['outputs'] != self._hash(stage.outputs)
+
+    def get_stale_stages(self, force: bool = False) -> List[str]:
+        """
+        Gets the names of the stages, which have to be rerun, in the order of running
+        :param force: rerun all stages
+        :return: list of stage names
+        """
+        order = self._get_order()
+        stale = set()
+        for stage in order:
+            if force or self._is_stale(stage, stale):
+                stale.add(stage.name)
+        # Stages sharing outputs with a rerun stage and the stages depending on them have to be rerun too
+        outputs = {stage.name: set(self._get_files(stage.outputs)) | set(stage.outputs) for stage in order}
+        changed = True
+        while changed:
+            changed = False
+            for stage in order:
+                if stage.name in stale:
+                    continue
+                if any(dependency in stale for dependency in stage.depends) or \
+                        any(outputs[stage.name] & outputs[name] for name in stale):
+                    stale.add(stage.name)
+                    changed = True
+        return [stage.name for stage in order if stage.name in stale]
+
+    def run(self, force: bool = False) -> List[str]:
+        """
+        Runs the stale stages of the pipeline
+        :param force: rerun all stages
+        :return: names of the run stages
+        """
+        stale = self.get_stale_stages(force)
+        state = self._load_state()
+        skipped = [name for name in self.stages if name not in stale]
+        if skipped:
+            logger.info(f'Skipping up-to-date stages: {", ".join(skipped)}')
+        # Outputs are removed rather than overwritten, as they might be hardlinked to other cases
+        for name in stale:
+            state['stages'].pop(name, None)
+            for rel_path in self._get_files(self.stages[name].outputs):
+                os.remove(f'{self.case_dir}/{rel_path}')
+                state['files'].pop(rel_path, None)
+        self._save_state()
+        inputs = {}
+        for name in stale:
+            stage = self.stages[name]
+            inputs[name] = self._hash(stage.inputs, stage.parameters)
+            logger.info(f'Running stage {name}')
+            stage.run()
+        # Outputs are hashed once all stages are run, as a stage might overwrite outputs of a previous one
+        for name in stale:
+            state['stages'][name] = {'inputs': inputs[name], 'outputs': self._hash(self.stages[name].outputs)}
+        state['files'] = {rel_path: cached for rel_path, cached in state['files'].items()
+                          if os.path.exists(f'{self.case_dir}/{rel_path}')}
+        self._save_state()
+        return stale
+
+    def invalidate(self):
+        """Forgets the recorded hashes, so that all stages are rerun"""
+        self._state = {}
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
@@ -0,0 +1,215 @@
+"""Retention of OpenFOAM time directories, i.e., cleaning of the old simulation results"""
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import List, Set, Optional
+
+from .archive import TimeArchive
+from .filehandling import force_remove_dir, get_processor_dirs
+from .time_index import TimeIndex
+
+# Maximum number of directories removed at the same time
+RETENTION_WORKERS = 4
+
+RETENTION_KEEP_LAST_K = 'keep_last'
+RETENTION_KEEP_EVERY_K = 'keep_every'
+RETENTION_KEEP_WINDOW_K = 'keep_window'
+RETENTION_PURGE_WRITE_K = 'purge_write'
+RETENTION_ARCHIVE_K = 'archive'
+
+logger = logging.getLogger('openfoam')
+
+_executor = None
+_executor_lock = Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Gets the process-wide pool of results removal workers"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=RETENTION_WORKERS, thread_name_prefix='wop-retention')
+        return _executor
+
+
+class RetentionPolicy:
+    """Base retention policy, which selects time directories to keep"""
+
+    def select(self, times: List[str]) -> Set[str]:
+        """
+        Selects time directories to keep
+        :param times: time directory names sorted by time
+        :return: set of time directory names to keep
+        """
+        raise NotImplementedError
+
+
+class KeepLastN(RetentionPolicy):
+    """Keeps the last N time directories"""
+
+    def __init__(self, n: int):
+        self.n = int(n)
+
+    def select(self, times: List[str]) -> Set[str]:
+        return set(times[-self.n:]) if self.n > 0 else set()
+
+
+class KeepEveryKth(RetentionPolicy):
+    """
+    Keeps every k-th written time directory (the initial one, the k-th one, etc.)
+    Directories are selected by their write index, i.e., by the simulation time, rather than by their position
+    among the existing directories, so that the same directories are kept by each pass of the retention
+    """
+
+    def __init__(self, k: int, write_interval: float = 1):
+        """
+        Policy initialization function
+        :param k: keep every k-th written time directory
+        :param write_interval: simulation time between two written time directories
+        """
+        self.k = int(k)
+        self.write_interval = float(write_interval)
+
+    def select(self, times: List[str]) -> Set[str]:
+        if self.k <= 0:
+            return set()
+        return {name for name in times if round(float(name) / self.write_interval) % self.k == 0}
+
+
+class KeepWindow(RetentionPolicy):
+    """Keeps the time directories within a simulation time window before the latest time"""
+
+    def __init__(self, window: float):
+        self.window = float(window)
+
+    def select(self, times: List[str]) -> Set[str]:
+        if not times:
+            return set()
+        start = float(times[-1]) - self.window
+        return {name for name in times if float(name) >= start}
+
+
+def create_policies(retention: Optional[dict], write_interval: float = 1) -> List[RetentionPolicy]:
+    """
+    Creates retention policies from a declarative description, e.g., {"keep_last": 5, "keep_every": 10}
+    :param retention: retention description
+    :param write_interval: simulation time between two written time directories
+    :return: list of retention policies
+    """
+    policies = []
+    if not retention:
+        return policies
+    if retention.get(RETENTION_KEEP_LAST_K):
+        policies.append(KeepLastN(retention[RETENTION_KEEP_LAST_K]))
+    if retention.get(RETENTION_KEEP_EVERY_K):
+        policies.append(KeepEveryKth(retention[RETENTION_KEEP_EVERY_K], write_interval))
+    if retention.get(RETENTION_KEEP_WINDOW_K):
+        policies.append(KeepWindow(retention[RETENTION_KEEP_WINDOW_K]))
+    return policies
+
+
+class RetentionEngine:
+    """
+    Retention engine, which removes the time directories of a case (and its processor directories)
+    that are not kept by any of its policies. The initial and the latest time directories are always kept.
+    Directories are removed (or archived and removed) asynchronously in a process-wide worker pool
+    """
+
+    def __init__(self, case_dir: str, policies: List[RetentionPolicy] = None, archive: TimeArchive = None):
+        """
+        Retention engine initialization function
+        :param case_dir: case directory
+        :param policies: retention policies, nothing is removed if there are none
+        :param archive: archive to pack the evicted directories into, they are only removed if not specified
+        """
+        self.case_dir = case_dir
+        self.policies = policies or []
+        self.archive = archive
+        self._pending = set()
+        self._lock = Lock()
+
+    def select(self, times: List[str]) -> Set[str]:
+        """
+        Selects time directories to keep according to all the policies
+        :param times: time directory names sorted by time
+        :return: set of time directory names to keep
+        """
+        kept = {name for name in times if float(name) == 0}
+        if times:
+            kept.add(times[-1])
+        for policy in self.policies:
+            kept |= policy.select(times)
+        if self.archive:
+            kept |= self.archive.pinned
+        return kept
+
+    def get_directories(self) -> List[str]:
+        """
+        Gets the directories containing time directories, i.e., case and processor directories
+        :return: list of directories
+        """
+        if not os.path.isdir(self.case_dir):
+            return []
+        return [self.case_dir] + [f'{self.case_dir}/{name}' for name in get_processor_dirs(self.case_dir)]
+
+    def _remove(self, path: str):
+        try:
+            force_remove_dir(path)
+        finally:
+            with self._lock:
+                self._pending.discard(path)
+
+    def _archive(self, directory: str, names: List[str]):
+        paths = [f'{directory}/{name}' for name in names]
+        try:
+            self.archive.pack(directory, names)
+            for path in paths:
+                force_remove_dir(path)
+        except Exception as e:
+            logger.error(f'Failed to archive time directories of {directory}: {e}')
+        finally:
+            with self._lock:
+                self._pending.difference_update(paths)
+
+    def apply(self) -> int:
+        """
+        Removes time directories, which are not kept by policies
+        Evicted directories of a case or processor directory are packed into one archive segment if archiving
+        :return: number of directories scheduled for removal
+        """
+        if not self.policies:
+            return 0
+        removed = 0
+        for directory in self.get_directories():
+            times = TimeIndex(directory).times
+            names = []
+            for name in set(times) - self.select(times):
+                path = f'{directory}/{name}'
+                with self._lock:
+                    if path in self._pending:
+                        continue
+                    self._pending.add(path)
+                names.append(name)
+            if not names:
+                continue
+            if self.archive:
+                _get_executor().submit(self._archive, directory, names)
+            else:
+                for name in names:
+                    _get_executor().submit(self._remove, f'{directory}/{name}')
+            removed += len(names)
+        if removed:
+            action = 'Archiving' if self.archive else 'Removing'
+            logger.debug(f'{action} {removed} time directories of {self.case_dir}')
+        return removed
+
+    @property
+    def purge_write(self) -> int:
+        """
+        Number of time directories, which OpenFOAM can keep itself (controlDict purgeWrite),
+        0 if the policies cannot be handed off to OpenFOAM
+        """
+        if not self.archive and len(self.policies) == 1 and isinstance(self.policies[0], KeepLastN):
+            return self.policies[0].n
+        return 0
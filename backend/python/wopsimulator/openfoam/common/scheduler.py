@@ -0,0 +1,234 @@
+"""Process-wide scheduler of periodic and event-driven background tasks of all cases"""
+import os
+import time
+import heapq
+import logging
+import selectors
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread, Lock, Condition, current_thread, get_ident
+from typing import Callable, Optional, Union
+
+# Maximum number of tasks running at the same time, None - ThreadPoolExecutor default
+SCHEDULER_MAX_WORKERS = None
+
+logger = logging.getLogger('openfoam')
+
+
+class ScheduledTask:
+    """
+    Task of a scheduler, which calls its callback periodically and/or when its file object is readable
+    The callback is never called concurrently with itself. It can return False to finish the task
+    or a number of seconds to override the delay until its next call
+    """
+
+    def __init__(self, scheduler, callback: Callable[[], Union[None, bool, float]], period: float,
+                 fileobj=None, name: str = ''):
+        """
+        Scheduled task initialization function
+        :param scheduler: scheduler of a task
+        :param callback: task function
+        :param period: period of calls in seconds
+        :param fileobj: file object (or descriptor), readability of which triggers a call
+        :param name: task name for logging
+        """
+        self._scheduler = scheduler
+        self.callback = callback
+        self.period = period
+        self.fileobj = fileobj
+        self.name = name
+        self.due = time.monotonic()
+        self.cancelled = False
+        self.running = False
+        self.requested_delay = None
+        self.finished = Condition()
+        self._thread_id = None
+
+    @property
+    def active(self) -> bool:
+        return not self.cancelled
+
+    def wakeup(self):
+        """Calls the task as soon as possible"""
+        self._scheduler.reschedule(self, 0)
+
+    def cancel(self, wait: bool = True):
+        """
+        Cancels the task
+        :param wait: wait until the current call finishes (unless called from the task itself)
+        """
+        self._scheduler.cancel(self)
+        if wait and self._thread_id != get_ident():
+            with self.finished:
+                self.finished.wait_for(lambda: not self.running)
+
+    def __call__(self):
+        self._thread_id = get_ident()
+        try:
+            result = self.callback()
+        except Exception as e:
+            logger.error(f'Scheduled task {self.name} failed: {e}')
+            result = None
+        finally:
+            self._thread_id = None
+        return result
+
+
+class Scheduler:
+    """
+    Scheduler, which multiplexes background tasks of all cases in a single dispatcher thread
+    Due tasks are executed in a small worker pool, each task has at most one call in progress,
+    so that a slow task does not delay the other ones. Tasks are called in order of their due time
+    """
+
+    def __init__(self, max_workers: Optional[int] = SCHEDULER_MAX_WORKERS):
+        """
+        Scheduler initialization function
+        :param max_workers: maximum number of tasks running at the same time
+        """
+        self._lock = Lock()
+        self._heap = []
+        self._counter = itertools.count()
+        self._selector = selectors.DefaultSelector()
+        self._wakeup_pipe = os.pipe()
+        os.set_blocking(self._wakeup_pipe[0], False)
+        os.set_blocking(self._wakeup_pipe[1], False)
+        self._selector.register(self._wakeup_pipe[0], selectors.EVENT_READ)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='wop-scheduler')
+        self._dispatcher = Thread(target=self._dispatch, name='wop-scheduler', daemon=True)
+        self._dispatcher.start()
+
+    def _wakeup_dispatcher(self):
+        if current_thread() is not self._dispatcher:
+            try:
+                os.write(self._wakeup_pipe[1], b'\0')
+            except BlockingIOError:
+                # Dispatcher has pending wakeups already
+                pass
+
+    def _push(self, task: ScheduledTask, delay: float):
+        """Pushes a task to the timer heap, must be called with a lock"""
+        task.due = time.monotonic() + delay
+        heapq.heappush(self._heap, (task.due, next(self._counter), task))
+
+    def schedule(self, callback: Callable[[], Union[None, bool, float]], period: float,
+                 fileobj=None, name: str = '', delay: float = 0) -> ScheduledTask:
+        """
+        Schedules a new task
+        :param callback: task function, returns False to finish or a delay until the next call
+        :param period: period of calls in seconds
+        :param fileobj: file object (or descriptor), readability of which triggers a call
+        :param name: task name for logging
+        :param delay: delay of the first call
+        :return: scheduled task
+        """
+        task = ScheduledTask(self, callback, period, fileobj, name)
+        with self._lock:
+            self._push(task, delay)
+            if fileobj is not None:
+                self._selector.register(fileobj, selectors.EVENT_READ, task)
+        self._wakeup_dispatcher()
+        logger.debug(f'Scheduled task {name} with period {period}')
+        return task
+
+    def reschedule(self, task: ScheduledTask, delay: float):
+        """
+        Changes the delay until the next call of a task
+        :param task: scheduled task
+        :param delay: delay in seconds
+        """
+        with self._lock:
+            if task.cancelled:
+                return
+            if task.running:
+                # Task is rescheduled once the current call finishes
+                task.requested_delay = delay
+                return
+            self._push(task, delay)
+        self._wakeup_dispatcher()
+
+    def cancel(self, task: ScheduledTask):
+        """
+        Cancels a task, the call in progress is not interrupted
+        :param task: scheduled task
+        """
+        with self._lock:
+            if task.cancelled:
+                return
+            task.cancelled = True
+            self._unregister(task)
+        self._wakeup_dispatcher()
+
+    def _unregister(self, task: ScheduledTask):
+        if task.fileobj is not None:
+            try:
+                self._selector.unregister(task.fileobj)
+            except (KeyError, ValueError):
+                pass
+
+    def _submit(self, task: ScheduledTask):
+        """Submits a due task to the workers, must be called with a lock"""
+        if task.running or task.cancelled:
+            return
+        task.running = True
+        self._unregister(task)
+        self._executor.submit(self._execute, task)
+
+    def _execute(self, task: ScheduledTask):
+        """Calls a task and schedules its next call"""
+        result = task()
+        with self._lock:
+            task.running = False
+            if result is False:
+                task.cancelled = True
+            if not task.cancelled:
+                delay = task.period if result is None or result is True else result
+                if task.requested_delay is not None:
+                    delay = min(delay, task.requested_delay)
+                task.requested_delay = None
+                self._push(task, delay)
+                if task.fileobj is not None:
+                    try:
+                        self._selector.register(task.fileobj, selectors.EVENT_READ, task)
+                    except (KeyError, ValueError, OSError):
+                        pass
+        with task.finished:
+            task.finished.notify_all()
+        self._wakeup_dispatcher()
+
+    def _dispatch(self):
+        """Dispatcher thread function, which waits for due tasks and readable files"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._heap and (self._heap[0][2].cancelled or self._heap[0][2].running or
+                                      self._heap[0][0] != self._heap[0][2].due or self._heap[0][0] <= now):
+                    due, _, task = heapq.heappop(self._heap)
+                    if due <= now and due == task.due:
+                        self._submit(task)
+                timeout = max(0., self._heap[0][0] - now) if self._heap else None
+            for key, _ in self._selector.select(timeout):
+                if key.data is None:
+                    try:
+                        os.read(self._wakeup_pipe[0], 1024)
+                    except BlockingIOError:
+                        pass
+                    continue
+                with self._lock:
+                    self._submit(key.data)
+
+
+_scheduler = None
+_scheduler_lock = Lock()
+
+
+def get_scheduler() -> Scheduler:
+    """
+    Gets the process-wide scheduler, creates it on first use
+    :return: scheduler
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler()
+        return _scheduler
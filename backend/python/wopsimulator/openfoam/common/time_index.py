@@ -0,0 +1,96 @@
+"""Cached index of OpenFOAM time directories"""
+import os
+import re
+import time
+import bisect
+from threading import Lock
+from typing import List
+
+from .parsing import NUMBER_PATTERN
+
+# Directory modification times are updated with a coarse granularity, so a directory
+# modified within this time could be modified again without its modification time changing
+MTIME_GRANULARITY_NS = 20_000_000
+
+_TIME_DIR_PATTERN = re.compile(f'^{NUMBER_PATTERN}$')
+
+
+class TimeIndex:
+    """
+    Time index of a directory (case or processor directory), which keeps its time directories sorted
+    There is one instance per directory, so that all its users share it.
+    The directory is only scanned again when its modification time changes,
+    the index is then updated incrementally, making the latest time lookup cost a single stat call
+    """
+    _instances = {}
+    _instances_lock = Lock()
+
+    def __new__(cls, directory: str):
+        """
+        Time index creator, returns an existing index of a directory if there is one
+        :param directory: case or processor directory
+        """
+        directory = os.path.abspath(directory)
+        with cls._instances_lock:
+            if directory not in cls._instances:
+                instance = super(TimeIndex, cls).__new__(cls)
+                instance._init(directory)
+                cls._instances[directory] = instance
+            return cls._instances[directory]
+
+    def _init(self, directory: str):
+        """
+        Time index initialization function
+        :param directory: case or processor directory
+        """
+        self.directory = directory
+        self._mtime_ns = None
+        self._values = []
+        self._names = []
+        self._lock = Lock()
+
+    def _scan(self):
+        """Updates the index if the directory was modified since the last scan, must be called with a lock"""
+        try:
+            mtime_ns = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            self._mtime_ns, self._values, self._names = None, [], []
+            return
+        if mtime_ns == self._mtime_ns:
+            return
+        with os.scandir(self.directory) as entries:
+            names = {entry.name for entry in entries if _TIME_DIR_PATTERN.match(entry.name) and entry.is_dir()}
+        for name in set(self._names) - names:
+            idx = bisect.bisect_left(self._values, float(name))
+            while self._names[idx] != name:
+                idx += 1
+            del self._values[idx]
+            del self._names[idx]
+        for name in names - set(self._names):
+            value = float(name)
+            idx = bisect.bisect_right(self._values, value)
+            self._values.insert(idx, value)
+            self._names.insert(idx, name)
+        # Recently modified directory might change again without changing its modification time
+        self._mtime_ns = mtime_ns if time.time_ns() - mtime_ns > MTIME_GRANULARITY_NS else None
+
+    @property
+    def times(self) -> List[str]:
+        """Time directory names sorted by time"""
+        with self._lock:
+            self._scan()
+            return self._names[:]
+
+    @property
+    def latest(self) -> str:
+        """Latest time directory name except the initial one, '0' if there are no results"""
+        with self._lock:
+            self._scan()
+            if self._names and self._names[-1] != '0':
+                return self._names[-1]
+            return '0'
+
+    def invalidate(self):
+        """Forces the directory to be scanned on the next lookup"""
+        with self._lock:
+            self._mtime_ns = None
@@ -2,6 +2,8 @@ import logging
 from dataclasses import dataclass
 from typing import List, Union
 
+from ..common.filehandling import atomic_write
+
 END_OF_FILE = '// ************************************************************************* //'
 
 MATERIAL_DICT_FILE_TEMPLATE = r"""/*--------------------------------*- C++ -*----------------------------------*\
@@ -120,8 +122,7 @@ class MaterialProperties:
     def save(self):
         """Saves materialProperties file to constant folder"""
         file_output = MATERIAL_DICT_FILE_TEMPLATE % ''.join([str(material) for material in self.materials.values()])
-        with open(f'{self._case_dir}/constant/materialProperties', 'w+') as f:
-            f.writelines(file_output)
+        atomic_write(f'{self._case_dir}/constant/materialProperties', file_output)
 
     def remove(self, name):
         """
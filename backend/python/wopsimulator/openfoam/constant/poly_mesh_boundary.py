@@ -0,0 +1,85 @@
+"""Editor of the mesh patches, i.e., OpenFOAM constant/polyMesh/boundary files"""
+import os
+import logging
+from typing import Dict, List, Optional
+
+from ..common.filehandling import get_processor_dirs
+from ..common.foam_file import FoamFile, FoamEntry, FoamValueList, load_foam_file
+
+POLY_MESH_BOUNDARY_FILE = 'polyMesh/boundary'
+
+logger = logging.getLogger('openfoam')
+
+
+class PolyMeshBoundary:
+    """
+    Mesh patches of a case (or of a region of a multiregion case), which are described in
+    constant/<region>/polyMesh/boundary and in its copies in the processor directories of a decomposed case.
+    Patches are edited in place without running OpenFOAM utilities, files are written atomically
+    """
+
+    def __init__(self, case_dir: str, region: str = None):
+        """
+        Mesh patches initialization function
+        :param case_dir: case directory
+        :param region: region of a multiregion case
+        """
+        self._case_dir = case_dir
+        self._region = region
+
+    @property
+    def paths(self) -> List[str]:
+        """Paths of the existing boundary files of a case and of its processor directories"""
+        boundary_file = f'constant/{(self._region + "/") if self._region else ""}{POLY_MESH_BOUNDARY_FILE}'
+        processors = get_processor_dirs(self._case_dir)
+        paths = [f'{self._case_dir}/{boundary_file}'] + \
+                [f'{self._case_dir}/{processor}/{boundary_file}' for processor in processors]
+        return [path for path in paths if os.path.exists(path)]
+
+    @staticmethod
+    def get_patches(foam_file: FoamFile) -> Dict[str, FoamEntry]:
+        """
+        Gets the patches of a parsed boundary file, i.e., of the list following the number of patches
+        :param foam_file: parsed boundary file
+        :return: dictionary of patch entries
+        """
+        for entry in foam_file.entries():
+            if entry.is_dict:
+                continue
+            for item in entry.value:
+                if isinstance(item, FoamValueList):
+                    return {patch.key: patch for patch in item.items
+                            if isinstance(patch, FoamEntry) and patch.is_dict}
+        return {}
+
+    def get_patch_type(self, name: str) -> Optional[str]:
+        """
+        Gets a patch type
+        :param name: patch name
+        :return: patch type, None if there is no such patch
+        """
+        for path in self.paths[:1]:
+            patch = self.get_patches(load_foam_file(path)).get(name)
+            if patch and 'type' in patch.value:
+                return patch.value['type'][0]
+        return None
+
+    def set_patch_type(self, name: str, patch_type: str) -> int:
+        """
+        Sets a patch type (e.g., wall or patch) in all boundary files
+        :param name: patch name
+        :param patch_type: patch type
+        :return: number of modified files
+        """
+        modified = 0
+        for path in self.paths:
+            foam_file = load_foam_file(path)
+            patch = self.get_patches(foam_file).get(name)
+            if patch is None:
+                raise KeyError(f'Patch {name} does not exist in {path}')
+            if 'type' not in patch.value or patch.value['type'] != [patch_type]:
+                patch.value.set('type', patch_type)
+                foam_file.save()
+                modified += 1
+        logger.debug(f'Set patch {name} type to {patch_type} in {modified} boundary files')
+        return modified
@@ -2,20 +2,29 @@
 OpenFOAM python interface
 """
 import os
-import time
 import subprocess
 import multiprocessing as mp
 import threading as thr
 from abc import ABC, abstractmethod
 import logging
-from numpy import arange
+from typing import List, Union, Callable
 
-from .boundaries.boundary_conditions import BoundaryCondition
+import numpy as np
+
+from .boundaries.boundary_conditions import BoundaryCondition, BoundaryTransaction
 from .common.filehandling import remove_iterable_dirs, remove_dirs_with_pattern, \
-    force_remove_dir, remove_files_in_dir_with_pattern, copy_tree, get_latest_time, get_latest_time_parallel
+    force_remove_dir, remove_files_in_dir_with_pattern, copy_tree, get_latest_time, get_latest_time_parallel, \
+    get_processor_dirs
+from .common.archive import TimeArchive
+from .common.foam_file import FoamList, get_foam_path, load_foam_file
+from .common.retention import RetentionEngine, RetentionPolicy, KeepWindow, create_policies, \
+    RETENTION_PURGE_WRITE_K, RETENTION_ARCHIVE_K
+from .common.scheduler import get_scheduler
+from .command_executor import CommandFuture, get_command_executor
 from .constant.material_properties import MaterialProperties
+from .constant.poly_mesh_boundary import PolyMeshBoundary
 from .probes.probes import ProbeParser, Probe
-from .pyfoam_runner import PyFoamCmd, PyFoamSolver, check_runner_errors
+from .pyfoam_runner import PyFoamSolver, check_runner_errors
 from .system.blockmesh import BlockMeshDict
 from .system.controldict import ControlDict
 from .system.decomposepar import DecomposeParDict
@@ -30,6 +39,9 @@ logging.basicConfig(
 logger = logging.getLogger('openfoam')
 logger.setLevel(logging.DEBUG)
 
+# Period of checking whether results have to be cleaned
+CLEANER_PERIOD = 0.01
+
 
 class OpenFoamInterface(ABC):
     """
@@ -37,7 +49,8 @@ class OpenFoamInterface(ABC):
     """
 
     def __init__(self, solver_type, path='.', blocking=False, parallel=False, cores=1, mesh_quality=50,
-                 clean_limit=0, end_time=10000, **kwargs):
+                 clean_limit=0, end_time=10000, store_probes=False, retention=None, write_format='ascii',
+                 write_compression=False, keep_decomposed=False, **kwargs):
         """
         OpenFOAM Interface initialization function
         :param solver_type: solver type, e.g., chtMultiRegionFoam TODO: check for solver type
@@ -47,6 +60,14 @@ class OpenFoamInterface(ABC):
         :param cores: number of cores used for parallel run
         :param mesh_quality: mesh quality in percents [0 - 100]
         :param clean_limit: maximum number of results before cleaning, cleans if > 0
+        :param store_probes: flag to persist probe samples into a binary probe store
+        :param retention: results retention parameters, e.g., {"keep_last": 5, "keep_every": 10, "keep_window": 20,
+        "purge_write": false, "archive": true}, replace the clean limit if specified.
+        Evicted results are packed into a compressed archive instead of removing if archive is true
+        :param write_format: format of the results, ascii or binary, binary reduces the I/O of large meshes
+        :param write_compression: flag to compress the results with gzip
+        :param keep_decomposed: flag to keep a parallel case decomposed, processor directories are then the
+        authoritative state, which is edited directly, and the case is reconstructed only on explicit post-processing
         :param kwargs: keys used by children and not by this class
         """
         self.path = path
@@ -62,15 +83,24 @@ class OpenFoamInterface(ABC):
         self._solver_thread = None
         self._solver_lock = thr.Lock()
         self._stop_lock = thr.Lock()
-        self._probe_parser_thread = ProbeParser(self.path)
+        self._probe_parser = ProbeParser(self.path, store_probes=store_probes)
+        self._cleaner_task = None
+        self._cleaner_checked_time = None
+        self._retention_engine = RetentionEngine(self.path)
+        self.archive = TimeArchive(self.path)
+        self.retention = retention
         self._time_probe = None
         self.parallel = parallel
         self.blocking = blocking
         self.cores = cores
         self.clean_limit = clean_limit
         self.control_dict.end_time = end_time
+        self.write_format = write_format
+        self.write_compression = write_compression
+        self.keep_decomposed = keep_decomposed
         self.blockmesh_dict.mesh_quality = mesh_quality
         self._running = False
+        self._paused = False
         logger.debug('Interface initialized')
 
     @property
@@ -105,6 +135,18 @@ class OpenFoamInterface(ABC):
     def running(self):
         return self._running
 
+    @property
+    def paused(self):
+        return self._paused
+
+    @property
+    def store_probes(self):
+        return self._probe_parser.store_probes
+
+    @store_probes.setter
+    def store_probes(self, value):
+        self._probe_parser.store_probes = value
+
     @property
     def end_time(self):
         return self.control_dict.end_time
@@ -113,12 +155,68 @@ class OpenFoamInterface(ABC):
     def end_time(self, value):
         self.control_dict.end_time = value
 
+    @property
+    def write_format(self):
+        return self.control_dict.write_format
+
+    @write_format.setter
+    def write_format(self, value):
+        if value not in ('ascii', 'binary'):
+            raise ValueError(f'Write format must be either ascii or binary, got {value}')
+        self.control_dict.write_format = value
+
+    @property
+    def write_compression(self):
+        return self.control_dict.write_compression == 'on'
+
+    @write_compression.setter
+    def write_compression(self, value):
+        self.control_dict.write_compression = 'on' if value else 'off'
+
+    @property
+    def keep_decomposed(self):
+        return self._keep_decomposed
+
+    @keep_decomposed.setter
+    def keep_decomposed(self, value):
+        # Processor directories may hold newer results than a case, which have to be reconstructed
+        if getattr(self, '_keep_decomposed', False) and not value and self.is_decomposed:
+            self.run_reconstruct(all_regions=True, latest_time=True, waiting=True)
+        self._keep_decomposed = value
+        self.attach_processor_dirs()
+
+    @property
+    def processors_authoritative(self):
+        """Whether processor directories of a case are its authoritative state"""
+        return self.parallel and self.keep_decomposed and self.is_decomposed
+
+    def attach_processor_dirs(self):
+        """
+        Attaches processor directories to boundary conditions, so that they are edited
+        together with the case files if processor directories are authoritative
+        """
+        processors = get_processor_dirs(self.path) if self.processors_authoritative else []
+        for boundary_conditions in self.boundaries.values():
+            for boundary_condition in (boundary_conditions.values() if isinstance(boundary_conditions, dict)
+                                       else [boundary_conditions]):
+                boundary_condition.set_processors(processors)
+
+    def get_latest_result(self) -> str:
+        """
+        Gets the latest result time, which is the one of processor directories if they are authoritative
+        :return: latest simulation time
+        """
+        if self.processors_authoritative:
+            return get_latest_time_parallel(self.path)
+        return get_latest_time(self.path)
+
     def remove_processor_dirs(self):
         """
         Removes processors folder
         :return: None
         """
         self.is_decomposed = False
+        self.attach_processor_dirs()
         remove_iterable_dirs(self.path, prepend_str='processor')
         logger.debug('Processors removed')
 
@@ -160,6 +258,8 @@ class OpenFoamInterface(ABC):
         self.remove_solution_dirs()
         force_remove_dir(f'{self.path}/postProcessing')
         logger.debug('Removed post-processing')
+        self.archive.clear()
+        logger.debug('Removed archived solutions')
         logger.debug('Solutions removed')
 
     def remove_logs(self):
@@ -181,10 +281,14 @@ class OpenFoamInterface(ABC):
         :return: None
         """
         logger.debug('Cleaning the case')
+        if self._probe_parser and self._probe_parser.store:
+            self._probe_parser.store.close()
         self.remove_solutions()
         self.remove_logs()
         if self._time_probe:
             self._time_probe.time = 0
+        for probe in Probe.get_instances(self.path) or []:
+            probe.history.clear()
         logger.debug('Case is clean')
 
     def copy_stls(self, src_sub_dir: str = 'geometry', dst_sub_dir: str = 'constant/triSurface'):
@@ -200,15 +304,30 @@ class OpenFoamInterface(ABC):
         path_to_copy = f'{self.path}/{dst_sub_dir}'
         copy_tree(stls_path, path_to_copy)
 
+    @staticmethod
+    def _run_command(argv: List[str], waiting: bool = True, callback: Callable = None) -> CommandFuture:
+        """
+        Runs an OpenFOAM utility with the process-wide command executor
+        :param argv: utility arguments
+        :param waiting: wait for a utility to finish, its errors are raised then
+        :param callback: function called after a successful run, e.g., to update the case state
+        :return: future of a utility run
+        """
+        future = get_command_executor().submit(argv, callback)
+        if waiting:
+            future.wait()
+        return future
+
     def run_decompose(self, all_regions: bool = False, copy_zero: bool = False, latest_time: bool = False,
-                      force: bool = False, waiting: bool = False):
+                      force: bool = False, waiting: bool = True) -> CommandFuture:
         """
         Runs OpenFOAM case decomposition for parallel run, described in system/decomposeParDict
         :param all_regions: flag to decompose all regions (used for multi-region cases like cht)
         :param copy_zero: copy zero state
         :param latest_time: flag to only decompose from the latest time
         :param force: flag to clear processor folders before decomposing
-        :return: None
+        :param waiting: wait for a utility to finish, its errors are raised then
+        :return: future of a utility run
         """
         logger.info('Running decompose')
         if self.is_decomposed:
@@ -226,29 +345,30 @@ class OpenFoamInterface(ABC):
             argv.insert(1, '-latestTime')
         if force:
             argv.insert(1, '-force')
-        command = PyFoamCmd(argv)
-        command.start()
-        while waiting and command.running:
-            time.sleep(0.001)
-        self.is_decomposed = True
-        logger.info('Case decomposed')
+
+        def decomposed():
+            self.is_decomposed = True
+            logger.info('Case decomposed')
+
+        return self._run_command(argv, waiting, decomposed)
 
     def run_reconstruct(self, all_regions: bool = False, latest_time: bool = False, fields: list = None,
-                        region: str = '', waiting: bool = False):
+                        region: str = '', waiting: bool = True) -> CommandFuture:
         """
         Runs OpenFOAM case reconstruction after a parallel run, described in system/decomposeParDict
         :param all_regions: flag to reconstruct all regions (used for multi-region cases like cht)
         :param latest_time: flag to only reconstruct from the latest time
         :param fields: fields to be reconstructed, e.g., ['U', 'T', 'p']
         :param region: region to reconstruct
-        :return: None
+        :param waiting: wait for a utility to finish, its errors are raised then
+        :return: future of a utility run, None if a case is not decomposed
         """
         logger.debug('Removing old solutions')
         self.remove_solution_dirs()  # Hope no bug is implemented by this, be aware
         logger.info('Running reconstruct')
         if not self.is_decomposed:
             logger.info('Case is not decomposed, skipping reconstruction')
-            return
+            return None
         cmd = 'reconstructPar'
         argv = [cmd, '-newTimes', '-case', self.path]
         if all_regions:
@@ -259,49 +379,40 @@ class OpenFoamInterface(ABC):
             argv.insert(1, '-latestTime')
         if fields:
             argv.insert(1, f'-fields \'({" ".join(fields)})\'')
-        command = PyFoamCmd(argv)
-        command.start()
-        while waiting and command.running:
-            time.sleep(0.001)
-        logger.info('Case reconstructed')
+        return self._run_command(argv, waiting, lambda: logger.info('Case reconstructed'))
 
-    def run_block_mesh(self, waiting: bool = False):
+    def run_block_mesh(self, waiting: bool = True) -> CommandFuture:
         """
         Runs OpenFOAM command to create a mesh as described in system/blockMeshDict
-        :return: None
+        :param waiting: wait for a utility to finish, its errors are raised then
+        :return: future of a utility run
         """
         logger.info('Running blockMesh')
         self.blockmesh_dict.save()
         cmd = 'blockMesh'
         argv = [cmd, '-case', self.path]
-        command = PyFoamCmd(argv)
-        command.start()
-        while waiting and command.running:
-            time.sleep(0.001)
-        logger.info('Block mesh created')
+        return self._run_command(argv, waiting, lambda: logger.info('Block mesh created'))
 
-    def run_snappy_hex_mesh(self, waiting: bool = False):
+    def run_snappy_hex_mesh(self, waiting: bool = True) -> CommandFuture:
         """
         Runs OpenFOAM command to snap additional mesh to a background mesh as described in system/snappyHexMeshDict
-        :return: None
+        :param waiting: wait for a utility to finish, its errors are raised then
+        :return: future of a utility run
         """
         logger.info('Running snappyHexMesh')
         self.snappy_dict.save()
         cmd = 'snappyHexMesh'
         argv = [cmd, '-case', self.path, '-overwrite']
-        command = PyFoamCmd(argv)
-        command.start()
-        while waiting and command.running:
-            time.sleep(0.001)
-        logger.info('Surfaces snapped')
+        return self._run_command(argv, waiting, lambda: logger.info('Surfaces snapped'))
 
     def run_split_mesh_regions(self, cell_zones: bool = False, cell_zones_only: bool = False,
-                               waiting: bool = False):
+                               waiting: bool = True) -> CommandFuture:
         """
         Runs OpenFOAM command to split mesh regions for a produced mesh
         :param cell_zones: split additionally cellZones off into separate regions
         :param cell_zones_only: use cellZones only to split mesh into regions; do not use walking
-        :return: None
+        :param waiting: wait for a utility to finish, its errors are raised then
+        :return: future of a utility run
         """
         logger.info('Splitting mesh')
         cmd = 'splitMeshRegions'
@@ -310,26 +421,19 @@ class OpenFoamInterface(ABC):
             argv.insert(1, '-cellZones')
         if cell_zones_only:
             argv.insert(1, '-cellZonesOnly')
-        command = PyFoamCmd(argv)
-        command.start()
-        while waiting and command.running:
-            time.sleep(0.001)
-        logger.info('Mesh was split')
+        return self._run_command(argv, waiting, lambda: logger.info('Mesh was split'))
 
-    def run_setup_cht(self, waiting: bool = False):
+    def run_setup_cht(self, waiting: bool = True) -> CommandFuture:
         """
         Runs OpenFOAM command to setup CHT, which copies data from case/templates folder
-        :return: None
+        :param waiting: wait for a utility to finish, its errors are raised then
+        :return: future of a utility run
         """
         logger.info('Setting up CHT')
         self.material_props.save()
         cmd = 'foamSetupCHT'
         argv = [cmd, '-case', self.path]
-        command = PyFoamCmd(argv)
-        command.start()
-        while waiting and command.running:
-            time.sleep(0.001)
-        logger.info('CHT case is setup')
+        return self._run_command(argv, waiting, lambda: logger.info('CHT case is setup'))
 
     def run_foam_dictionary(self, path: str, entry: str, set_value: str):
         """
@@ -349,9 +453,64 @@ class OpenFoamInterface(ABC):
             raise Exception(err)
         logger.debug('Value changed')
 
+    def run_write_cell_centres(self, time_dir: str = '0', region: str = None):
+        """
+        Runs OpenFOAM command to write cell centres (C field) of a mesh into a time directory
+        :param time_dir: time directory name
+        :param region: region of a multiregion case
+        :return: None
+        """
+        logger.info(f'Writing cell centres{" of " + region + " region" if region else ""}')
+        argv = ['postProcess', '-case', self.path, '-func', 'writeCellCentres', '-time', time_dir]
+        if region:
+            argv += ['-region', region]
+        self._run_command(argv, callback=lambda: logger.info('Cell centres were written'))
+
+    def get_cell_centres(self, time_dir: str = '0', region: str = None) -> np.ndarray:
+        """
+        Gets cell centres of a mesh, which are written by OpenFOAM if not present
+        :param time_dir: time directory name
+        :param region: region of a multiregion case
+        :return: array of shape (cells, 3)
+        """
+        path = get_foam_path(f'{self.path}/{time_dir}/{(region + "/") if region else ""}C')
+        if not os.path.exists(path):
+            self.run_write_cell_centres(time_dir, region)
+            path = get_foam_path(path)
+        entry = load_foam_file(path).get_entry('internalField')
+        typed_list = next((item for item in entry.value if isinstance(item, FoamList)), None)
+        if typed_list is None:
+            raise ValueError(f'Cell centres in {path} are not a nonuniform list')
+        return typed_list.array
+
+    def set_initial_field(self, field: str, values: Union[np.ndarray, list, Callable], region: str = None):
+        """
+        Sets a spatially varying initial (time 0) internal field, e.g., a temperature stratification:
+        case.set_initial_field('T', lambda centres: 293.15 + 0.5 * centres[:, 2], 'fluid')
+        :param field: field name, e.g., T
+        :param values: values, one per cell, or a function of the cell centres array (cells, 3) returning them
+        :param region: region of a multiregion case
+        """
+        boundary = self.boundaries[region][field] if region else self.boundaries[field]
+        boundary.update_time('0')
+        if callable(values):
+            values = values(self.get_cell_centres('0', region))
+        boundary.set_internal_field(values)
+
+    def set_patch_type(self, patch: str, patch_type: str, region: str = None):
+        """
+        Sets a mesh patch type (e.g., wall or patch) in polyMesh/boundary of a case and its processor directories
+        :param patch: patch name
+        :param patch_type: patch type
+        :param region: region of a multiregion case
+        :return: None
+        """
+        logger.debug(f'Setting patch {patch} type to {patch_type}')
+        PolyMeshBoundary(self.path, region).set_patch_type(patch, patch_type)
+
     def _add_time_probe(self, field, region):
         self._time_probe = Probe(self.path, field, region, [0, 0, 0])
-        self._probe_parser_thread.parse_probe(self._time_probe)
+        self._probe_parser.parse_probe(self._time_probe)
 
     def extract_boundary_conditions(self):
         """
@@ -378,6 +537,7 @@ class OpenFoamInterface(ABC):
                 if cls_instance:
                     self.boundaries.update({field: cls_instance})
         self.decompose_dict.regions = self.regions
+        self.attach_processor_dirs()
         logger.debug('Boundaries were extracted')
 
     @abstractmethod
@@ -388,16 +548,26 @@ class OpenFoamInterface(ABC):
         """
         raise NotImplementedError('Setup method is not implemented!')
 
+    @staticmethod
+    def boundary_transaction() -> BoundaryTransaction:
+        """
+        Creates a boundary conditions transaction, i.e., a context manager, which batches boundary condition
+        edits of all fields and regions, so that each touched file is written once on exit
+        :return: boundary conditions transaction
+        """
+        return BoundaryTransaction()
+
     def save_boundaries(self):
         """Saves all boundary conditions"""
         logger.info('Saving boundaries')
-        if self.regions:
-            for region in self.regions:
-                for field in self.boundaries[region].values():
+        with self.boundary_transaction():
+            if self.regions:
+                for region in self.regions:
+                    for field in self.boundaries[region].values():
+                        field.save()
+            else:
+                for field in self.boundaries.values():
                     field.save()
-        else:
-            for field in self.boundaries.values():
-                field.save()
         logger.info('Boundaries were saved')
 
     @property
@@ -416,15 +586,25 @@ class OpenFoamInterface(ABC):
         Starts OpenFOAM solver thread or process
         :return:
         """
+        self._retention_engine.policies = self.get_retention_policies()
+        self._retention_engine.archive = self.archive \
+            if self.retention and self.retention.get(RETENTION_ARCHIVE_K) else None
+        purge_write = self._retention_engine.purge_write \
+            if self.retention and self.retention.get(RETENTION_PURGE_WRITE_K) else 0
+        self.control_dict.purge_write = purge_write
         self.control_dict.save()
         self.save_boundaries()
-        cleaner_thread = thr.Thread(target=self.result_cleaner, daemon=True)
-        if self.parallel:
+        if self.parallel and not self.processors_authoritative:
             self.run_decompose(all_regions=True, latest_time=True, force=True, waiting=True)
+            self.attach_processor_dirs()
         self._solver_thread = PyFoamSolver(self._solver_type, self.path, self._solver_lock, self.parallel, self.cores)
         self._solver_thread.start()
         self._running = True
-        cleaner_thread.start()
+        if self._retention_engine.policies and not purge_write:
+            logger.debug('Starting case cleaner')
+            self._cleaner_checked_time = None
+            self._cleaner_task = get_scheduler().schedule(self.result_cleaner, CLEANER_PERIOD,
+                                                          name=f'{self.path} result cleaner')
 
     def stop_solving(self):
         """
@@ -433,47 +613,96 @@ class OpenFoamInterface(ABC):
         """
         if not self._running:
             return
+        # Frozen solver processes are continued by the solver thread to handle the stop signal
+        self._paused = False
         self._solver_thread.stop(int(self.control_dict.stop_at_write_now_signal))
         self._solver_thread = None
         self._running = False
+        if self._cleaner_task:
+            self._cleaner_task.cancel()
+            self._cleaner_task = None
+            logger.debug('Case cleaner stopped')
+
+    def get_retention_policies(self) -> List[RetentionPolicy]:
+        """
+        Gets the results retention policies of a case
+        Declarative retention parameters are used if specified, otherwise the results
+        within half of a clean limit before the latest time are kept if clean limit is set
+        :return: list of retention policies
+        """
+        if self.retention:
+            return create_policies(self.retention, self.control_dict.write_interval)
+        if self.clean_limit:
+            return [KeepWindow(self.clean_limit / 2)]
+        return []
+
+    def restore_time(self, time: str) -> List[str]:
+        """
+        Restores an archived time directory (in all processor directories), e.g., for post-processing
+        Restored time is not evicted again until it is released
+        :param time: time directory name
+        :return: paths of the restored time directories
+        """
+        return self.archive.restore(time)
+
+    def release_time(self, time: str):
+        """
+        Releases a restored time directory, so that it is evicted by the retention again
+        :param time: time directory name
+        """
+        self.archive.release(time)
 
     def result_cleaner(self):
-        """Thread to clean the results periodically"""
-        if not self.clean_limit:
-            return
-        logger.debug('Starting case cleaner')
+        """Scheduled task to clean the results each time a new time directory is written"""
+        if not (self._running and self._retention_engine.policies):
+            return False
         time_getter = get_latest_time_parallel if self.parallel else get_latest_time
-        deletion_time = 0
-        margin = self.clean_limit / 2 // self.control_dict.write_interval * self.control_dict.write_interval
-        while self._running:
-            latest_time = float(time_getter(self.path))
-            if latest_time != deletion_time and not latest_time % self.clean_limit:
-                time.sleep(0.05)
-                exceptions = '|'.join([str(int(val) if val.is_integer() else val)
-                                       for val in arange(latest_time - margin, latest_time + margin,
-                                                         self.control_dict.write_interval)])
-                exceptions = exceptions.replace('.', r'\.')
-                if self.parallel:
-                    for core in range(0, self.cores):
-                        remove_dirs_with_pattern(f'{self.path}/processor{core}', f'^(?!(?:0|{exceptions})$)\\d+')
-                else:
-                    remove_dirs_with_pattern(self.path, f'^(?!(?:0|{exceptions})$)\\d+')
-                deletion_time = latest_time
-            time.sleep(0.01)
-        logger.debug('Case cleaner stopped')
+        latest_time = time_getter(self.path)
+        if latest_time != self._cleaner_checked_time:
+            self._retention_engine.apply()
+            self._cleaner_checked_time = latest_time
+
+    def pause(self):
+        """
+        Pauses the solver by freezing its processes, e.g., when the simulation is ahead of the real time
+        Paused solver keeps the mesh and fields in memory, so that it is resumed without restarting
+        :return: None
+        """
+        with self._stop_lock:
+            if not self._running or self._paused:
+                return
+            self._solver_thread.pause()
+            self._paused = True
+        logger.debug('Case solver paused')
+
+    def resume(self):
+        """
+        Resumes the paused solver
+        :return: None
+        """
+        with self._stop_lock:
+            if not self._paused:
+                return
+            self._paused = False
+            if self._solver_thread:
+                self._solver_thread.resume()
+        logger.debug('Case solver resumed')
 
     def run(self):
         """
-        Runs solver and monitor threads
+        Runs solver and monitor threads, a paused solver is resumed
         :return: None
         """
+        if self._paused:
+            self.resume()
+            return
         if self._running:
             logger.debug('Case is already being solved')
             return
         with self._stop_lock:
             logger.info('Starting to solve the case')
             self.start_solving()
-            self._probe_parser_thread.start()
+            self._probe_parser.start()
         if self.blocking:
             self._solver_lock.acquire()
             self._solver_lock.release()
@@ -491,12 +720,12 @@ class OpenFoamInterface(ABC):
             return
         with self._stop_lock:
             logger.debug('Stopping probe parsers')
-            self._probe_parser_thread.stop()
+            self._probe_parser.stop()
             if stop_solver:
                 logger.info('Stopping the case solver')
                 self.stop_solving()
 
     def remove(self):
         self.blockmesh_dict.remove()
-        self._probe_parser_thread.stop()
-        self._probe_parser_thread = None
+        self._probe_parser.stop()
+        self._probe_parser = None
@@ -0,0 +1,153 @@
+"""Probe time series history, stored in fixed-capacity ring buffers"""
+from threading import Lock
+from typing import Union, List, Tuple, Optional
+
+import numpy as np
+
+DEFAULT_HISTORY_CAPACITY = 4096
+
+
+class ProbeHistory:
+    """
+    Probe history class, which represents a fixed-capacity,
+    array-backed ring buffer of probe samples (time and value)
+    Once the capacity is reached, the oldest samples are overwritten
+    """
+
+    def __init__(self, capacity: int = DEFAULT_HISTORY_CAPACITY):
+        """
+        Probe history initialization function
+        :param capacity: maximum number of stored samples
+        """
+        if capacity <= 0:
+            raise ValueError(f'History capacity must be positive, not {capacity}')
+        self.capacity = capacity
+        self._times = np.empty(capacity, dtype=np.float64)
+        # Value array is allocated with the first sample, as its shape
+        # depends on the probed field (scalar or vector)
+        self._values = None
+        self._start = 0
+        self._size = 0
+        self._lock = Lock()
+
+    def __len__(self):
+        return self._size
+
+    def _allocate(self, value_shape: tuple):
+        """
+        Allocates value array of a specified sample shape
+        :param value_shape: shape of a single value, e.g., () for scalars or (3,) for vectors
+        """
+        if self._values is None or self._values.shape[1:] != value_shape:
+            self._values = np.empty((self.capacity, *value_shape), dtype=np.float64)
+            self._start = 0
+            self._size = 0
+
+    def _ordered_indices(self) -> np.ndarray:
+        """
+        Gets the buffer indices ordered from the oldest to the newest sample
+        :return: indices array
+        """
+        return (self._start + np.arange(self._size)) % self.capacity
+
+    def append(self, time: float, value: Union[float, List[float]]):
+        """
+        Appends a single sample
+        :param time: sample time
+        :param value: sample value (scalar or vector)
+        """
+        self.extend(np.array([time], dtype=np.float64), np.array([value], dtype=np.float64))
+
+    def extend(self, times: np.ndarray, values: np.ndarray):
+        """
+        Appends multiple samples at once
+        :param times: samples times, shape (n,)
+        :param values: samples values, shape (n,) or (n, 3)
+        """
+        times = np.asarray(times, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        if not len(times):
+            return
+        with self._lock:
+            self._allocate(values.shape[1:])
+            if len(times) >= self.capacity:
+                self._times[:] = times[-self.capacity:]
+                self._values[:] = values[-self.capacity:]
+                self._start = 0
+                self._size = self.capacity
+                return
+            head = (self._start + self._size) % self.capacity
+            first = min(len(times), self.capacity - head)
+            self._times[head:head + first] = times[:first]
+            self._values[head:head + first] = values[:first]
+            rest = len(times) - first
+            if rest:
+                self._times[:rest] = times[first:]
+                self._values[:rest] = values[first:]
+            overflow = max(0, self._size + len(times) - self.capacity)
+            self._size = min(self.capacity, self._size + len(times))
+            self._start = (self._start + overflow) % self.capacity
+
+    @property
+    def last_time(self) -> Optional[float]:
+        """Time of the newest sample or None if history is empty"""
+        with self._lock:
+            if not self._size:
+                return None
+            return float(self._times[(self._start + self._size - 1) % self.capacity])
+
+    def truncate(self, time: float):
+        """
+        Removes samples with time greater or equal than specified, e.g., after a solver restarted from an older time
+        :param time: time, from which samples are removed
+        """
+        with self._lock:
+            if not self._size:
+                return
+            times = self._times[self._ordered_indices()]
+            self._size = int(np.searchsorted(times, time, side='left'))
+            if not self._size:
+                self._start = 0
+
+    def clear(self):
+        """Removes all samples"""
+        with self._lock:
+            self._start = 0
+            self._size = 0
+
+    def get(self, since: float = None, last: int = None, step: float = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gets samples ordered by time
+        :param since: return only samples with time greater than this value
+        :param last: return only this amount of the newest samples
+        :param step: downsample by returning only the first sample of each time interval of this size
+        :return: times and values arrays
+        """
+        with self._lock:
+            if not self._size:
+                return np.empty(0), np.empty(0)
+            indices = self._ordered_indices()
+            times = self._times[indices]
+            values = self._values[indices]
+        if since is not None:
+            first = np.searchsorted(times, since, side='right')
+            times, values = times[first:], values[first:]
+        if step:
+            buckets = np.floor(times / step)
+            keep = np.flatnonzero(np.diff(buckets, prepend=np.nan))
+            times, values = times[keep], values[keep]
+        if last is not None:
+            first = max(0, len(times) - last)
+            times, values = times[first:], values[first:]
+        return times, values
+
+    def dump(self, since: float = None, last: int = None, step: float = None) -> dict:
+        """
+        Dumps samples into a JSON serializable dictionary
+        :param since: return only samples with time greater than this value
+        :param last: return only this amount of the newest samples
+        :param step: downsample by returning only the first sample of each time interval of this size
+        :return: dictionary of time and value lists
+        """
+        times, values = self.get(since, last, step)
+        return {'time': times.tolist(), 'value': values.tolist()}
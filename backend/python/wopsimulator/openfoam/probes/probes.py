@@ -1,15 +1,30 @@
 import os
 import re
-import math
 import time
-from threading import Thread, Lock
-from typing import Union, List
+import logging
+import warnings
+from threading import Lock
+from contextlib import contextmanager
+from typing import Union, List, Optional, Tuple
 
-from ..common.filehandling import get_latest_time
+import numpy as np
+
+from ..common.filehandling import get_numerated_dirs, atomic_write
+from ..common.inotify import InotifyWatcher, INOTIFY_AVAILABLE, IN_CREATE, IN_MODIFY, IN_MOVED_TO, IN_IGNORED, \
+    IN_ONLYDIR
 from ..common.parsing import VECTOR_PATTERN, NUMBER_PATTERN
+from ..common.scheduler import get_scheduler
+from .history import ProbeHistory
+from .segments import ProbeSegmentIndex
+from .store import ProbeStore
 
 Num = Union[int, float, None]
 
+# Maximum time to wait for probe file events before parsing anyway
+EVENT_WAIT_TIMEOUT = 1
+
+logger = logging.getLogger('openfoam')
+
 PROBE_DICT_FILE_TEMPLATE = \
     r"""/*--------------------------------*- C++ -*----------------------------------*\
   =========                 |
@@ -83,72 +98,299 @@ def parse_probes_dict(dict_path: str,
     return new_lines
 
 
+def parse_probe_lines(lines: List[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parses probe results lines into NumPy arrays in one call
+    Each line consists of time and values of all probe locations,
+    where vectors are written in parentheses, e.g., "1 (0 0 1) (0 1 0)"
+    Lines with a different number of values (e.g., corrupted) are skipped
+    :param lines: probe results data lines
+    :return: times array of shape (n,) and values array of shape
+    (n, probes) for scalar fields or (n, probes, 3) for vector fields
+    """
+    if not lines:
+        return np.empty(0), np.empty((0, 0))
+    components = 3 if b'(' in lines[0] else 1
+    data = b' '.join(lines).translate(None, b'()')
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        numbers = np.fromstring(data, sep=' ')
+    width = len(lines[0].translate(None, b'()').split())
+    if width and len(numbers) == width * len(lines):
+        table = numbers.reshape(len(lines), width)
+    else:
+        # Some lines are incomplete, parse them one by one and skip the wrong ones
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', DeprecationWarning)
+            rows = [np.fromstring(line.translate(None, b'()'), sep=' ') for line in lines]
+        rows = [row for row in rows if len(row) == width]
+        table = np.array(rows).reshape(len(rows), width)
+    values = table[:, 1:]
+    if components == 3:
+        values = values.reshape(len(table), -1, 3)
+    return table[:, 0], values
+
+
+# Number of decimals, to which probe locations are rounded to identify them
+LOCATION_DECIMALS = 6
+
+
+def get_location_key(location: List[Num]) -> tuple:
+    """
+    Gets a hashable key of a probe location
+    :param location: probe location [x, y, z]
+    :return: rounded location tuple (x, y, z)
+    """
+    return tuple(round(float(coord), LOCATION_DECIMALS) for coord in location)
+
+
+class ProbeRegistry:
+    """
+    Per-case registry of probes, indexed by (field, region, location)
+    Provides constant time lookup, insertion and removal of probes and
+    keeps probe locations in the order in which they are written to the probes dictionary,
+    so that the location index matches the column index of the probe results
+    """
+
+    def __init__(self, dict_path: str):
+        """
+        Probe registry initialization function
+        :param dict_path: path to probes dictionary
+        """
+        self.dict_path = dict_path
+        self._probes = {}
+        self._region_field_probes = {}
+        self._fields = {}
+        self._regions = {}
+        self._locations = {}
+        self._columns = None
+
+    @staticmethod
+    def _get_key(field: str, region: str, location: List[Num]) -> tuple:
+        return field, region, get_location_key(location)
+
+    @staticmethod
+    def _count(counter: dict, key, increment: int):
+        """
+        Increments or decrements a counter of a key and removes the key if it is not used
+        :param counter: counter dict
+        :param key: counted key
+        :param increment: 1 or -1
+        """
+        counter[key] = counter.get(key, 0) + increment
+        if counter[key] <= 0:
+            del counter[key]
+
+    def _count_probe(self, field: str, region: str, location_key: tuple, increment: int):
+        self._count(self._fields, field, increment)
+        self._count(self._regions, region, increment)
+        location_count = len(self._locations)
+        self._count(self._locations, location_key, increment)
+        if location_count != len(self._locations):
+            self._columns = None
+
+    def __len__(self):
+        return len(self._probes)
+
+    def get(self, field: str, region: str, location: List[Num]):
+        """
+        Gets a registered probe
+        :param field: probe field (e.g., T)
+        :param region: probe region
+        :param location: probe location
+        :return: probe or None if it is not registered
+        """
+        return self._probes.get(self._get_key(field, region, location))
+
+    def add(self, probe, field: str, region: str, location: List[Num]):
+        """
+        Registers a probe
+        :param probe: probe instance
+        :param field: probe field (e.g., T)
+        :param region: probe region
+        :param location: probe location
+        """
+        key = self._get_key(field, region, location)
+        if key in self._probes:
+            return
+        self._probes[key] = probe
+        self._region_field_probes.setdefault((region, field), {})[key] = probe
+        self._count_probe(field, region, key[2], 1)
+
+    def remove(self, field: str, region: str, location: List[Num]):
+        """
+        Removes a probe from the registry
+        :param field: probe field (e.g., T)
+        :param region: probe region
+        :param location: probe location
+        """
+        key = self._get_key(field, region, location)
+        if self._probes.pop(key, None) is None:
+            return
+        region_field_probes = self._region_field_probes[(region, field)]
+        del region_field_probes[key]
+        if not region_field_probes:
+            del self._region_field_probes[(region, field)]
+        self._count_probe(field, region, key[2], -1)
+
+    def relocate(self, probe, field: str, region: str, old_location: List[Num], new_location: List[Num]) -> bool:
+        """
+        Changes a location of a registered probe
+        :param probe: probe instance
+        :param field: probe field (e.g., T)
+        :param region: probe region
+        :param old_location: current probe location
+        :param new_location: new probe location
+        :return: False if the new location is occupied by another probe of the same field and region
+        """
+        old_key = self._get_key(field, region, old_location)
+        new_key = self._get_key(field, region, new_location)
+        if old_key == new_key:
+            return True
+        if self._probes.get(new_key, probe) is not probe:
+            return False
+        self.remove(field, region, old_location)
+        self.add(probe, field, region, new_location)
+        return True
+
+    def get_probes(self, region: str = None, field: str = None) -> list:
+        """
+        Gets registered probes
+        :param region: only get probes of this region
+        :param field: only get probes of this field (requires a region)
+        :return: list of probes
+        """
+        if region is None:
+            return list(self._probes.values())
+        if field is not None:
+            return list(self._region_field_probes.get((region, field), {}).values())
+        return [probe for (probe_region, _), probes in self._region_field_probes.items()
+                if probe_region == region for probe in probes.values()]
+
+    def get_column(self, location: List[Num]) -> Optional[int]:
+        """
+        Gets a column index of a location in probe results, i.e., its index in the probes dictionary
+        :param location: probe location
+        :return: column index or None if location is not registered
+        """
+        if self._columns is None:
+            self._columns = {key: idx for idx, key in enumerate(self._locations)}
+        return self._columns.get(get_location_key(location))
+
+    @property
+    def fields(self) -> set:
+        return set(self._fields)
+
+    @property
+    def regions(self) -> set:
+        return set(self._regions)
+
+    @property
+    def locations(self) -> List[tuple]:
+        return list(self._locations)
+
+
 class Probe:
     """
     Probe class that represents a single probe for a specific field in a specific location
     """
-    _dict_path = {}
-    _instances = {}
-    _fields = {}
-    _regions = {}
-    _locations = {}
+    _registries = {}
+    _batch_depth = {}
 
     def __new__(cls, case_dir: str, field: str, region: str, location: List[Num]):
         """
         Probe class creator
         Allows to remember all the existing instances of probes for the ProbeParser to use later
-        If probe dictionary does not exist - creates it
         :param case_dir: case directory
         :param field: probe field (e.g., T)
         :param region: region to probe
         :param location: probe location
         """
-        dict_path = f'{case_dir}/system/probes'
-        if case_dir not in cls._dict_path.keys():
-            cls._dict_path[case_dir] = dict_path
-            cls._instances[case_dir] = []
-            cls._fields[case_dir] = []
-            cls._regions[case_dir] = []
-            cls._locations[case_dir] = []
-        if not os.path.exists(dict_path):
-            location_str = f'{" " * 4}({" ".join([str(l) for l in location])})\n'
-            with open(dict_path, 'w') as f:
-                f.writelines(PROBE_DICT_FILE_TEMPLATE % (field, region, location_str))
-        instance, _ = cls._get_instance_and_idx(case_dir, field, region, location)
+        if case_dir not in cls._registries:
+            cls._registries[case_dir] = ProbeRegistry(f'{case_dir}/system/probes')
+        registry = cls._registries[case_dir]
+        instance = registry.get(field, region, location)
         if not instance:
             instance = super(Probe, cls).__new__(cls)
-            cls._fields[case_dir].append(field)
-            cls._regions[case_dir].append(region)
-            cls._locations[case_dir].append(location)
-            cls._instances[case_dir].append(instance)
+            registry.add(instance, field, region, location)
         return instance
 
     @classmethod
-    def _get_instance_and_idx(cls, case_dir, field, region, location):
-        in_fields = True if field in cls._fields[case_dir] else False
-        in_regions = True if region in cls._regions[case_dir] else False
-        in_locations = True if location in cls._locations[case_dir] else False
-        if all([in_fields, in_regions, in_locations]):
-            values = list(zip(cls._fields[case_dir], cls._regions[case_dir], cls._locations[case_dir]))
-            idx = values.index((field, region, location))
-            return cls._instances[case_dir][idx], idx
-        return None, None
+    def get_registry(cls, case_dir: str) -> Optional[ProbeRegistry]:
+        return cls._registries.get(case_dir)
+
+    @classmethod
+    @contextmanager
+    def batch(cls, case_dir: str):
+        """
+        Context manager for registering (or removing) multiple probes at once
+        Inside the context, probes are only added to the registry and the probes
+        dictionary is generated and written once on exit
+        :param case_dir: case directory
+        """
+        cls._batch_depth[case_dir] = cls._batch_depth.get(case_dir, 0) + 1
+        try:
+            yield
+        finally:
+            cls._batch_depth[case_dir] -= 1
+            if not cls._batch_depth[case_dir]:
+                del cls._batch_depth[case_dir]
+                cls.write_dict(case_dir)
+
+    @classmethod
+    def register_many(cls, case_dir: str, probes: List[Tuple[str, str, List[Num]]]) -> list:
+        """
+        Registers multiple probes with a single probes dictionary write
+        :param case_dir: case directory
+        :param probes: list of probe (field, region, location)
+        :return: list of probes
+        """
+        with cls.batch(case_dir):
+            return [cls(case_dir, field, region, location) for field, region, location in probes]
+
+    @classmethod
+    def write_dict(cls, case_dir: str):
+        """
+        Writes the probes dictionary of a case from its registry in one atomic write
+        Fields and locations of the dictionary are replaced with the registered ones,
+        locations are written in the registry order, so that their result columns match
+        the registry location indices. Other entries of an existing dictionary are kept
+        If dictionary does not exist - creates it
+        :param case_dir: case directory
+        """
+        registry = cls._registries.get(case_dir)
+        if registry is None or not len(registry) and not os.path.exists(registry.dict_path):
+            return
+        fields = sorted(registry.fields)
+        locations_str = ''.join(f'{" " * 4}({" ".join([str(coord) for coord in location])})\n'
+                                for location in registry.locations)
+        if os.path.exists(registry.dict_path):
+            new_lines = parse_probes_dict(
+                registry.dict_path,
+                on_field=lambda line, fields_str, _: line.replace(fields_str, ' '.join(fields)),
+                on_location=lambda line, location_str, location: '',
+                on_location_end=lambda: locations_str
+            )
+        else:
+            region = next(iter(registry.get_probes())).region
+            new_lines = PROBE_DICT_FILE_TEMPLATE % (' '.join(fields), region, locations_str)
+        atomic_write(registry.dict_path, new_lines)
 
     @classmethod
     def get_instances(cls, case_dir: str) -> list:
-        return cls._instances[case_dir] if case_dir in cls._instances else None
+        return cls._registries[case_dir].get_probes() if case_dir in cls._registries else None
 
     @classmethod
     def get_fields(cls, case_dir: str) -> set:
-        return set(cls._fields[case_dir]) if case_dir in cls._fields else None
+        return cls._registries[case_dir].fields if case_dir in cls._registries else None
 
     @classmethod
     def get_regions(cls, case_dir: str) -> set:
-        return set(cls._regions[case_dir]) if case_dir in cls._regions else None
+        return cls._registries[case_dir].regions if case_dir in cls._registries else None
 
     @classmethod
     def get_locations(cls, case_dir: str) -> set:
-        return set(cls._locations[case_dir]) if case_dir in cls._locations else None
+        return set(cls._registries[case_dir].locations) if case_dir in cls._registries else None
 
     def __init__(self, case_dir: str, field: str, region: str, location: List[Num]):
         """
@@ -159,14 +401,16 @@ class Probe:
         :param location: probe location
         """
         self._case_dir = case_dir
-        self._added = False
         self.field = field
         self.region = region
         self._location = location
         self._value = 0
         self._time = 0
-        self._add_probe_to_dict()
+        if not hasattr(self, 'history'):
+            self.history = ProbeHistory()
         self._lock = Lock()
+        if case_dir not in self._batch_depth:
+            self.write_dict(case_dir)
 
     @property
     def value(self):
@@ -188,109 +432,211 @@ class Probe:
         with self._lock:
             self._time = value
 
+    def update(self, time: float, value: Union[float, List[float]]):
+        """
+        Updates the latest probe value and appends it to the probe history
+        :param time: simulation time of a value
+        :param value: probed value
+        """
+        last_time = self.history.last_time
+        if last_time is not None and time <= last_time:
+            # Solver was restarted from an older time, drop the overridden samples
+            self.history.truncate(time)
+        with self._lock:
+            self._time = time
+            self._value = value
+        self.history.append(time, value)
+
+    def extend(self, times: np.ndarray, values: np.ndarray):
+        """
+        Updates the latest probe value with the last of multiple samples
+        and appends all of them to the probe history
+        Samples in history, which are not older than the first new one, are replaced
+        :param times: simulation times of values, shape (n,)
+        :param values: probed values, shape (n,) or (n, 3)
+        """
+        if not len(times):
+            return
+        last_time = self.history.last_time
+        if last_time is not None and times[0] <= last_time:
+            # Solver was restarted from an older time, drop the overridden samples
+            self.history.truncate(times[0])
+        with self._lock:
+            self._time = float(times[-1])
+            self._value = values[-1].tolist()
+        self.history.extend(times, values)
+
     @property
     def location(self):
         return self._location
 
     @location.setter
     def location(self, location):
-        _, idx = self._get_instance_and_idx(self._case_dir, self.field, self.region, self.location)
-        self.__class__._locations[self._case_dir][idx] = location
-        self._location = location
+        if self.get_registry(self._case_dir).relocate(self, self.field, self.region, self._location, location):
+            self._location = location
 
-    def _on_region_callback(self, line, region):
+    def remove(self):
         """
-        Callback for a probe parsing function, which is called when a region is found
-        Used to change a region if it doesn't correspond to probe's region
-        :param line: document line string
-        :param region: region (e.g., 'fluid')
-        :return: document line string
+        Removes probe from known instances
+        Probes dictionary is updated by the ProbeParser (see remove_unused) or at the end of a batch
         """
-        # FIXME: potential error if some probes use other regions
-        if region != self.region:
-            # TODO: check if one can append different regions (probably not)
-            line.replace(region, self.region)
-        return line
+        self.get_registry(self._case_dir).remove(self.field, self.region, self._location)
 
-    def _on_field_callback(self, line, fields_str, fields):
-        """
-        Callback for a probe parsing function, which is called when a field is found
-        Used to add a current probe's field to probes dictionary
-        :param line: document line string
-        :param fields_str: fields match string (e.g., '("T" "U")')
-        :param fields: fields as list (e.g., ['T', 'U', ...]
-        :return: document line string
-        """
-        if self.field not in fields:
-            fields.append(self.field)
-            line = line.replace(fields_str, ' '.join(fields))
-        return line
 
-    def _on_location_callback(self, line, location_str, location):
+class ProbeFileReader:
+    """
+    Tail-following reader of a single probe results file
+    Keeps the file open and remembers the read offset, so that
+    only the bytes appended since the last read are processed
+    """
+
+    def __init__(self, path: str):
         """
-        Callback for a probe parsing function, which is called when a location is found
-        Used to check whether a current probe's location is added to probes dictionary
-        :param line: document line string
-        :param location_str: location match string
-        :param location: location as coordinates [x, y, z]
-        :return: document line string
+        Probe file reader initialization function
+        :param path: path to probe results file
         """
-        if all([1 if math.isclose(probe1, probe2, abs_tol=0.5) else 0
-                for probe1, probe2 in zip(self._location, location)]):
-            self.location = location
-            self._added = True
-        return line
-
-    def _on_location_end_callback(self):
+        self.path = path
+        self._file = None
+        self._file_id = None
+        self._offset = 0
+        self._partial_line = b''
+        # Set once the file was truncated or replaced, i.e., is written again from the beginning
+        self.restarted = False
+
+    def _open(self) -> bool:
         """
-        Callback for a probe parsing function, which is called when a location end is found
-        Used to add current probe's location to probes dictionary if it was not there
-        :return: document line string
+        Opens the probe file and resets the read offset
+        :return: True if file was opened
         """
-        string = ''
-        if not self._added:
-            string = f'{" " * 4}({" ".join([str(l) for l in self.location])})\n'
-        return string
-
-    def _add_probe_to_dict(self):
+        try:
+            self._file = open(self.path, 'rb')
+        except FileNotFoundError:
+            return False
+        stat = os.fstat(self._file.fileno())
+        self._file_id = (stat.st_dev, stat.st_ino)
+        self._offset = 0
+        self._partial_line = b''
+        return True
+
+    def read_lines(self) -> List[bytes]:
         """
-        Adds probe to probe dict
+        Reads complete data lines appended since the last call
+        Handles file truncation (reads from the beginning) and
+        rotation, i.e., replacement of a file by a new one (reopens it)
+        Comment lines (headers) are skipped
+        :return: list of new data lines
         """
-        new_lines = parse_probes_dict(self.__class__._dict_path[self._case_dir],
-                                      on_field=self._on_field_callback,
-                                      on_region=self._on_region_callback,
-                                      on_location=self._on_location_callback,
-                                      on_location_end=self._on_location_end_callback)
-        with open(self.__class__._dict_path[self._case_dir], 'w') as f:
-            f.writelines(new_lines)
-
-    def remove(self):
-        """Removes probe from known instances"""
-        _, idx = self._get_instance_and_idx(self._case_dir, self.field, self.region, self.location)
-        self.__class__._regions[self._case_dir].pop(idx)
-        self.__class__._fields[self._case_dir].pop(idx)
-        self.__class__._locations[self._case_dir].pop(idx)
-        self.__class__._instances[self._case_dir].pop(idx)
-
-
-class ProbeParser(Thread):
+        if not self._file and not self._open():
+            return []
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.close()
+            return []
+        if (stat.st_dev, stat.st_ino) != self._file_id:
+            self.close()
+            if not self._open():
+                return []
+            stat = os.fstat(self._file.fileno())
+            self.restarted = True
+        elif stat.st_size < self._offset:
+            self._offset = 0
+            self._partial_line = b''
+            self.restarted = True
+        if stat.st_size == self._offset:
+            return []
+        self._file.seek(self._offset)
+        data = self._file.read(stat.st_size - self._offset)
+        self._offset += len(data)
+        lines = (self._partial_line + data).split(b'\n')
+        # Last element is either empty or a line that is still being written
+        self._partial_line = lines.pop()
+        return [line for line in lines if line.strip() and not line.lstrip().startswith(b'#')]
+
+    def close(self):
+        """Closes the probe file"""
+        if self._file:
+            self._file.close()
+        self._file = None
+        self._file_id = None
+        self._offset = 0
+        self._partial_line = b''
+
+
+class ProbeParser:
     """
-    Probe parser class, which represents a probe
-    results parsing thread
+    Probe parser class, which represents a probe results parsing task
+    Parsers of all cases share a process-wide scheduler instead of running own threads
     """
 
-    def __init__(self, case_dir, period: int = 0.01):
+    def __init__(self, case_dir, period: int = 0.01, event_driven: bool = True, store_probes: bool = False):
         """
         Probe parser initialization function
         :param case_dir: case directory
-        :param period: parsing period
+        :param period: parsing period, used when results are polled
+        :param event_driven: flag to parse only when probe results change (Linux inotify),
+        polling with a parsing period is used as a fallback
+        :param store_probes: flag to persist parsed samples into a binary probe store
         """
         self._case_dir = case_dir
         self.running = False
         self._mutex = Lock()
         self._num_of_probes = 0
+        self._readers = {}
+        self._segment_indexes = {}
+        self.store = ProbeStore(case_dir) if store_probes else None
+        self._listeners = []
+        self._task = None
+        self._watcher = None
+        self._watches = {}
         self.parsing_period = period
-        super(ProbeParser, self).__init__(daemon=True)
+        self.event_driven = event_driven
+
+    @property
+    def store_probes(self) -> bool:
+        return self.store is not None
+
+    @store_probes.setter
+    def store_probes(self, store_probes: bool):
+        """
+        Enables or disables persisting parsed samples into a binary probe store
+        :param store_probes: flag to store probes
+        """
+        if store_probes and not self.store:
+            self.store = ProbeStore(self._case_dir)
+        elif not store_probes and self.store:
+            self.store.close()
+            self.store = None
+
+    def add_listener(self, callback):
+        """
+        Adds a listener, which is called with a list of updated probes after each parse
+        Listeners are called from the parser thread and must not block it
+        :param callback: callback of form f(probes)
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """
+        Removes a parse listener
+        :param callback: callback to remove
+        """
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify_listeners(self, probes: list):
+        """
+        Notifies listeners about updated probes
+        :param probes: list of updated probes
+        """
+        if not probes:
+            return
+        for callback in self._listeners[:]:
+            try:
+                callback(probes)
+            except Exception as e:
+                logger.error(f'Probe parse listener failed: {e}')
 
     def _on_location_count(self, line, location_str, location):
         """
@@ -315,127 +661,250 @@ class ProbeParser(Thread):
         if os.path.exists(probe_dict):
             parse_probes_dict(probe_dict, on_location=self._on_location_count)
 
-    def _parse_region(self, region):
+    def _get_segment_index(self, region: str) -> ProbeSegmentIndex:
         """
-        Checks the postProcessing folder for probes data
-        Opens the corresponding fields data, parses last line
-        and saves it to corresponding probe.
-        """
-        path_to_probes_data = f'{self._case_dir}/postProcessing/probes/{region}'
-        scalar_pattern = re.compile(NUMBER_PATTERN)
-        vector_pattern = re.compile(VECTOR_PATTERN)
-        region_probes = [[num, probe] for num, probe in enumerate(Probe.get_instances(self._case_dir), 0)
-                         if probe.region == region]
-        for field in Probe.get_fields(self._case_dir):
-            try:
-                latest_result = get_latest_time(path_to_probes_data)
-            except FileNotFoundError:
-                latest_result = '0'
-            path_to_probes_field = f'{path_to_probes_data}/{latest_result}/{field}'
-            if os.path.exists(path_to_probes_field):
-                field_probes = [[num, probe] for num, probe in region_probes if probe.field == field]
-                with open(path_to_probes_field, 'rb') as f:
-                    f.seek(-2, os.SEEK_END)
-                    while f.read(1) != b'\n':
-                        f.seek(-2, os.SEEK_CUR)
-                    last_line = f.readline().decode()
-                scalar_match = re.findall(scalar_pattern, last_line)
-                vector_match = vector_pattern.findall(last_line)
-                for number, probe in field_probes:
-                    if vector_match:
-                        probe.time = float(scalar_match[0])
-                        probe.value = [float(v) for v in vector_match[number]]
-                    elif scalar_match:
-                        scalar_match = [float(match) for match in scalar_match]
-                        probe.time = scalar_match[0]
-                        probe.value = scalar_match[number + 1]
+        Gets a probe segment index of a region
+        :param region: probed region
+        :return: probe segment index
+        """
+        if region not in self._segment_indexes:
+            self._segment_indexes[region] = ProbeSegmentIndex(f'{self._case_dir}/postProcessing/probes/{region}')
+        return self._segment_indexes[region]
 
-    @staticmethod
-    def _on_field_remove(line, fields_str, fields, used_fields):
+    def _get_reader(self, region: str, field: str, segment: str) -> ProbeFileReader:
         """
-        Callback for a probe parsing function, which is called when a field is found
-        Used to replace the fields in probe dictionary with used fields
-        :param line: document line string
-        :param fields_str: fields match string (e.g., '("T" "U")')
-        :param fields: fields as list (e.g., ['T', 'U', ...]
-        :param used_fields: used fields as list (e.g., ['T', 'U', ...]
-        :return: document line string
+        Gets a tail-following reader of a region field probe file of a segment
+        :param region: probed region
+        :param field: probed field
+        :param segment: probe segment (time directory)
+        :return: probe file reader
         """
-        return line.replace(fields_str, ' '.join(used_fields))
+        reader: Optional[ProbeFileReader] = self._readers.get((region, field, segment))
+        if not reader:
+            reader = ProbeFileReader(f'{self._case_dir}/postProcessing/probes/{region}/{segment}/{field}')
+            self._readers[(region, field, segment)] = reader
+        return reader
 
-    @staticmethod
-    def _on_location_remove(line, location_str, location, used_locations):
+    def _close_removed_readers(self, region: str, index: ProbeSegmentIndex):
         """
-        Callback for a probe parsing function, which is called when a location is found
-        Used to remove unused locations from probes dictionary
-        :param line: document line string
-        :param location_str: location match string
-        :param location: location as coordinates [x, y, z]
-        :param used_locations: used probe locations [[x, y, z], [x, y, z], ...]
-        :return: document line string
+        Closes readers of region segments, which do not exist anymore
+        :param region: probed region
+        :param index: probe segment index of a region
         """
-        if location not in used_locations:
-            line = ''
-        return line
+        segments = {segment for segment, _ in index.segments}
+        for key in [key for key in self._readers if key[0] == region and key[2] not in segments]:
+            self._readers.pop(key).close()
+
+    def _close_readers(self):
+        """Closes all opened probe files"""
+        for reader in self._readers.values():
+            reader.close()
+        self._readers = {}
+
+    def _parse_region(self, region):
+        """
+        Checks the postProcessing folder for probes data
+        Reads the data appended to the corresponding fields data of all the region segments
+        (one per solver run), parses the new lines and saves them to corresponding probe.
+        Results of a segment, which were overridden by a later run started from an older time, are skipped
+        :param region: probed region
+        :return: list of updated probes
+        """
+        registry = Probe.get_registry(self._case_dir)
+        updated = []
+        index = self._get_segment_index(region)
+        if index.refresh():
+            self._close_removed_readers(region, index)
+        for field in registry.fields:
+            field_probes = registry.get_probes(region, field)
+            if not field_probes:
+                continue
+            for segment, _ in index.segments:
+                reader = self._get_reader(region, field, segment)
+                new_lines = reader.read_lines()
+                if reader.restarted:
+                    # Segment is written again, so it is now the latest one
+                    reader.restarted = False
+                    index.invalidate()
+                    index.refresh()
+                if not new_lines:
+                    continue
+                times, values = parse_probe_lines(new_lines)
+                cutoff = index.get_cutoff(segment)
+                if len(times) and times[-1] >= cutoff:
+                    overridden = times >= cutoff
+                    times, values = times[~overridden], values[~overridden]
+                if not len(times):
+                    continue
+                for probe in field_probes:
+                    column = registry.get_column(probe.location)
+                    if column is not None and column < values.shape[1]:
+                        probe.extend(times, values[:, column])
+                        updated.append(probe)
+                        if self.store:
+                            self.store.append(field, region, probe.location, times, values[:, column])
+        return updated
 
     def remove_unused(self):
         """
         Removes unused probes and fields from a probe dictionary,
+        rewrites probe locations in the registry order, so that the column
+        of each location in the results matches its registry index,
         counts the amount of used probes
         """
-        probe_dict = f'{self._case_dir}/system/probes'
-        if not os.path.exists(probe_dict):
+        registry = Probe.get_registry(self._case_dir)
+        if not os.path.exists(f'{self._case_dir}/system/probes') or registry is None:
             self._num_of_probes = 0
             return
-        probe_locations = [probe.location for probe in Probe.get_instances(self._case_dir)]
-        new_lines = parse_probes_dict(
-            probe_dict,
-            on_field=lambda line, fields_str, fields: self._on_field_remove(line, fields_str, fields,
-                                                                            Probe.get_fields(self._case_dir)),
-            on_location=lambda line, loc_str, loc: self._on_location_remove(line, loc_str, loc, probe_locations)
-        )
-        with open(probe_dict, 'w') as f:
-            f.writelines(new_lines)
-        self._num_of_probes = len(probe_locations)
+        Probe.write_dict(self._case_dir)
+        self._num_of_probes = len(registry.locations)
 
     def parse_probe(self, probe: Probe):
         """
         Parses data for initialized case with previous results
         :param probe: probe to parse
         """
-        if probe not in Probe.get_instances(self._case_dir) or \
+        registry = Probe.get_registry(self._case_dir)
+        if registry is None or registry.get(probe.field, probe.region, probe.location) is not probe or \
                 not os.path.exists(f'{self._case_dir}/postProcessing/probes/{probe.region}'):
             return
-        self._parse_region(probe.region)
+        self._notify_listeners(self._parse_region(probe.region))
 
-    def run(self):
-        """Thread function to parse data"""
-        if not Probe.get_instances(self._case_dir):
-            # No probes were initialized
-            return
-        self.running = True
-        self.remove_unused()
-        self._mutex.acquire()
-        while self.running:
-            for region in Probe.get_regions(self._case_dir):
-                self._parse_region(region)
-            time.sleep(self.parsing_period)
-        self._mutex.release()
-
-    def start(self) -> None:
-        super(ProbeParser, self).__init__(daemon=True)
-        super(ProbeParser, self).start()
+    def _sync_watches(self):
+        """
+        Updates the watched directories, i.e., probe region directories and their time directories
+        If a region directory does not exist yet, its nearest existing parent is watched instead
+        """
+        watched = {}
+        for region in Probe.get_regions(self._case_dir):
+            path = f'{self._case_dir}/postProcessing/probes/{region}'
+            if os.path.isdir(path):
+                watched[path] = IN_CREATE | IN_MOVED_TO | IN_ONLYDIR
+                for time_dir in get_numerated_dirs(path):
+                    watched[f'{path}/{time_dir}'] = IN_CREATE | IN_MODIFY | IN_MOVED_TO | IN_ONLYDIR
+            else:
+                while path and path != self._case_dir and not os.path.isdir(path):
+                    path = os.path.dirname(path)
+                watched[path] = IN_CREATE | IN_MOVED_TO | IN_ONLYDIR
+        for path in set(self._watches) - set(watched):
+            self._watcher.remove_watch(self._watches.pop(path))
+        for path, mask in watched.items():
+            if path not in self._watches:
+                try:
+                    self._watches[path] = self._watcher.add_watch(path, mask)
+                except OSError:
+                    # Directory was removed in between
+                    pass
+
+    def _start_watching(self) -> bool:
+        """
+        Starts watching probe results directories
+        :return: True if results can be watched, False if they have to be polled
+        """
+        if not (self.event_driven and INOTIFY_AVAILABLE):
+            return False
+        try:
+            self._watcher = InotifyWatcher()
+        except OSError as e:
+            logger.warning(f'Could not watch probe results, polling them instead: {e}')
+            return False
+        self._sync_watches()
+        return True
+
+    def _stop_watching(self):
+        """Stops watching probe results directories"""
+        if self._watcher:
+            self._watcher.close()
+        self._watcher = None
+        self._watches = {}
+
+    def _read_changes(self):
+        """
+        Reads pending probe results directories changes and updates the watched directories if required
+        """
+        events = self._watcher.read_events()
+        # Watches of removed directories are gone, so that recreated directories are watched again
+        ignored = {wd for wd, mask, _ in events if mask & IN_IGNORED}
+        if ignored:
+            self._watches = {path: wd for path, wd in self._watches.items() if wd not in ignored}
+        if any(mask & (IN_CREATE | IN_MOVED_TO | IN_IGNORED) for _, mask, _ in events):
+            self._sync_watches()
+
+    def parse(self):
+        """
+        Scheduled task function to parse probe results data
+        It is called when probe results change (event-driven) or periodically,
+        a timeout is used as a safety net for the file systems, which do not deliver all events
+        """
+        if self._watcher:
+            self._read_changes()
+        updated = []
+        for region in Probe.get_regions(self._case_dir):
+            updated += self._parse_region(region)
+        self._notify_listeners(updated)
+
+    def start(self):
+        """Starts parsing probe results data in a process-wide scheduler"""
+        with self._mutex:
+            if self._task or not Probe.get_instances(self._case_dir):
+                # Parser is already running or no probes were initialized
+                return
+            self.running = True
+            self.remove_unused()
+            event_driven = self._start_watching()
+            self._task = get_scheduler().schedule(self.parse,
+                                                  EVENT_WAIT_TIMEOUT if event_driven else self.parsing_period,
+                                                  fileobj=self._watcher, name=f'{self._case_dir} probe parser')
 
     def stop(self):
-        """Stops parsing thread"""
-        self.running = False
-        self._mutex.acquire()
-        self._mutex.release()
+        """Stops parsing probe results data"""
+        with self._mutex:
+            self.running = False
+            if not self._task:
+                return
+            self._task.cancel()
+            self._task = None
+            self._stop_watching()
+            self._close_readers()
+            if self.store:
+                self.store.close()
+
+
+def benchmark_parsing(num_of_probes: int = 500, num_of_lines: int = 200, vectors: bool = False):
+    """
+    Microbenchmark of vectorized probe lines parsing against a regular expression line by line parsing
+    :param num_of_probes: number of probes (columns) in each line
+    :param num_of_lines: number of parsed lines
+    :param vectors: flag to benchmark vector field lines
+    """
+    value = '(0.1 -0.25 1.5e-3)' if vectors else '293.15'
+    lines = [f'{t:<8} {" ".join([value] * num_of_probes)}'.encode() for t in range(num_of_lines)]
+    scalar_pattern = re.compile(NUMBER_PATTERN)
+    vector_pattern = re.compile(VECTOR_PATTERN)
+
+    def parse_regex():
+        for line in lines:
+            line = line.decode()
+            if vectors:
+                [[float(v) for v in match] for match in vector_pattern.findall(line)]
+            else:
+                [float(match) for match in scalar_pattern.findall(line)]
+
+    def parse_vectorized():
+        parse_probe_lines(lines)
+
+    for name, func in (('regex', parse_regex), ('vectorized', parse_vectorized)):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        print(f'{name:<12}{"vector" if vectors else "scalar"} {num_of_lines} lines x {num_of_probes} probes: '
+              f'{elapsed * 1000:.2f} ms')
+
+
+def main():
+    benchmark_parsing()
+    benchmark_parsing(vectors=True)
 
 
 if __name__ == '__main__':
-    case = '.'
-    temperature_probe = Probe(case, 'T', 'fluid', [1, 2, 1])
-    parser = ProbeParser(case)
-    parser.remove_unused()
-    parser.start()
+    main()
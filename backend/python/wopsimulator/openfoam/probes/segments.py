@@ -0,0 +1,91 @@
+"""Index of probe result segments, i.e., time directories written by consecutive solver runs"""
+import os
+from typing import List, Tuple
+
+from ..common.filehandling import get_numerated_dirs
+
+
+class ProbeSegmentIndex:
+    """
+    Probe segment index of a single probed region
+    Each solver (re)start writes probe results into a new directory named by its start time,
+    e.g., postProcessing/probes/fluid/0, postProcessing/probes/fluid/20.
+    The index discovers these segments and orders them by the solver runs, which wrote them.
+    Segment listing is cached and only refreshed when the region directory changes,
+    i.e., a segment is created or removed, or when the index is invalidated
+    """
+
+    def __init__(self, region_dir: str):
+        """
+        Probe segment index initialization function
+        :param region_dir: probe region results directory (e.g., postProcessing/probes/fluid)
+        """
+        self.region_dir = region_dir
+        self._dir_mtime = None
+        self._segments = []
+        self._cutoffs = {}
+
+    def invalidate(self):
+        """Forces segments to be listed again on the next refresh, e.g., when a segment was rewritten"""
+        self._dir_mtime = None
+
+    def _get_segment_mtime(self, segment: str) -> int:
+        """
+        Gets the latest modification time of a segment, i.e., of its newest file
+        :param segment: segment (time directory) name
+        :return: modification time in nanoseconds
+        """
+        path = f'{self.region_dir}/{segment}'
+        try:
+            with os.scandir(path) as entries:
+                return max([entry.stat().st_mtime_ns for entry in entries if entry.is_file()],
+                           default=os.stat(path).st_mtime_ns)
+        except FileNotFoundError:
+            return 0
+
+    def refresh(self) -> bool:
+        """
+        Lists the segments again if the region directory changed
+        :return: True if segments were listed again
+        """
+        try:
+            dir_mtime = os.stat(self.region_dir).st_mtime_ns
+        except FileNotFoundError:
+            dir_mtime = None
+            changed = bool(self._segments)
+            self._dir_mtime, self._segments, self._cutoffs = None, [], {}
+            return changed
+        if dir_mtime == self._dir_mtime:
+            return False
+        self._dir_mtime = dir_mtime
+        segments = [(self._get_segment_mtime(segment), float(segment), segment)
+                    for segment in get_numerated_dirs(self.region_dir)
+                    if os.path.isdir(f'{self.region_dir}/{segment}')]
+        # Segments are ordered by the runs, which wrote them
+        segments.sort()
+        self._segments = [(segment, start) for _, start, segment in segments]
+        # A later run, which started from an older time, overrides the results of previous runs after its start
+        self._cutoffs = {}
+        cutoff = float('inf')
+        for segment, start in reversed(self._segments):
+            self._cutoffs[segment] = cutoff
+            cutoff = min(cutoff, start)
+        return True
+
+    @property
+    def segments(self) -> List[Tuple[str, float]]:
+        """Segments (name, start time) ordered by the runs, which wrote them"""
+        return self._segments
+
+    def get_cutoff(self, segment: str) -> float:
+        """
+        Gets time, from which the results of a segment are overridden by later segments
+        :param segment: segment name
+        :return: cutoff time (inf for the latest segment)
+        """
+        return self._cutoffs.get(segment, float('inf'))
+
+    @property
+    def latest(self) -> str:
+        """Latest segment name or '0' if there are no segments"""
+        return self._segments[-1][0] if self._segments else '0'
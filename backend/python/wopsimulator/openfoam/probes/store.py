@@ -0,0 +1,141 @@
+"""Compact on-disk probe history store, which allows to load full probe series without parsing ASCII results"""
+import os
+import json
+from threading import Lock
+from typing import List, Tuple, Union
+
+import numpy as np
+
+Num = Union[int, float, None]
+
+STORE_DIR = 'postProcessing/probeStore'
+STORE_INDEX_FILE = 'index.json'
+STORE_DTYPE = np.float64
+# Number of decimals, to which probe locations are rounded in file names
+STORE_LOCATION_DECIMALS = 6
+
+
+def get_store_file_name(location: List[Num]) -> str:
+    """
+    Gets a store file name of a probe location
+    :param location: probe location [x, y, z]
+    :return: file name, e.g., 1.5_2.0_1.0.f64
+    """
+    return '_'.join([repr(round(float(coord), STORE_LOCATION_DECIMALS)) for coord in location]) + '.f64'
+
+
+class ProbeStore:
+    """
+    Append-only binary probe history store of a case
+    Samples of each probe are stored as raw float64 records (time, value components)
+    in postProcessing/probeStore/<region>/<field>/<location>.f64, the number of value
+    components of a field is stored in an index.json file next to them.
+    Stored series are loaded as zero-copy memory mapped arrays
+    """
+
+    def __init__(self, case_dir: str):
+        """
+        Probe store initialization function
+        :param case_dir: case directory
+        """
+        self.path = f'{case_dir}/{STORE_DIR}'
+        self._files = {}
+        self._last_times = {}
+        self._lock = Lock()
+
+    def _get_field_dir(self, field: str, region: str) -> str:
+        return f'{self.path}/{region}/{field}'
+
+    def _get_file(self, field: str, region: str, location: List[Num], components: int):
+        """
+        Gets an opened store file of a probe, creates it with the field index if it does not exist
+        :param field: probe field
+        :param region: probe region
+        :param location: probe location
+        :param components: number of value components
+        :return: file opened for appending
+        """
+        path = f'{self._get_field_dir(field, region)}/{get_store_file_name(location)}'
+        if path not in self._files:
+            field_dir = os.path.dirname(path)
+            if not os.path.exists(f'{field_dir}/{STORE_INDEX_FILE}'):
+                os.makedirs(field_dir, exist_ok=True)
+                with open(f'{field_dir}/{STORE_INDEX_FILE}', 'w') as f:
+                    json.dump({'components': components, 'dtype': np.dtype(STORE_DTYPE).name}, f)
+            self._files[path] = open(path, 'ab')
+            times, _ = self._map(path, components)
+            self._last_times[path] = float(times[-1]) if len(times) else None
+        return path, self._files[path]
+
+    @staticmethod
+    def _map(path: str, components: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Memory maps a store file
+        :param path: path to store file
+        :param components: number of value components
+        :return: times and values arrays
+        """
+        width = 1 + components
+        record_size = width * np.dtype(STORE_DTYPE).itemsize
+        try:
+            # Incomplete record at the end (being written) is ignored
+            records = os.path.getsize(path) // record_size
+        except FileNotFoundError:
+            records = 0
+        if not records:
+            table = np.empty((0, width), dtype=STORE_DTYPE)
+        else:
+            table = np.memmap(path, dtype=STORE_DTYPE, mode='r', shape=(records, width))
+        values = table[:, 1] if components == 1 else table[:, 1:]
+        return table[:, 0], values
+
+    def append(self, field: str, region: str, location: List[Num], times: np.ndarray, values: np.ndarray):
+        """
+        Appends probe samples to the store
+        If samples start from an older time than already stored (solver was restarted),
+        the overridden stored samples are removed first
+        :param field: probe field
+        :param region: probe region
+        :param location: probe location
+        :param times: samples times, shape (n,)
+        :param values: samples values, shape (n,) or (n, 3)
+        """
+        if not len(times):
+            return
+        values = np.asarray(values, dtype=STORE_DTYPE)
+        components = 1 if values.ndim == 1 else values.shape[1]
+        table = np.column_stack([np.asarray(times, dtype=STORE_DTYPE), values.reshape(len(times), components)])
+        with self._lock:
+            path, f = self._get_file(field, region, location, components)
+            last_time = self._last_times[path]
+            if last_time is not None and times[0] <= last_time:
+                f.flush()
+                kept = int(np.searchsorted(self._map(path, components)[0], times[0], side='left'))
+                os.ftruncate(f.fileno(), kept * table.shape[1] * table.itemsize)
+            f.write(table.tobytes())
+            f.flush()
+            self._last_times[path] = float(times[-1])
+
+    def load(self, field: str, region: str, location: List[Num]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Loads the full stored series of a probe without copying it into memory
+        :param field: probe field
+        :param region: probe region
+        :param location: probe location
+        :return: times array of shape (n,) and values array of shape (n,) or (n, 3)
+        """
+        field_dir = self._get_field_dir(field, region)
+        try:
+            with open(f'{field_dir}/{STORE_INDEX_FILE}', 'r') as f:
+                components = json.load(f)['components']
+        except FileNotFoundError:
+            return np.empty(0), np.empty(0)
+        return self._map(f'{field_dir}/{get_store_file_name(location)}', components)
+
+    def close(self):
+        """Closes all opened store files"""
+        with self._lock:
+            for f in self._files.values():
+                f.close()
+            self._files = {}
+            self._last_times = {}
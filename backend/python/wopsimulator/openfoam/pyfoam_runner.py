@@ -1,7 +1,8 @@
 import traceback
 import logging
-from signal import SIGINT
+from signal import SIGINT, SIGSTOP, SIGCONT
 from threading import Thread, Lock
+from typing import List, Iterable
 
 import PyFoam.Error
 import psutil
@@ -133,11 +134,42 @@ class PyFoamSolver(Thread):
             logger.debug('Quiting solver thread')
             self.solver = None
 
+    def _get_processes(self) -> List[psutil.Process]:
+        """Gets the solver process and all of its descendants, e.g., mpirun and the solver ranks"""
+        try:
+            if not self.solver:
+                return []
+            process = psutil.Process(self.solver.run.run.pid)
+            return [process] + process.children(recursive=True)
+        except (psutil.NoSuchProcess, AttributeError):
+            return []
+
+    @staticmethod
+    def _send_signal(processes: Iterable[psutil.Process], signal):
+        """Sends a signal to processes, the ones which have already exited are skipped"""
+        for process in processes:
+            try:
+                process.send_signal(signal)
+            except psutil.NoSuchProcess:
+                pass
+
+    def pause(self):
+        """
+        Pauses solving by freezing the solver processes (SIGSTOP), so that it can be resumed without restarting
+        Parent processes are frozen first, so that they do not react to their children being stopped
+        """
+        self._send_signal(self._get_processes(), SIGSTOP)
+
+    def resume(self):
+        """Resumes paused solving (SIGCONT), child processes are continued first"""
+        self._send_signal(reversed(self._get_processes()), SIGCONT)
+
     def stop(self, signal):
-        """Stops solving"""
+        """Stops solving, paused processes are continued first, as frozen processes do not handle signals"""
         try:
             if not self.solver:
                 return
+            self.resume()
             pid = self.solver.run.run.pid
             process = psutil.Process(pid)
             process.children()[0].send_signal(signal)
@@ -153,6 +185,7 @@ class PyFoamSolver(Thread):
     def kill(self):
         """Kill solving thread"""
         try:
+            self.resume()
             pid = self.solver.run.run.pid
             process = psutil.Process(pid)
             process.send_signal(SIGINT)
@@ -1,6 +1,8 @@
 import math
 from typing import List
 
+from ..common.filehandling import atomic_write
+
 BLOCKMESH_DICT_FILE_TEMPLATE = r"""/*--------------------------------*- C++ -*----------------------------------*\
 | =========                 |                                                 |
 | \\      /  F ield         | OpenFOAM: The Open Source CFD Toolbox           |
@@ -301,8 +303,7 @@ class BlockMeshDict:
         edges_str = ' ' * 4 + f'{" " * 4}'.join([str(edge) for edge in self.edges]) if self.edges else ''
         boundaries_str = ' ' * 4 + f'{" " * 4}'.join([str(b) for b in self.boundaries]) if self.boundaries else ''
         file_output = BLOCKMESH_DICT_FILE_TEMPLATE % (self.scale, vertices_str, blocks_str, edges_str, boundaries_str)
-        with open(f'{self._case_dir}/system/blockMeshDict', 'w') as f:
-            f.writelines(file_output)
+        atomic_write(f'{self._case_dir}/system/blockMeshDict', file_output)
 
     def remove(self):
         try:
@@ -1,6 +1,7 @@
 import os
 import re
 
+from ..common.filehandling import atomic_write
 from ..common.parsing import SPECIFIC_VALUE_PATTERN, NUMBER_PATTERN
 
 END_OF_FILE = '// ************************************************************************* //'
@@ -176,8 +177,7 @@ class ControlDict:
                         self.write_now_signal,
                         self.stop_at_write_now_signal)
         file_output = CONTROL_DICT_FILE_TEMPLATE % write_values
-        with open(f'{self._case_dir}/system/controlDict', 'w+') as f:
-            f.writelines(file_output)
+        atomic_write(f'{self._case_dir}/system/controlDict', file_output)
 
 
 def main():
@@ -4,6 +4,7 @@ from collections.abc import Iterable
 from dataclasses import dataclass
 from typing import List
 
+from ..common.filehandling import atomic_write
 from ..common.parsing import SPECIFIC_FIELD_PATTERN
 
 END_OF_FILE = '// ************************************************************************* //'
@@ -132,8 +133,7 @@ class DecomposeParDict:
         :param data: data to save
         :param rel_path: relative path
         """
-        with open(f'{self._case_dir}/system/{rel_path}', 'w+') as f:
-            f.writelines(data)
+        atomic_write(f'{self._case_dir}/system/{rel_path}', data)
 
     def save(self):
         """
@@ -1,5 +1,7 @@
 from typing import List, Union
 
+from ..common.filehandling import atomic_write
+
 SNAPPY_DICT_FILE_TEMPLATE = r"""/*--------------------------------*- C++ -*----------------------------------*\
 | =========                 |                                                 |
 | \\      /  F ield         | OpenFOAM: The Open Source CFD Toolbox           |
@@ -282,8 +284,7 @@ class SnappyHexMeshDict:
             self.location_in_mesh[0], self.location_in_mesh[1], self.location_in_mesh[2],
             self._of_bool(self.relative_sizes), self.min_thickness, self.final_layer_thickness, self.expansion_ratio
         )
-        with open(f'{self._case_dir}/system/snappyHexMeshDict', 'w') as f:
-            f.writelines(file_output)
+        atomic_write(f'{self._case_dir}/system/snappyHexMeshDict', file_output)
 
     def remove(self, name):
         try:
@@ -1,6 +1,5 @@
 import numpy as np
 
-from ..openfoam.common.filehandling import get_latest_time
 from ..openfoam.system.snappyhexmesh import SnappyHexMeshDict, SnappyRegion
 from ..geometry.manipulator import Model
 from .base import Phyng
@@ -158,7 +157,7 @@ class AcPhyng(Phyng):
     def enabled(self, value):
         if self._snappy_dict is None or self._boundary_conditions is None:
             return
-        latest_result = get_latest_time(self._case_dir)
+        latest_result = self._get_latest_time()
         try:
             if value:
                 set_boundary_to_outlet(self.name_in, self._boundary_conditions, self._velocity_in, self._temperature,
@@ -195,7 +194,7 @@ class AcPhyng(Phyng):
                                       f'not {self._temperature}')
         if self._snappy_dict is None or self._boundary_conditions is None or not self._enabled:
             return
-        latest_result = get_latest_time(self._case_dir)
+        latest_result = self._get_latest_time()
         try:
             self._boundary_conditions['T'].update_time(latest_result)
             self._boundary_conditions['T'][self.name_in].value = self.environment.temperature
@@ -224,7 +223,7 @@ class AcPhyng(Phyng):
         self._velocity_out = [vel_x, vel_y, vel_z]
         if self._snappy_dict is None or self._boundary_conditions is None or not self._enabled:
             return
-        latest_result = get_latest_time(self._case_dir)
+        latest_result = self._get_latest_time()
         try:
             update_boundaries(self._boundary_conditions, latest_result)
             self._boundary_conditions['U'][self.name_in].value = self._velocity_in
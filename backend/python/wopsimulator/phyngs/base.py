@@ -4,7 +4,7 @@ import os
 from abc import ABC, abstractmethod
 
 from ..geometry.manipulator import Model
-from ..openfoam.common.filehandling import force_remove_dir
+from ..openfoam.common.filehandling import force_remove_dir, get_latest_time
 from ..openfoam.system.snappyhexmesh import SnappyHexMeshDict, SnappyRegion, SnappyCellZoneMesh
 from .common import Environment
 
@@ -57,6 +57,15 @@ class Phyng(ABC):
         self.model = Model(name, model_type, dimensions, location, rotation, facing_zero, self.path, self._case_dir)
         self.model_type = model_type
 
+    def _get_latest_time(self) -> str:
+        """
+        Gets the latest result time, which boundary conditions are updated to when a value is set.
+        Processor directories are used if they are the authoritative state of a case
+        """
+        if self._of_interface:
+            return self._of_interface.get_latest_result()
+        return get_latest_time(self._case_dir)
+
     def _get_stl(self, stl_name: str, templates_dir: str):
         path = self._get_custom_stl(stl_name)
         if not path:
@@ -181,16 +190,36 @@ class Phyng(ABC):
         """Allow to access attributes of a class as in dictionary"""
         return getattr(self, item)
 
+    @staticmethod
+    def _is_same_value(current, value) -> bool:
+        """
+        Checks whether a value to set equals the current one, numbers are compared numerically, e.g., 20 and '20.0'
+        :param current: current value
+        :param value: value to set
+        :return: True if values are equal
+        """
+        try:
+            if isinstance(current, (int, float)) and not isinstance(current, bool):
+                return float(current) == float(value)
+            return bool(current == value)
+        except (TypeError, ValueError):
+            return False
+
     def __setitem__(self, key, value):
         """Allow to set attributes of a class as in dictionary"""
         logger.debug(f'Value set of Phyng {self.name} was requested')
+        if hasattr(self, key) and self._is_same_value(getattr(self, key), value):
+            # Boundary conditions are not changed, so the solver does not have to be restarted
+            logger.debug(f'Value "{key}" of Phyng "{self.name}" is already "{value}", skipping')
+            return
         case_was_stopped = False
         if self._of_interface.running:
             logger.debug('Case is running, remembering it')
             case_was_stopped = True
         self._of_interface.stop()
         if self._fields:
-            if self._of_interface.parallel and self._of_interface.is_decomposed:
+            if self._of_interface.parallel and self._of_interface.is_decomposed \
+                    and not self._of_interface.keep_decomposed:
                 logger.debug(f'Case is parallel, running reconstruction of fields: {self._fields}')
                 if self._fields == 'all':
                     self._of_interface.run_reconstruct(latest_time=True, region=self._region, waiting=True)
@@ -198,7 +227,11 @@ class Phyng(ABC):
                     self._of_interface.run_reconstruct(latest_time=True, region=self._region,
                                                        fields=self._fields, waiting=True)
         logger.info(f'Setting value "{key}" of Phyng "{self.name}" to "{value}" of type {type(value)}')
-        setattr(self, key, value)
+        with self._of_interface.boundary_transaction():
+            setattr(self, key, value)
+        value_stream = getattr(self._of_interface, 'value_stream', None)
+        if value_stream:
+            value_stream.publish(self.name, key, self[key])
         if case_was_stopped:
             logger.debug('Case can be run now')
             self._of_interface.run()
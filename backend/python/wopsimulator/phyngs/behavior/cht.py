@@ -1,8 +1,24 @@
+from functools import wraps
 from typing import List
 
+from ...openfoam.boundaries.boundary_conditions import BoundaryTransaction
 from ...openfoam.boundaries.boundary_types import Boundary
 
 
+def _boundary_transaction(func):
+    """
+    Boundary behavior decorator, which runs a behavior in a boundary conditions transaction,
+    so that every touched boundary conditions file is written once instead of once per value
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with BoundaryTransaction():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
 def update_boundaries(boundary: dict, time: str):
     """
     Updates selected boundaries with latest time
@@ -19,6 +35,7 @@ def update_boundaries(boundary: dict, time: str):
     boundary['U'].update_time(time)
 
 
+@_boundary_transaction
 def set_boundary_to_wall(boundary_name: str, boundary: dict, temperature: float, time: str = '0', bg_name: str = None,
                          of_interface=None):
     """
@@ -50,10 +67,10 @@ def set_boundary_to_wall(boundary_name: str, boundary: dict, temperature: float,
     t[boundary_name] = Boundary('fixedValue', value=temperature, value_uniform=True)
     u[boundary_name] = Boundary('noSlip')
     if of_interface and bg_name:
-        of_interface.run_foam_dictionary(f'constant/{bg_name}/polyMesh/boundary',
-                                         f'entry0.{boundary_name}.type', 'wall')
+        of_interface.set_patch_type(boundary_name, 'wall', region=bg_name)
 
 
+@_boundary_transaction
 def set_boundary_to_inlet(boundary_name: str, boundary: dict, velocity: List[float], temperature: float,
                           time: str = '0', bg_name: str = None, of_interface=None):
     """
@@ -89,10 +106,10 @@ def set_boundary_to_inlet(boundary_name: str, boundary: dict, velocity: List[flo
     t[boundary_name] = Boundary('fixedValue', value=temperature, value_uniform=True)
     u[boundary_name] = Boundary('fixedValue', value=velocity, value_uniform=True)
     if of_interface and bg_name:
-        of_interface.run_foam_dictionary(f'constant/{bg_name}/polyMesh/boundary',
-                                         f'entry0.{boundary_name}.type', 'patch')
+        of_interface.set_patch_type(boundary_name, 'patch', region=bg_name)
 
 
+@_boundary_transaction
 def set_boundary_to_outlet(boundary_name: str, boundary: dict, velocity: List[float], temperature: float,
                            time: str = '0', bg_name: str = None, of_interface=None):
     """
@@ -126,10 +143,10 @@ def set_boundary_to_outlet(boundary_name: str, boundary: dict, velocity: List[fl
     epsilon[boundary_name] = Boundary('inletOutlet', value=0.001, value_uniform=True,
                                       inletValue=0.001, inletValue_uniform=True)
     if of_interface and bg_name:
-        of_interface.run_foam_dictionary(f'constant/{bg_name}/polyMesh/boundary',
-                                         f'entry0.{boundary_name}.type', 'patch')
+        of_interface.set_patch_type(boundary_name, 'patch', region=bg_name)
 
 
+@_boundary_transaction
 def set_boundary_to_heater(boundary_name: str, background_region_name: str, boundaries: dict, temperature: float,
                            time: str = '0'):
     """
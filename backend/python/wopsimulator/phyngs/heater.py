@@ -1,6 +1,5 @@
 from ..exceptions import PhyngSetValueFailed
 from ..openfoam.system.snappyhexmesh import SnappyHexMeshDict
-from ..openfoam.common.filehandling import get_latest_time
 from ..openfoam.constant.material_properties import SOLID_MATERIALS
 from .behavior.cht import set_boundary_to_heater
 from .base import Phyng
@@ -90,7 +89,7 @@ class HeaterPhyng(Phyng):
         self._temperature = temperature
         if self._snappy_dict is None or self._boundary_conditions is None:
             return
-        latest_result = get_latest_time(self._case_dir)
+        latest_result = self._get_latest_time()
         try:
             self._boundary_conditions[self.name]['T'].update_time(latest_result)
             if latest_result != '0':
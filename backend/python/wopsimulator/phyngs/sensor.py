@@ -1,4 +1,5 @@
 from ..openfoam.probes.probes import Probe
+from ..openfoam.probes.store import ProbeStore
 
 
 class SensorPhyng:
@@ -31,6 +32,29 @@ class SensorPhyng:
         """Sensor value getter"""
         return self._probe.value
 
+    @property
+    def probe(self) -> Probe:
+        """Sensor probe getter"""
+        return self._probe
+
+    def get_history(self, since: float = None, last: int = None, step: float = None) -> dict:
+        """
+        Gets sensor value history
+        :param since: return only values with simulation time greater than this value
+        :param last: return only this amount of the newest values
+        :param step: downsample by returning only the first value of each time interval of this size
+        :return: dictionary of simulation time and value lists
+        """
+        return self._probe.history.dump(since, last, step)
+
+    def load_stored_history(self):
+        """
+        Loads the full sensor value history from the case probe store (see store_probes case parameter)
+        Arrays are memory mapped, i.e., the series is not copied into memory
+        :return: simulation times array and values array, empty if probes were not stored
+        """
+        return ProbeStore(self._case_dir).load(self._probe.field, self._probe.region, self._probe.location)
+
     def destroy(self):
         """Destroys a Phyng Sensor by deleting a probe"""
         self._probe.remove()
@@ -1,5 +1,4 @@
 from ..exceptions import PhyngSetValueFailed
-from ..openfoam.common.filehandling import get_latest_time
 from .behavior.cht import set_boundary_to_wall
 from .base import Phyng
 from .common import MIN_TEMP, MAX_TEMP
@@ -59,7 +58,7 @@ class WallsPhyng(Phyng):
         self._temperature = temperature
         if self._snappy_dict is None or self._boundary_conditions is None:
             return
-        latest_result = get_latest_time(self._case_dir)
+        latest_result = self._get_latest_time()
         try:
             self.environment.temperature = temperature
             self._boundary_conditions['T'].update_time(latest_result)
@@ -1,5 +1,4 @@
 from ..exceptions import PhyngSetValueFailed
-from ..openfoam.common.filehandling import get_latest_time
 from .behavior.cht import set_boundary_to_wall, set_boundary_to_inlet, update_boundaries
 from .base import Phyng
 from .common import MIN_TEMP, MAX_TEMP, MIN_VEL, MAX_VEL
@@ -58,7 +57,7 @@ class WindowPhyng(Phyng):
         self._open = is_open
         if self._snappy_dict is None or self._boundary_conditions is None:
             return
-        latest_result = get_latest_time(self._case_dir)
+        latest_result = self._get_latest_time()
         try:
             if is_open:
                 set_boundary_to_inlet(self.name, self._boundary_conditions, self._velocity, self._temperature,
@@ -86,7 +85,7 @@ class WindowPhyng(Phyng):
         self._velocity = wind_speed
         if self._snappy_dict is None or self._boundary_conditions is None:
             return
-        latest_result = get_latest_time(self._case_dir)
+        latest_result = self._get_latest_time()
         try:
             if self._open:
                 update_boundaries(self._boundary_conditions, latest_result)
@@ -112,7 +111,7 @@ class WindowPhyng(Phyng):
         self._temperature = temperature
         if self._snappy_dict is None or self._boundary_conditions is None:
             return
-        latest_result = get_latest_time(self._case_dir)
+        latest_result = self._get_latest_time()
         try:
             self._boundary_conditions['T'].update_time(latest_result)
             self._boundary_conditions['T'][self.name].value = self._temperature
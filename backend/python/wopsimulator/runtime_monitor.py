@@ -1,8 +1,9 @@
 import logging
-import time
-from threading import Thread, Lock
+from threading import Lock
 from typing import Callable
 
+from .openfoam.common.scheduler import get_scheduler
+
 CHECKER_SLEEP_TIME = 0.01
 CHECKER_DELAY_WAIT_SCALE = 100
 CHECKER_DELAY_WAIT = CHECKER_DELAY_WAIT_SCALE * CHECKER_SLEEP_TIME
@@ -12,18 +13,24 @@ logger = logging.getLogger('wop')
 logger.setLevel(logging.DEBUG)
 
 
-class RunTimeMonitor(Thread):
-    def __init__(self, enabled: bool, tolerance: int, case_runner: Callable, case_stopper: Callable,
+class RunTimeMonitor:
+    """
+    Runtime monitor, which keeps the simulation time close to the real time by pausing and running (resuming) the case
+    Monitors of all cases share a process-wide scheduler instead of running own threads
+    """
+
+    def __init__(self, enabled: bool, tolerance: int, case_runner: Callable, case_pauser: Callable,
                  time_difference_getter: Callable, solved_getter: Callable):
         self._enabled = enabled
         self.running = False
         self.tolerance = tolerance
         self._solved_getter = solved_getter
         self._run_case = case_runner
-        self._stop_case = case_stopper
+        self._pause_case = case_pauser
         self._get_time_diff = time_difference_getter
+        self._previous_difference = 0
+        self._task = None
         self._mutex = Lock()
-        super(RunTimeMonitor, self).__init__(daemon=True)
 
     @property
     def enabled(self):
@@ -35,34 +42,50 @@ class RunTimeMonitor(Thread):
             self.stop()
         self._enabled = value
 
-    def run(self) -> None:
-        previous_difference = 0
-        self.running = True
-        self._mutex.acquire()
-        logger.debug('Starting runtime monitor')
-        while self.running and self._enabled and not self._solved_getter():
-            time_difference = self._get_time_diff()
-            if (previous_difference - time_difference) >= CHECKER_DELAY_WAIT:
-                time.sleep(CHECKER_DELAY_WAIT)
-            previous_difference = time_difference
-            if time_difference >= self.tolerance:
-                logger.debug('Runtime monitor stops the case')
-                self._stop_case(runtime_checker=True)
-            elif time_difference <= 0:
-                logger.debug('Runtime monitor starts the case')
-                self._run_case()
-            time.sleep(CHECKER_SLEEP_TIME)
-        self._mutex.release()
-        logger.debug('Runtime monitor stopped')
+    def check(self):
+        """
+        Scheduled task function, which checks the time difference once
+        :return: False if monitoring is finished, otherwise a delay until the next check
+        """
+        if not (self._enabled and not self._solved_getter()):
+            with self._mutex:
+                self.running = False
+                self._task = None
+            logger.debug('Runtime monitor stopped')
+            return False
+        delay = CHECKER_SLEEP_TIME
+        time_difference = self._get_time_diff()
+        if (self._previous_difference - time_difference) >= CHECKER_DELAY_WAIT:
+            delay += CHECKER_DELAY_WAIT
+        self._previous_difference = time_difference
+        if time_difference >= self.tolerance:
+            logger.debug('Runtime monitor pauses the case')
+            self._pause_case()
+        elif time_difference <= 0:
+            logger.debug('Runtime monitor starts the case')
+            self._run_case()
+        return delay
 
     def start(self) -> None:
         if not self._enabled:
             return
-        super(RunTimeMonitor, self).__init__(daemon=True)
-        super(RunTimeMonitor, self).start()
+        with self._mutex:
+            if self._task:
+                # Monitor is already running or is being stopped
+                return
+            logger.debug('Starting runtime monitor')
+            self.running = True
+            self._previous_difference = 0
+            self._task = get_scheduler().schedule(self.check, CHECKER_SLEEP_TIME, name='runtime monitor')
 
     def stop(self) -> None:
         logger.debug('Stopping the runtime monitor')
-        self.running = False
-        self._mutex.acquire()
-        self._mutex.release()
+        with self._mutex:
+            task = self._task
+        # Task is not cancelled under the lock, as the case runner called by it might start the monitor
+        if task:
+            task.cancel()
+        with self._mutex:
+            self.running = False
+            if self._task is task:
+                self._task = None
@@ -0,0 +1,182 @@
+import time
+import logging
+from threading import Condition, Lock
+from typing import Any, Iterable, List, Optional
+
+logger = logging.getLogger('wop')
+
+# Event dictionary keys
+STREAM_PHYNG_K = 'phyng'
+STREAM_PROPERTY_K = 'property'
+STREAM_VALUE_K = 'value'
+STREAM_TIME_K = 'time'
+
+
+def _value_change(old_value: Any, new_value: Any) -> float:
+    """
+    Gets an absolute change of a value, for vectors it is the maximum change of a component
+    Non-numeric values are either changed (inf) or not (0)
+    :param old_value: previous value
+    :param new_value: new value
+    :return: absolute change
+    """
+    try:
+        if isinstance(new_value, (list, tuple)):
+            if len(old_value) != len(new_value):
+                return float('inf')
+            return max([abs(new - old) for old, new in zip(old_value, new_value)], default=0)
+        if isinstance(new_value, bool) or isinstance(old_value, bool):
+            return float('inf') if old_value != new_value else 0.0
+        return abs(new_value - old_value)
+    except TypeError:
+        return 0 if old_value == new_value else float('inf')
+
+
+class ValueSubscription:
+    """
+    Subscription to the values of a value stream
+    Only the latest value of each Phyng property is kept until it is read,
+    i.e., slow subscribers get coalesced values instead of a growing queue
+    """
+
+    def __init__(self, stream, phyngs: Iterable[str] = None, threshold: float = 0, max_rate: float = None):
+        """
+        Value subscription initialization function
+        :param stream: value stream to subscribe to
+        :param phyngs: names of Phyngs to receive values of, all Phyngs if not specified
+        :param threshold: minimum absolute change of a value since the last received one
+        :param max_rate: maximum number of value batches received per second, unlimited if not specified
+        """
+        self._stream = stream
+        self.phyngs = set(phyngs) if phyngs else None
+        self.threshold = threshold or 0
+        self.min_period = 1 / max_rate if max_rate else 0
+        self._pending = {}
+        self._sent = {}
+        self._last_read = 0
+        self._closed = False
+        self._condition = Condition()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def offer(self, event: dict):
+        """
+        Offers a value event to a subscription, which is pending if it passes the subscription filters
+        :param event: value event
+        """
+        if self.phyngs is not None and event[STREAM_PHYNG_K] not in self.phyngs:
+            return
+        key = (event[STREAM_PHYNG_K], event[STREAM_PROPERTY_K])
+        with self._condition:
+            if key not in self._pending and key in self._sent and \
+                    _value_change(self._sent[key], event[STREAM_VALUE_K]) <= self.threshold:
+                return
+            self._pending[key] = event
+            self._condition.notify()
+
+    def get(self, timeout: float = None) -> List[dict]:
+        """
+        Waits for pending value events and takes them
+        :param timeout: maximum time to wait in seconds
+        :return: list of value events, empty on timeout or if subscription is closed
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._condition:
+            # Rate limit, wait for the minimum period since the last read
+            while not self._closed and (wait := self._last_read + self.min_period - time.monotonic()) > 0:
+                if deadline is not None and deadline - time.monotonic() < wait:
+                    self._condition.wait(max(0, deadline - time.monotonic()))
+                    return []
+                self._condition.wait(wait)
+            while not self._pending and not self._closed:
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return []
+                self._condition.wait(remaining)
+            if self._closed:
+                return []
+            events = list(self._pending.values())
+            self._pending = {}
+            for event in events:
+                self._sent[(event[STREAM_PHYNG_K], event[STREAM_PROPERTY_K])] = event[STREAM_VALUE_K]
+            self._last_read = time.monotonic()
+            return events
+
+    def close(self):
+        """Closes the subscription and removes it from the stream"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._stream.unsubscribe(self)
+
+
+class ValueStream:
+    """
+    Publish-subscribe stream of Phyng values of a case
+    Values are published once (e.g., by a probe parser after each parse or on Phyng value change)
+    and are distributed to all the subscribers
+    """
+
+    def __init__(self):
+        """Value stream initialization function"""
+        self._subscriptions = []
+        self._latest = {}
+        self._lock = Lock()
+
+    def subscribe(self, phyngs: Iterable[str] = None, threshold: float = 0,
+                  max_rate: float = None) -> ValueSubscription:
+        """
+        Subscribes to the stream values, the latest known values are pending immediately
+        :param phyngs: names of Phyngs to receive values of, all Phyngs if not specified
+        :param threshold: minimum absolute change of a value since the last received one
+        :param max_rate: maximum number of value batches received per second, unlimited if not specified
+        :return: subscription
+        """
+        subscription = ValueSubscription(self, phyngs, threshold, max_rate)
+        with self._lock:
+            for event in self._latest.values():
+                subscription.offer(event)
+            self._subscriptions.append(subscription)
+        logger.debug(f'Value stream subscription added, {len(self._subscriptions)} in total')
+        return subscription
+
+    def unsubscribe(self, subscription: ValueSubscription):
+        """
+        Removes a subscription from the stream
+        :param subscription: subscription to remove
+        """
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def publish(self, phyng: str, prop: str, value: Any, sim_time: Optional[float] = None):
+        """
+        Publishes a Phyng property value to all the subscribers
+        :param phyng: Phyng name
+        :param prop: Phyng property name (e.g., value, temperature)
+        :param value: property value
+        :param sim_time: simulation time of a value
+        """
+        event = {STREAM_PHYNG_K: phyng, STREAM_PROPERTY_K: prop, STREAM_VALUE_K: value, STREAM_TIME_K: sim_time}
+        with self._lock:
+            self._latest[(phyng, prop)] = event
+            subscriptions = self._subscriptions[:]
+        for subscription in subscriptions:
+            subscription.offer(event)
+
+    def forget(self, phyng: str):
+        """
+        Forgets the latest values of a Phyng, e.g., when it is removed
+        :param phyng: Phyng name
+        """
+        with self._lock:
+            self._latest = {key: event for key, event in self._latest.items() if key[0] != phyng}
+
+    def close(self):
+        """Closes all the subscriptions"""
+        with self._lock:
+            subscriptions = self._subscriptions[:]
+        for subscription in subscriptions:
+            subscription.close()
@@ -24,6 +24,11 @@ CONFIG_INITIALIZED_K = 'initialized'
 CONFIG_STARTED_TIMESTAMP_K = 'started_timestamp'
 CONFIG_REALTIME_K = 'realtime'
 CONFIG_END_TIME_K = 'end_time'
+CONFIG_STORE_PROBES_K = 'store_probes'
+CONFIG_RETENTION_K = 'retention'
+CONFIG_WRITE_FORMAT_K = 'write_format'
+CONFIG_WRITE_COMPRESSION_K = 'write_compression'
+CONFIG_KEEP_DECOMPOSED_K = 'keep_decomposed'
 
 CONFIG_CASE_KEYS = [
     CONFIG_TYPE_K,
@@ -32,7 +37,12 @@ CONFIG_CASE_KEYS = [
     CONFIG_PARALLEL_K,
     CONFIG_CORES_K,
     CONFIG_REALTIME_K,
-    CONFIG_END_TIME_K
+    CONFIG_END_TIME_K,
+    CONFIG_STORE_PROBES_K,
+    CONFIG_RETENTION_K,
+    CONFIG_WRITE_FORMAT_K,
+    CONFIG_WRITE_COMPRESSION_K,
+    CONFIG_KEEP_DECOMPOSED_K
 ]
 
 DEFAULT_MESH_QUALITY = 50
@@ -41,6 +51,10 @@ DEFAULT_PARALLEL = True
 DEFAULT_CORES = 4
 DEFAULT_REALTIME = True
 DEFAULT_END_TIME = 1000
+DEFAULT_STORE_PROBES = False
+DEFAULT_WRITE_FORMAT = 'ascii'
+DEFAULT_WRITE_COMPRESSION = False
+DEFAULT_KEEP_DECOMPOSED = False
 
 CONFIG_DEFAULTS = {
     CONFIG_MESH_QUALITY_K: DEFAULT_MESH_QUALITY,
@@ -48,7 +62,11 @@ CONFIG_DEFAULTS = {
     CONFIG_PARALLEL_K: DEFAULT_PARALLEL,
     CONFIG_CORES_K: DEFAULT_CORES,
     CONFIG_REALTIME_K: DEFAULT_REALTIME,
-    CONFIG_END_TIME_K: DEFAULT_END_TIME
+    CONFIG_END_TIME_K: DEFAULT_END_TIME,
+    CONFIG_STORE_PROBES_K: DEFAULT_STORE_PROBES,
+    CONFIG_WRITE_FORMAT_K: DEFAULT_WRITE_FORMAT,
+    CONFIG_WRITE_COMPRESSION_K: DEFAULT_WRITE_COMPRESSION,
+    CONFIG_KEEP_DECOMPOSED_K: DEFAULT_KEEP_DECOMPOSED
 }
 
 # Phyngs